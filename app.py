@@ -4,19 +4,23 @@ from trader_floor_ai.app.ui import launch  # type: ignore
 
 
 def _launch():
-    # Initialize database if empty (for Railway first run)
-    try:
-        from init_db_if_empty import needs_initialization, initialize_database
+    from trader_floor_ai.services.database import DB_READ_ONLY
 
-        if needs_initialization():
-            initialize_database()
-    except Exception as e:
-        print(f"Warning: Could not check/initialize database: {e}")
+    # Initialize database if empty (for Railway first run); read-only
+    # dashboards leave that to the scheduler
+    if not DB_READ_ONLY:
+        try:
+            from init_db_if_empty import needs_initialization, initialize_database
+
+            if needs_initialization():
+                initialize_database()
+        except Exception as e:
+            print(f"Warning: Could not check/initialize database: {e}")
 
     # Import lazily to avoid startup side-effects
-    from trader_floor_ai.app.ui import launch  # type: ignore
+    from trader_floor_ai.app.ui import launch_workers  # type: ignore
 
-    launch()
+    launch_workers()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark of the trading floor.
+Runs real Trader agents through the executor and MCP server pool against a
+scripted chat-completions stand-in (deterministic tool-call sequences), the
+random-price market fallback and stub stdio MCP servers, in a throwaway
+database. No API keys or network access are needed.
+
+Reports cycles/sec, p50/p99 tool-call latency as seen by the model loop,
+database writes per trade and peak RSS, for each floor size in its own process.
+
+Usage: python benchmarks/floor_e2e.py [--traders 4 40 400] [--cycles 2]
+       [--concurrency 16] [--model-latency-ms 5] [--tool-latency-ms 20] [--streaming]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+import zlib
+from collections import defaultdict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "AMZN", "GOOGL", "META", "TSLA", "SPY"]
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ScriptedChatCompletions:
+    """Answers /chat/completions with a fixed tool-call script per agent.
+
+    The trader buys on trade runs and sells on rebalance runs; the researcher
+    searches, fetches and answers. Tool latency is the time between issuing a
+    tool call and receiving the request that carries its result.
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = 0
+        self.issued: dict[str, tuple[str, float]] = {}
+        self.tool_latency: dict[str, list[float]] = defaultdict(list)
+
+    def _trader_step(self, messages, step):
+        prompt = next(m["content"] for m in messages if m["role"] == "user")
+        name = prompt.rsplit("Your account name is ", 1)[1].split(".", 1)[0]
+        symbol = SYMBOLS[zlib.crc32(name.encode()) % len(SYMBOLS)]
+        rebalance = "decide if you need to rebalance" in prompt
+        script = [
+            ("Researcher", {"input": f"Latest news on {symbol}"}),
+            ("get_share_price", {"symbol": symbol}),
+            (
+                "sell_shares" if rebalance else "buy_shares",
+                {
+                    "name": name,
+                    "symbol": symbol,
+                    "quantity": 1 if rebalance else 3,
+                    "rationale": "Scripted benchmark trade",
+                },
+            ),
+        ]
+        return script[step] if step < len(script) else None
+
+    def _researcher_step(self, messages, step):
+        script = [
+            ("brave_web_search", {"query": "stock market news today", "count": 5}),
+            ("fetch", {"url": "https://example.com/0"}),
+        ]
+        return script[step] if step < len(script) else None
+
+    async def handle(self, request):
+        import httpx
+
+        received = time.perf_counter()
+        body = json.loads(request.content)
+        messages = body["messages"]
+        last = messages[-1]
+        if last.get("role") == "tool" and last.get("tool_call_id") in self.issued:
+            tool, issued = self.issued.pop(last["tool_call_id"])
+            self.tool_latency[tool].append(received - issued)
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+
+        tools = {t["function"]["name"] for t in body.get("tools") or []}
+        step = sum(1 for m in messages if m["role"] == "assistant")
+        plan = self._trader_step if "buy_shares" in tools else self._researcher_step
+        call = plan(messages, step)
+        if call is None:
+            message = {"role": "assistant", "content": "Done for this cycle."}
+            finish = "stop"
+        else:
+            call_id = f"call_{uuid.uuid4().hex[:12]}"
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": call_id,
+                        "type": "function",
+                        "function": {"name": call[0], "arguments": json.dumps(call[1])},
+                    }
+                ],
+            }
+            finish = "tool_calls"
+            self.issued[call_id] = (call[0], time.perf_counter())
+        completion = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{"index": 0, "message": message, "finish_reason": finish}],
+            "usage": {"prompt_tokens": 500, "completion_tokens": 40, "total_tokens": 540},
+        }
+        if body.get("stream"):
+            return httpx.Response(
+                200,
+                content=self._stream(completion),
+                headers={"content-type": "text/event-stream"},
+            )
+        return httpx.Response(200, json=completion)
+
+    @staticmethod
+    def _stream(completion: dict) -> bytes:
+        """The same completion as server-sent chunks, for AGENT_STREAMING runs."""
+        choice = completion["choices"][0]
+        delta = dict(choice["message"])
+        for index, call in enumerate(delta.get("tool_calls") or []):
+            call["index"] = index
+        base = {k: completion[k] for k in ("id", "created", "model")}
+        chunks = [
+            {**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": delta, "finish_reason": None}]},
+            {**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {}, "finish_reason": choice["finish_reason"]}]},
+            {**base, "object": "chat.completion.chunk", "choices": [], "usage": completion["usage"]},
+        ]
+        return "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks).encode() + b"data: [DONE]\n\n"
+
+
+def stub_params(kind: str, latency_ms: float) -> dict:
+    script = os.path.join(HERE, "stub_mcp_server.py")
+    return {
+        "command": sys.executable,
+        "args": [script, kind, "--latency-ms", str(latency_ms)],
+    }
+
+
+async def run_floor(args) -> dict:
+    import httpx
+    from agents import (
+        set_default_openai_api,
+        set_default_openai_client,
+        set_tracing_disabled,
+    )
+    from openai import AsyncOpenAI
+
+    from trader_floor_ai.agents.trader import Trader
+    from trader_floor_ai.domain.traders import TraderProfile, save_trader
+    from trader_floor_ai.integration.llm_metrics import instrument
+    from trader_floor_ai.integration.mcp_pool import MCPServerPool
+    from trader_floor_ai.scheduler.executor import TraderExecutor
+    from trader_floor_ai.scheduler.reset import reset_traders
+    from trader_floor_ai.services import database
+
+    # Modules call load_dotenv(override=True); refuse to touch a real database
+    if database.DB != os.environ["DB_PATH"]:
+        raise SystemExit(f"DB_PATH was overridden to {database.DB} by .env; aborting")
+    database.init_db()
+
+    model = ScriptedChatCompletions(args.model_latency_ms / 1000)
+    client = AsyncOpenAI(
+        api_key="benchmark",
+        base_url="http://scripted.local/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(model.handle)),
+    )
+    set_default_openai_client(instrument(client), use_for_tracing=False)
+    set_default_openai_api("chat_completions")
+    set_tracing_disabled(True)
+
+    for i in range(args.traders):
+        save_trader(
+            TraderProfile(
+                name=f"Trader {i:03d}",
+                lastname="Bench",
+                model_name="gpt-4o-mini",
+                short_model_name="Scripted",
+                strategy="Scripted benchmark strategy",
+                position=i,
+            )
+        )
+    reset_traders()
+    traders = [Trader(f"Trader {i:03d}", "Bench", "gpt-4o-mini") for i in range(args.traders)]
+
+    pool = MCPServerPool(
+        shared_params=[
+            stub_params("fetch", args.tool_latency_ms),
+            stub_params("search", args.tool_latency_ms),
+        ],
+        memory_params=lambda name: stub_params("memory", args.tool_latency_ms),
+    )
+    cycle_times = []
+    async with pool:
+        executor = TraderExecutor(concurrency=args.concurrency, mcp_pool=pool)
+        for _ in range(args.cycles):
+            start = time.perf_counter()
+            results = await executor.run(traders)
+            cycle_times.append(time.perf_counter() - start)
+            failed = [r for r in results if not r.success]
+            if failed:
+                print(f"{len(failed)} runs failed, e.g. {failed[0].name}: {failed[0].error}")
+
+    totals = database.read_span_totals()
+    writes = sum(h["count"] for span, h in totals.items() if span.startswith("db.write_"))
+    trades = sum(totals.get(span, {}).get("count", 0) for span in ("tool.buy_shares", "tool.sell_shares"))
+    latencies = [value for values in model.tool_latency.values() for value in values]
+    elapsed = sum(cycle_times)
+    return {
+        "traders": args.traders,
+        "cycles": args.cycles,
+        "cycles_per_sec": args.cycles / elapsed,
+        "runs_per_sec": args.cycles * args.traders / elapsed,
+        "model_requests": model.requests,
+        "tool_calls": len(latencies),
+        "tool_p50_ms": percentile(latencies, 0.50) * 1000,
+        "tool_p99_ms": percentile(latencies, 0.99) * 1000,
+        "per_tool_p50_ms": {
+            tool: percentile(values, 0.50) * 1000 for tool, values in sorted(model.tool_latency.items())
+        },
+        "trades": trades,
+        "db_writes_per_trade": writes / trades if trades else 0.0,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_child_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }
+
+
+def run_single(args):
+    workdir = tempfile.mkdtemp(prefix="floor-e2e-")
+    os.environ["DB_PATH"] = os.path.join(workdir, "accounts.db")
+    os.environ["METRICS_ENABLED"] = "true"
+    os.environ["LLM_CACHE"] = "false"
+    os.environ["POLYGON_API_KEY"] = ""
+    os.environ["OPENAI_API_KEY"] = ""
+    os.environ["MCP_HEALTH_CHECK_SECONDS"] = "3600"
+    os.environ["AGENT_STREAMING"] = "true" if args.streaming else "false"
+    for key in ("DEEPSEEK_API_KEY", "GOOGLE_API_KEY", "GROK_API_KEY", "OPENROUTER_API_KEY"):
+        os.environ.setdefault(key, "unused")
+    random.seed(42)
+    result = asyncio.run(run_floor(args))
+    print("RESULT " + json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--traders", type=int, nargs="+", default=[4, 40, 400])
+    parser.add_argument("--cycles", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--model-latency-ms", type=float, default=5)
+    parser.add_argument("--tool-latency-ms", type=float, default=20)
+    parser.add_argument("--streaming", action="store_true", help="run agents with AGENT_STREAMING")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        args.traders = args.traders[0]
+        run_single(args)
+        return
+
+    # One process per floor size so peak RSS is measured per size
+    rows = []
+    for traders in args.traders:
+        command = [
+            sys.executable,
+            __file__,
+            "--single",
+            "--traders", str(traders),
+            "--cycles", str(args.cycles),
+            "--concurrency", str(args.concurrency),
+            "--model-latency-ms", str(args.model_latency_ms),
+            "--tool-latency-ms", str(args.tool_latency_ms),
+            *(["--streaming"] if args.streaming else []),
+        ]
+        print(f"Running {traders} traders x {args.cycles} cycles...", flush=True)
+        output = subprocess.run(command, capture_output=True, text=True)
+        lines = [line for line in output.stdout.splitlines() if line.startswith("RESULT ")]
+        if output.returncode != 0 or not lines:
+            print(output.stdout[-2000:], output.stderr[-2000:])
+            raise SystemExit(f"Benchmark for {traders} traders failed")
+        rows.append(json.loads(lines[-1][len("RESULT "):]))
+
+    header = f"{'traders':>8} {'cycles/s':>9} {'runs/s':>8} {'tool p50':>9} {'tool p99':>9} {'writes/trade':>13} {'RSS MB':>8} {'child MB':>9}"
+    print("\n" + header)
+    for row in rows:
+        print(
+            f"{row['traders']:>8} {row['cycles_per_sec']:>9.3f} {row['runs_per_sec']:>8.2f} "
+            f"{row['tool_p50_ms']:>7.1f}ms {row['tool_p99_ms']:>7.1f}ms "
+            f"{row['db_writes_per_trade']:>13.1f} {row['peak_rss_mb']:>8.1f} {row['peak_child_rss_mb']:>9.1f}"
+        )
+    for row in rows:
+        print(f"\n{row['traders']} traders, p50 by tool (ms): {row['per_tool_p50_ms']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the Account and database hot paths.
+Times `Account.get`, `buy_shares`, `sell_shares`, `report`,
+`calculate_profit_loss`, `write_log`, `read_log` and `read_market` against
+account histories of 10 to 100k transactions and log tables of 10 to 100k rows
+in a throwaway database, and records the peak allocation of one call.
+
+Each case is measured `--repeats` times and the median run is kept, so a
+single noisy run does not flag a regression. Results are compared with the
+baseline in `benchmarks/hot_paths_baseline.json` and the script exits
+non-zero when a case regresses beyond the thresholds.
+Refresh the baseline (on the machine that runs the gate) with
+`--update-baseline` when a slowdown is intended.
+
+Usage: python benchmarks/hot_paths.py [--sizes 10 100 1000 10000 100000]
+       [--cases report read_log] [--time-tolerance 0.5] [--alloc-tolerance 0.25]
+       [--repeats 5] [--update-baseline]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "hot_paths_baseline.json")
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "AMZN", "GOOGL", "META", "TSLA", "SPY"]
+# Differences below this are timer, scheduler and SQLite commit (fsync) noise,
+# not regressions; sub-millisecond writes vary by a few tenths of a ms run to run
+MIN_TIME_DELTA_MS = 0.5
+
+
+def measure(fn, min_time: float = 0.2, min_rounds: int = 5, max_rounds: int = 200):
+    """Median wall time per call in ms, and peak traced allocation of one call."""
+    fn()  # warm caches and lazy imports
+    timings = []
+    start = time.perf_counter()
+    while len(timings) < min_rounds or (
+        time.perf_counter() - start < min_time and len(timings) < max_rounds
+    ):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings) * 1000, peak, len(timings)
+
+
+def build_cases(sizes, selected):
+    from trader_floor_ai.domain.accounts import Account, Transaction
+    from trader_floor_ai.services.database import (
+        read_log,
+        read_market,
+        write_account,
+        write_log,
+        write_market,
+        _clear_table,
+    )
+
+    def seed_account(name: str, history: int) -> Account:
+        transactions = [
+            Transaction(
+                symbol=SYMBOLS[i % len(SYMBOLS)],
+                quantity=5 if i % 3 else -2,
+                price=100.0 + i % 50,
+                timestamp="2025-01-02 10:00:00",
+                rationale=f"Seeded transaction {i} for benchmark history",
+            )
+            for i in range(history)
+        ]
+        # Enough shares that repeated sells never run out
+        holdings = {symbol: 1_000_000 for symbol in SYMBOLS}
+        fields = {
+            "name": name.lower(),
+            # Large enough that buys are never auto-sized
+            "balance": 1e12,
+            "strategy": "Benchmark strategy",
+            "holdings": holdings,
+            "transactions": [t.model_dump() for t in transactions],
+            "portfolio_value_time_series": [],
+        }
+        write_account(name.lower(), fields)
+        return Account.get(name)
+
+    def seed_logs(name: str, rows: int):
+        _clear_table("logs")
+        for i in range(rows):
+            write_log(name, "account", f"Seeded log line {i}")
+
+    # Each operation gets a freshly seeded account or table and returns the
+    # zero-argument call to time
+    account_ops = {
+        "account_get": lambda account: lambda: Account.get(account.name),
+        "buy_shares": lambda account: lambda: account.buy_shares("AAPL", 1, "bench"),
+        "sell_shares": lambda account: lambda: account.sell_shares("AAPL", 1, "bench"),
+        "report": lambda account: account.report,
+        "calculate_profit_loss": lambda account: lambda: account.calculate_profit_loss(1e12),
+    }
+    log_ops = {
+        "write_log": lambda: write_log("bench", "account", "bench"),
+        "read_log": lambda: read_log("bench", last_n=10),
+    }
+
+    def market_op(size: int):
+        date = f"bench-{size}"
+        write_market(date, {f"SYM{i:06d}": 10.0 + i % 90 for i in range(size)})
+        return lambda: read_market(date)
+
+    cases = []
+    for size in sizes:
+        for key, op in account_ops.items():
+            if not selected or key in selected:
+                cases.append((f"{key}[{size}]", lambda op=op, size=size: op(seed_account(f"bench{size}", size))))
+        for key, op in log_ops.items():
+            if not selected or key in selected:
+                cases.append((f"{key}[{size}]", lambda op=op, size=size: (seed_logs("bench", size), op)[1]))
+        if not selected or "read_market" in selected:
+            cases.append((f"read_market[{size}]", lambda size=size: market_op(size)))
+    return cases
+
+
+def compare(results, baseline, time_tolerance, alloc_tolerance):
+    failures = []
+    print(f"\n{'case':<34} {'ms':>10} {'base ms':>10} {'peak KiB':>10} {'base KiB':>10}")
+    for key, result in results.items():
+        base = baseline.get(key)
+        flags = []
+        if base:
+            slower = result["ms"] - base["ms"]
+            if result["ms"] > base["ms"] * (1 + time_tolerance) and slower > MIN_TIME_DELTA_MS:
+                flags.append("TIME")
+            if result["peak_bytes"] > base["peak_bytes"] * (1 + alloc_tolerance):
+                flags.append("ALLOC")
+        print(
+            f"{key:<34} {result['ms']:>10.3f} "
+            f"{(base['ms'] if base else float('nan')):>10.3f} "
+            f"{result['peak_bytes'] / 1024:>10.1f} "
+            f"{(base['peak_bytes'] / 1024 if base else float('nan')):>10.1f}"
+            + (f"  REGRESSION ({', '.join(flags)})" if flags else "")
+            + ("" if base else "  (no baseline)")
+        )
+        if flags:
+            failures.append(key)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--cases", nargs="*", default=[], help="only run these case names")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="allowed slowdown, 0.5 = +50%%")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.25, help="allowed peak allocation growth")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds to sample each case")
+    parser.add_argument("--repeats", type=int, default=5, help="runs per case; the median is kept")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hot-paths-")
+    os.environ["DB_PATH"] = os.path.join(workdir, "accounts.db")
+    os.environ["POLYGON_API_KEY"] = ""
+    os.environ["METRICS_ENABLED"] = "false"
+    random.seed(42)
+
+    from trader_floor_ai.services import database
+
+    # Modules call load_dotenv(override=True); refuse to touch a real database
+    if database.DB != os.environ["DB_PATH"]:
+        raise SystemExit(f"DB_PATH was overridden to {database.DB} by .env; aborting")
+    database.init_db()
+
+    results = {}
+    for key, setup in build_cases(args.sizes, set(args.cases)):
+        fn = setup()
+        runs = [measure(fn, min_time=args.min_time) for _ in range(max(1, args.repeats))]
+        ms = statistics.median(run[0] for run in runs)
+        peak = int(statistics.median(run[1] for run in runs))
+        rounds = sum(run[2] for run in runs)
+        results[key] = {"ms": round(ms, 4), "peak_bytes": peak}
+        print(
+            f"{key:<34} {ms:>10.3f} ms  {peak / 1024:>10.1f} KiB  "
+            f"({len(runs)} runs, {rounds} rounds)",
+            flush=True,
+        )
+
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+    if args.update_baseline:
+        baseline.update(results)
+        with open(BASELINE, "w") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline updated: {BASELINE}")
+        return
+
+    failures = compare(results, baseline, args.time_tolerance, args.alloc_tolerance)
+    if failures:
+        print(f"\n{len(failures)} regressions: {', '.join(failures)}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Push outbox check against a local Pushover stand-in.
+Starts a stub of the Pushover messages endpoint (optionally slow and
+failing), has concurrent traders call the `push` tool against a throwaway
+database, and runs a PushSender until every push is delivered. Reports how
+long the tool blocked its caller, how many notifications and HTTP requests
+it took, and how many connections were opened; exits non-zero if a push
+was lost or the tool waited on the endpoint.
+
+Usage: python benchmarks/push_outbox.py [--traders 8] [--pushes 3]
+       [--delay 0.5] [--fail-every 4] [--timeout 60]
+       python benchmarks/push_outbox.py --serve 8099
+       (then PUSHOVER_URL=http://127.0.0.1:8099/1/messages.json)
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class PushoverStub(ThreadingHTTPServer):
+    """Accepts POSTs like api.pushover.net; every `fail_every`-th request gets a 500."""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, delay: float = 0.0, fail_every: int = 0, verbose: bool = False):
+        super().__init__(("127.0.0.1", port), _PushoverHandler)
+        self.delay = delay
+        self.fail_every = fail_every
+        self.verbose = verbose
+        self.requests = 0
+        self.messages: list[str] = []
+        self.connections: set[int] = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/1/messages.json"
+
+
+class _PushoverHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server: PushoverStub = self.server
+        form = parse_qs(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode())
+        time.sleep(server.delay)
+        with server.lock:
+            server.requests += 1
+            server.connections.add(self.client_address[1])
+            failing = server.fail_every and server.requests % server.fail_every == 0
+        if not form.get("token") or not form.get("user"):
+            status, body = 400, {"status": 0, "errors": ["application token is invalid"]}
+        elif failing:
+            status, body = 500, {"status": 0, "errors": ["stub failure"]}
+        else:
+            status, body = 200, {"status": 1, "request": uuid.uuid4().hex}
+            with server.lock:
+                server.messages.append(form["message"][0])
+            if server.verbose:
+                print(f"--- push ---\n{form['message'][0]}")
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def run(args, stub: PushoverStub) -> bool:
+    from trader_floor_ai.integration.llm_metrics import llm_run_context
+    from trader_floor_ai.integration.tools_local import make_push_tools
+    from trader_floor_ai.services.jobs import count_jobs
+    from trader_floor_ai.services.notifications import PushSender
+
+    push = make_push_tools()[0].on_invoke_tool
+    waits = []
+
+    async def trader(i: int):
+        with llm_run_context(f"trader{i}"):
+            for n in range(args.pushes):
+                start = time.perf_counter()
+                result = await push(None, json.dumps({"message": f"Cycle summary {n}"}))
+                waits.append(time.perf_counter() - start)
+                assert result == "Push notification queued", result
+                await asyncio.sleep(0.05)
+
+    expected = args.traders * args.pushes
+    started = time.perf_counter()
+    async with PushSender(url=stub.url, flush_seconds=0.2) as sender:
+        await asyncio.gather(*(trader(i) for i in range(args.traders)))
+        deadline = time.monotonic() + args.timeout
+        while sender.sent < expected and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+    elapsed = time.perf_counter() - started
+
+    delivered = sum(len(m.splitlines()) for m in stub.messages)
+    print(f"{'pushes queued':<32} {expected:>10}")
+    print(f"{'pushes delivered':<32} {delivered:>10}")
+    print(f"{'notifications sent':<32} {len(stub.messages):>10}")
+    print(f"{'HTTP requests (incl. failures)':<32} {stub.requests:>10}")
+    print(f"{'connections opened':<32} {len(stub.connections):>10}")
+    print(f"{'tool wait median (ms)':<32} {statistics.median(waits) * 1000:>10.2f}")
+    print(f"{'tool wait max (ms)':<32} {max(waits) * 1000:>10.2f}")
+    print(f"{'time to deliver all (s)':<32} {elapsed:>10.2f}")
+    print(f"{'job statuses':<32} {count_jobs()}")
+
+    ok = delivered == expected
+    if not ok:
+        print(f"Only {delivered} of {expected} pushes were delivered")
+    if max(waits) >= args.delay > 0:
+        print("The push tool waited on the endpoint")
+        ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--traders", type=int, default=8)
+    parser.add_argument("--pushes", type=int, default=3, help="pushes per trader")
+    parser.add_argument("--delay", type=float, default=0.5, help="stub response delay in seconds")
+    parser.add_argument("--fail-every", type=int, default=4, help="fail every Nth request (0: never)")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--serve", type=int, metavar="PORT", help="only run the stand-in endpoint")
+    args = parser.parse_args()
+
+    if args.serve:
+        stub = PushoverStub(args.serve, args.delay, args.fail_every, verbose=True)
+        print(f"Pushover stand-in listening on {stub.url}")
+        stub.serve_forever()
+        return
+
+    # Everything below must see the throwaway DB and never hit real services
+    workdir = tempfile.mkdtemp(prefix="push-outbox-")
+    os.environ["DB_PATH"] = os.path.join(workdir, "accounts.db")
+    os.environ["POLYGON_API_KEY"] = ""
+    os.environ["PUSHOVER_USER"] = "stub-user"
+    os.environ["PUSHOVER_TOKEN"] = "stub-token"
+    # Retries come back quickly so failed deliveries finish within the run
+    os.environ["PUSH_BACKOFF_SECONDS"] = "0.2"
+    os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+    from trader_floor_ai.services import database
+
+    if database.DB != os.environ["DB_PATH"]:
+        raise SystemExit(f"DB_PATH was overridden to {database.DB} by .env; aborting")
+    database.init_db()
+
+    stub = PushoverStub(0, args.delay, args.fail_every)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    try:
+        ok = asyncio.run(run(args, stub))
+    finally:
+        stub.shutdown()
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Load test for the trader registry at scale.
+Seeds N traders (default 200) into a throwaway database, trades and marks
+every account, then times the scheduler and dashboard paths.
+
+Usage: python benchmarks/registry_load.py [--traders 200] [--shards 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+def timed(label, fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:>10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--traders", type=int, default=200)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--trades", type=int, default=5, help="trades per trader")
+    args = parser.parse_args()
+
+    # Everything below must see the throwaway DB and never hit real services
+    workdir = tempfile.mkdtemp(prefix="registry-load-")
+    os.environ["DB_PATH"] = os.path.join(workdir, "accounts.db")
+    os.environ["POLYGON_API_KEY"] = ""
+    for key in ("DEEPSEEK_API_KEY", "GOOGLE_API_KEY", "GROK_API_KEY", "OPENROUTER_API_KEY"):
+        os.environ.setdefault(key, "unused")
+
+    from trader_floor_ai.domain.accounts import Account
+    from trader_floor_ai.domain.traders import TraderProfile, save_trader, list_traders
+    from trader_floor_ai.scheduler.reset import reset_traders
+    from trader_floor_ai.scheduler.mark import mark_to_market
+    from trader_floor_ai.services import database
+
+    # Modules call load_dotenv(override=True); refuse to touch a real database
+    if database.DB != os.environ["DB_PATH"]:
+        raise SystemExit(f"DB_PATH was overridden to {database.DB} by .env; aborting")
+    print(f"Database: {database.DB}")
+    print(f"Traders: {args.traders}, shards: {args.shards}\n")
+    database.init_db()
+
+    def register():
+        for i in range(args.traders):
+            save_trader(
+                TraderProfile(
+                    name=f"Trader {i:03d}",
+                    lastname="Load",
+                    model_name="gpt-4o-mini",
+                    short_model_name="GPT 4o mini",
+                    strategy=f"Load test strategy {i}",
+                    position=i,
+                )
+            )
+
+    timed("register traders", register)
+    timed("list_traders", list_traders)
+    timed("reset_traders", reset_traders)
+
+    symbols = ["AAPL", "MSFT", "NVDA", "SPY", "IBIT", "TLT", "GLD", "AMZN"]
+
+    def trade():
+        for i, profile in enumerate(list_traders()):
+            account = Account.get(profile.name)
+            for j in range(args.trades):
+                account.buy_shares(symbols[(i + j) % len(symbols)], 1, "load test")
+
+    timed(f"{args.trades} buys per trader", trade)
+    for n in range(3):
+        timed(f"mark_to_market #{n + 1}", mark_to_market)
+
+    from trader_floor_ai.scheduler.run import create_traders
+
+    for shard in range(args.shards):
+        traders = create_traders(shard, args.shards)
+        print(f"shard {shard}/{args.shards}: {len(traders)} traders")
+    print()
+
+    from trader_floor_ai.app import ui as dashboard
+
+    timed("create_ui", dashboard.create_ui)
+    traders = [
+        dashboard.Trader(p.name, p.lastname, p.short_model_name) for p in list_traders()
+    ]
+    leaderboard = dashboard.LeaderboardView(traders)
+    timed("leaderboard refresh (all traders)", leaderboard.get_leaderboard_df)
+    view = dashboard.TraderView(traders[0])
+    timed("single panel refresh", view.refresh)
+    timed("single panel logs", traders[0].get_logs)
+
+    size_mb = os.path.getsize(database.DB) / 1_000_000
+    print(f"\nDatabase size: {size_mb:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for the process entry points.
+Runs `python -X importtime` for the dashboard, the cron job and the scheduler
+in fresh interpreters against a throwaway database, prints the heaviest
+modules of each, and exits non-zero when a target exceeds its budget or pulls
+in a module it must not load (the agents SDK, model clients or Polygon for
+the dashboard and the queue-mode cron job).
+
+Usage: python benchmarks/startup.py [--targets ui cron scheduler]
+       [--budget ui=8000 cron=1500] [--top 10] [--repeat 3]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+# name -> (code to run, import budget in ms, top-level modules that must not load)
+TARGETS = {
+    "ui": (
+        "import trader_floor_ai.app.ui",
+        8000,
+        ("agents", "openai", "polygon"),
+    ),
+    "cron": (
+        # A queue-mode cron tick: init the DB, check the market, enqueue
+        "import run_scheduler_once, asyncio; asyncio.run(run_scheduler_once.main())",
+        1500,
+        ("agents", "openai", "polygon", "gradio", "mcp"),
+    ),
+    "scheduler": (
+        "import trader_floor_ai.scheduler.run",
+        1500,
+        ("agents", "openai", "polygon", "gradio"),
+    ),
+}
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_times(code: str, env: dict) -> tuple[int, dict[str, int]]:
+    """Total import time in microseconds and the cumulative time per module."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"{code!r} failed:\n{proc.stdout}{proc.stderr}")
+    total = 0
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        modules[name] = int(cumulative)
+        # Top-level imports have a single space of indentation
+        if len(indent) == 1:
+            total += int(cumulative)
+    return total, modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--budget", nargs="*", default=[], help="override budgets, e.g. ui=6000")
+    parser.add_argument("--top", type=int, default=10, help="heaviest modules to list per target")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per target; the median is kept")
+    args = parser.parse_args()
+
+    budgets = {name: spec[1] for name, spec in TARGETS.items()}
+    for override in args.budget:
+        name, _, ms = override.partition("=")
+        budgets[name] = float(ms)
+
+    workdir = tempfile.mkdtemp(prefix="startup-")
+    env = {
+        **os.environ,
+        "DB_PATH": os.path.join(workdir, "accounts.db"),
+        "POLYGON_API_KEY": "",
+        "SCHEDULER_MODE": "queue",
+        "RUN_EVEN_WHEN_MARKET_IS_CLOSED": "true",
+        "PYTHONPATH": os.pathsep.join(
+            p for p in (os.path.join(ROOT, "src"), ROOT, os.environ.get("PYTHONPATH")) if p
+        ),
+    }
+
+    failures = []
+    for name in args.targets:
+        code, _, forbidden = TARGETS[name]
+        runs = [import_times(code, env) for _ in range(args.repeat)]
+        total_ms = statistics.median(total for total, _ in runs) / 1000
+        modules = runs[-1][1]
+        loaded = sorted(m for m in forbidden if m in modules)
+        over = total_ms > budgets[name]
+
+        status = "OK"
+        if over or loaded:
+            failures.append(name)
+            status = "OVER BUDGET" if over else "FORBIDDEN IMPORTS"
+        print(f"{name}: {total_ms:.0f} ms (budget {budgets[name]:.0f} ms)  {status}")
+        if loaded:
+            print(f"  must not import: {', '.join(loaded)}")
+        heaviest = sorted(
+            ((us, m) for m, us in modules.items() if "." not in m), reverse=True
+        )[: args.top]
+        for us, module in heaviest:
+            print(f"  {us / 1000:>8.1f} ms  {module}")
+        print()
+
+    if failures:
+        print(f"Startup budget exceeded: {', '.join(failures)}")
+        sys.exit(1)
+    print("All entry points within their startup budget")
+
+
+if __name__ == "__main__":
+    main()
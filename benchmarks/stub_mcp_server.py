@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the researcher MCP servers, for offline benchmarks.
+Serves canned results with a fixed simulated latency over stdio.
+
+Usage: python benchmarks/stub_mcp_server.py {fetch|search|memory} [--latency-ms 20]
+"""
+import argparse
+import asyncio
+
+from mcp.server.fastmcp import FastMCP
+
+
+def build(kind: str, latency: float) -> FastMCP:
+    server = FastMCP(f"stub-{kind}")
+
+    if kind == "fetch":
+
+        @server.tool()
+        async def fetch(url: str, max_length: int = 5000) -> str:
+            """Fetch a URL and return its contents as markdown."""
+            await asyncio.sleep(latency)
+            return f"# {url}\n\nMarkets were mixed today as investors weighed earnings."
+
+    elif kind == "search":
+
+        @server.tool()
+        async def brave_web_search(query: str, count: int = 10) -> str:
+            """Search the web."""
+            await asyncio.sleep(latency)
+            return "\n".join(
+                f"Title: {query} result {i}\nDescription: Analysts discuss {query}.\n"
+                f"URL: https://example.com/{i}"
+                for i in range(min(count, 5))
+            )
+
+    else:
+        entities: dict[str, list[str]] = {}
+
+        @server.tool()
+        async def create_entities(entities_json: str) -> str:
+            """Store entities in the knowledge graph."""
+            await asyncio.sleep(latency)
+            entities.setdefault("notes", []).append(entities_json)
+            return "ok"
+
+        @server.tool()
+        async def search_nodes(query: str) -> str:
+            """Search the knowledge graph."""
+            await asyncio.sleep(latency)
+            return "\n".join(entities.get("notes", [])[-3:]) or "No matching nodes"
+
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("kind", choices=["fetch", "search", "memory"])
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+    build(args.kind, args.latency_ms / 1000).run("stdio")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,7 +37,7 @@ def initialize_database():
     from trader_floor_ai.scheduler.reset import reset_traders
 
     reset_traders()
-    print("Database initialized with 4 trader accounts")
+    print("Database initialized with registered trader accounts")
     print("Note: Run 'python populate_db.py' or the scheduler to populate trading data")
 
 
@@ -13,21 +13,23 @@ def init_database():
     from trader_floor_ai.scheduler.reset import reset_traders
 
     reset_traders()
-    print("Database initialized with 4 traders")
+    print("Database initialized with registered traders")
 
 
 async def run_one_cycle():
     """Run one trading cycle."""
     print("Running one trading cycle...")
     from trader_floor_ai.scheduler.run import create_traders
+    from trader_floor_ai.integration.mcp_pool import MCPServerPool
+    from trader_floor_ai.scheduler.executor import TraderExecutor
 
     traders = create_traders()
     print(f"Created {len(traders)} traders")
 
-    # Run traders sequentially to avoid MCP server resource contention
-    for trader in traders:
-        print(f"Running {trader.name}...")
-        await trader.run()
+    # Researcher MCP servers are started once and shared by every trader;
+    # the executor bounds concurrency and enforces per-trader deadlines
+    async with MCPServerPool() as mcp_pool:
+        await TraderExecutor(mcp_pool=mcp_pool).run(traders)
 
     print("Trading cycle complete!")
 
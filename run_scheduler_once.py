@@ -5,15 +5,19 @@ Runs all traders once and exits.
 """
 import asyncio
 import sys
+from contextlib import nullcontext
 
 
 async def main():
     print("Starting trading floor scheduler (single run)...")
     try:
-        from trader_floor_ai.scheduler.run import create_traders
+        # Only what each step needs is imported: a closed market or a queue-mode
+        # run exits without loading the agents SDK, MCP or model clients
+        from trader_floor_ai.services.database import init_db
         from trader_floor_ai.services.market import is_market_open
         import os
 
+        init_db()
         run_anyway = (
             os.getenv("RUN_EVEN_WHEN_MARKET_IS_CLOSED", "false").lower() == "true"
         )
@@ -22,14 +26,36 @@ async def main():
             print("Market is closed, skipping run")
             return
 
+        if os.getenv("SCHEDULER_MODE", "inline").strip().lower() == "queue":
+            from trader_floor_ai.scheduler.run import trader_refs
+            from trader_floor_ai.worker import enqueue_trader_runs
+
+            print(f"Queued {enqueue_trader_runs(trader_refs())} trader runs for workers")
+            return
+
+        from trader_floor_ai.scheduler.run import create_traders
+        from trader_floor_ai.integration.mcp_pool import MCPServerPool
+        from trader_floor_ai.scheduler.executor import TraderExecutor
+        from trader_floor_ai.services.notifications import PushSender, push_enabled
+
         traders = create_traders()
         print(f"Created {len(traders)} traders, starting execution...")
 
-        # Run traders sequentially to avoid MCP server resource contention
-        for trader in traders:
-            print(f"Running {trader.name}...")
-            await trader.run()
+        # Researcher MCP servers are started once and shared by every trader;
+        # the executor bounds concurrency and enforces per-trader deadlines.
+        # Queued pushes go out in the background and are flushed on exit
+        push_sender = PushSender() if push_enabled() else nullcontext()
+        async with MCPServerPool() as mcp_pool, push_sender:
+            await TraderExecutor(mcp_pool=mcp_pool).run(traders)
+
+        from trader_floor_ai.scheduler.mark import mark_to_market
+
+        print(f"Marked {mark_to_market()} accounts to market")
+
+        from trader_floor_ai.scheduler.snapshot import take_snapshot
 
+        if take_snapshot():
+            print("Refreshed the dashboard database snapshot")
         print("Trading run completed successfully")
     except Exception as e:
         print(f"Error during trading run: {e}")
@@ -0,0 +1,203 @@
+"""Checkpoints of trader runs, so a failed run resumes instead of restarting.
+
+While a trader runs, the conversation items (model output and tool results,
+including the Researcher's findings) and the orders it placed are saved to the
+`run_checkpoints` table after every model response and tool call. Each save
+appends only the items added since the previous one, off the event loop. A
+successful run deletes its checkpoint. The next attempt after a provider error, MCP
+timeout, `MaxTurnsExceeded` or deadline picks the conversation up where it
+stopped, and orders that already went through are not placed a second time.
+"""
+
+import asyncio
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from agents import RunHooks
+from dotenv import load_dotenv
+
+from trader_floor_ai.services.database import (
+    delete_checkpoint,
+    read_checkpoint,
+    write_checkpoint,
+)
+
+load_dotenv(override=True)
+
+RUN_CHECKPOINTS_ENABLED = (
+    os.getenv("RUN_CHECKPOINTS_ENABLED", "true").strip().lower() == "true"
+)
+# Older checkpoints are discarded: research and prices have gone stale
+RUN_CHECKPOINT_MAX_AGE_MINUTES = float(os.getenv("RUN_CHECKPOINT_MAX_AGE_MINUTES", "120"))
+# A run that keeps failing after this many resumes starts over from scratch
+RUN_CHECKPOINT_MAX_RESUMES = int(os.getenv("RUN_CHECKPOINT_MAX_RESUMES", "2"))
+
+ORDER_TOOLS = ("buy_shares", "sell_shares")
+
+_executed_orders: ContextVar[list[dict] | None] = ContextVar("executed_orders", default=None)
+
+
+def _order(tool_name: str, arguments: dict) -> dict:
+    return {
+        "tool": tool_name,
+        "symbol": str(arguments.get("symbol", "")).strip().upper(),
+        "quantity": int(arguments.get("quantity") or 0),
+    }
+
+
+def describe_order(order: dict) -> str:
+    action = "Bought" if order["tool"] == "buy_shares" else "Sold"
+    return f"{action} {order['quantity']} of {order['symbol']}"
+
+
+def already_executed(tool_name: str, arguments: dict) -> str | None:
+    """If a resumed run repeats an order from before the interruption, return
+    a tool result saying so (once per executed order) instead of trading."""
+    orders = _executed_orders.get()
+    if not orders:
+        return None
+    wanted = _order(tool_name, arguments)
+    for order in orders:
+        if all(order[k] == wanted[k] for k in ("tool", "symbol", "quantity")):
+            orders.remove(order)
+            return (
+                f"Not repeated: this order was already executed before the interruption "
+                f"({describe_order(order)}). Continue with the remaining steps."
+            )
+    return None
+
+
+def _drop_unanswered_calls(items: list[dict]) -> list[dict]:
+    """Remove tool calls whose result was never recorded; the model re-issues
+    them if they are still needed."""
+    answered = {item.get("call_id") for item in items if item.get("type") == "function_call_output"}
+    return [
+        item
+        for item in items
+        if item.get("type") != "function_call" or item.get("call_id") in answered
+    ]
+
+
+class RunCheckpoint(RunHooks):
+    """Run hooks that persist the trader's conversation as it progresses."""
+
+    def __init__(
+        self,
+        name: str,
+        do_trade: bool,
+        items: list[dict],
+        orders: list[dict] | None = None,
+        resumes: int = 0,
+        created_at: float | None = None,
+    ):
+        self.name = name
+        self.do_trade = do_trade
+        self.items = items
+        self.orders = orders or []
+        self.resumes = resumes
+        self.created_at = created_at or time.time()
+        # Items already stored; later saves append only the ones after them
+        self._saved = 0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def start(cls, name: str, do_trade: bool, message: str) -> "RunCheckpoint":
+        checkpoint = cls(name, do_trade, [{"role": "user", "content": message}])
+        checkpoint.save()
+        return checkpoint
+
+    @classmethod
+    def load(cls, name: str) -> "RunCheckpoint | None":
+        """The resumable checkpoint for `name`, or None (discarding unusable ones)."""
+        if not RUN_CHECKPOINTS_ENABLED:
+            return None
+        saved = read_checkpoint(name)
+        if saved is None:
+            return None
+        age_minutes = (time.time() - saved["created_at"]) / 60
+        if age_minutes > RUN_CHECKPOINT_MAX_AGE_MINUTES or saved["resumes"] >= RUN_CHECKPOINT_MAX_RESUMES:
+            print(f"[{name}] Discarding checkpoint ({age_minutes:.0f} min old, {saved['resumes']} resumes)")
+            delete_checkpoint(name)
+            return None
+        return cls(
+            name,
+            saved["do_trade"],
+            saved["items"],
+            saved["orders"],
+            saved["resumes"],
+            saved["created_at"],
+        )
+
+    def _snapshot(self) -> dict:
+        return {
+            "do_trade": self.do_trade,
+            "items": list(self.items),
+            "orders": list(self.orders),
+            "resumes": self.resumes,
+            "created_at": self.created_at,
+            "updated_at": time.time(),
+        }
+
+    def save(self) -> None:
+        """Rewrite the whole checkpoint."""
+        if not RUN_CHECKPOINTS_ENABLED:
+            return
+        snapshot = self._snapshot()
+        write_checkpoint(self.name, snapshot)
+        self._saved = len(snapshot["items"])
+
+    async def append(self) -> None:
+        """Store the items added since the last save, in a worker thread."""
+        if not RUN_CHECKPOINTS_ENABLED:
+            return
+        # Parallel tool calls end together; their appends must not interleave
+        async with self._lock:
+            snapshot = self._snapshot()
+            await asyncio.to_thread(write_checkpoint, self.name, snapshot, self._saved)
+            self._saved = len(snapshot["items"])
+
+    def clear(self) -> None:
+        if RUN_CHECKPOINTS_ENABLED:
+            delete_checkpoint(self.name)
+
+    def resume(self, message: str) -> list[dict]:
+        """Input for the next attempt: the saved conversation plus `message`."""
+        self.items = [*_drop_unanswered_calls(self.items), {"role": "user", "content": message}]
+        self.resumes += 1
+        self.save()
+        return self.items
+
+    @contextmanager
+    def guard_orders(self):
+        """Refuse exact repeats of already executed orders inside the block."""
+        token = _executed_orders.set(list(self.orders))
+        try:
+            yield
+        finally:
+            _executed_orders.reset(token)
+
+    async def on_llm_end(self, context, agent, response) -> None:
+        self.items.extend(response.to_input_items())
+        await self.append()
+
+    async def on_tool_end(self, context, agent, tool, result: Any) -> None:
+        call_id = getattr(context, "tool_call_id", None)
+        if call_id is None:
+            return
+        self.items.append({"type": "function_call_output", "call_id": call_id, "output": str(result)})
+        if tool.name in ORDER_TOOLS and str(result).startswith("Completed"):
+            arguments = json.loads(getattr(context, "tool_arguments", None) or "{}")
+            self.orders.append(_order(tool.name, arguments))
+        await self.append()
+
+
+__all__ = [
+    "RUN_CHECKPOINTS_ENABLED",
+    "RunCheckpoint",
+    "already_executed",
+    "describe_order",
+]
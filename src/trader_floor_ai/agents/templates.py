@@ -1,4 +1,5 @@
 from datetime import datetime
+from functools import lru_cache
 from trader_floor_ai.services.market import is_paid_polygon, is_realtime_polygon
 
 if is_realtime_polygon:
@@ -28,6 +29,7 @@ The current datetime is {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 """
 
 
+@lru_cache(maxsize=1)
 def research_tool():
     return "This tool researches online for news and opportunities, \
 either based on your specific request to look into a certain stock, \
@@ -35,6 +37,7 @@ or generally for notable financial news and opportunities. \
 Describe what kind of research you're looking for."
 
 
+@lru_cache(maxsize=None)
 def trader_instructions(name: str):
     return f"""
 You are {name}, a trader on the stock market. Your account is under your name, {name}.
@@ -90,10 +93,24 @@ After you've executed your trades, send a push notification with a brief sumnmar
 respond with a brief 2-3 sentence appraisal of your portfolio and its outlook."""
 
 
+def resume_message(name, orders, account):
+    executed = "\n".join(f"- {order}" for order in orders) or "- none"
+    return f"""Your previous session was interrupted before you finished. The conversation above is what you had done so far;
+your research results are still valid, so do not repeat research you have already done.
+These orders were already executed and must not be placed again:
+{executed}
+Here is your current account:
+{account}
+Here is the current datetime:
+{datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+Continue from where you left off and complete your task. Your account name is {name}."""
+
+
 __all__ = [
     "researcher_instructions",
     "trader_instructions",
     "trade_message",
     "rebalance_message",
+    "resume_message",
     "research_tool",
 ]
@@ -1,21 +1,45 @@
 from contextlib import AsyncExitStack
+from functools import lru_cache
 import json
 import os
+import time
 
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 
-from agents import Agent, Tool, Runner, OpenAIChatCompletionsModel, trace
+from agents import (
+    Agent,
+    ItemHelpers,
+    Tool,
+    Runner,
+    OpenAIChatCompletionsModel,
+    set_default_openai_client,
+    trace,
+)
 from agents.mcp import MCPServerStdio
 
+from trader_floor_ai.agents.checkpoint import RunCheckpoint, describe_order
 from trader_floor_ai.domain.accounts import Account
 from trader_floor_ai.integration.mcp_params import researcher_mcp_server_params
-from trader_floor_ai.integration.tools_local import make_local_tools
+from trader_floor_ai.integration.mcp_pool import MCPServerPool
+from trader_floor_ai.integration.research_cache import with_research_cache
+from trader_floor_ai.integration.llm_metrics import instrument, llm_run_context
+from trader_floor_ai.integration.tools_local import cached_local_tools
+from trader_floor_ai.services.database import write_run_spans
+from trader_floor_ai.services.log_writer import BatchedLogWriter
+from trader_floor_ai.utils.timing import (
+    METRICS_ENABLED,
+    collect_spans,
+    record,
+    span,
+    timed,
+)
 from trader_floor_ai.agents.templates import (
     researcher_instructions,
     trader_instructions,
     trade_message,
     rebalance_message,
+    resume_message,
     research_tool,
 )
 
@@ -33,15 +57,28 @@ GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
 MAX_TURNS = 30
+# Stream agent events (tool calls, results, messages) into the logs as they happen.
+# Streamed model calls bypass LLM_CACHE and are recorded without token usage.
+AGENT_STREAMING = os.getenv("AGENT_STREAMING", "false").strip().lower() == "true"
+LOG_PREVIEW_CHARS = 300
 
-openrouter_client = AsyncOpenAI(
-    base_url=OPENROUTER_BASE_URL, api_key=openrouter_api_key
+# Clients record latency and token usage per call (see integration.llm_metrics)
+openrouter_client = instrument(
+    AsyncOpenAI(base_url=OPENROUTER_BASE_URL, api_key=openrouter_api_key)
+)
+deepseek_client = instrument(
+    AsyncOpenAI(base_url=DEEPSEEK_BASE_URL, api_key=deepseek_api_key)
 )
-deepseek_client = AsyncOpenAI(base_url=DEEPSEEK_BASE_URL, api_key=deepseek_api_key)
-grok_client = AsyncOpenAI(base_url=GROK_BASE_URL, api_key=grok_api_key)
-gemini_client = AsyncOpenAI(base_url=GEMINI_BASE_URL, api_key=google_api_key)
+grok_client = instrument(AsyncOpenAI(base_url=GROK_BASE_URL, api_key=grok_api_key))
+gemini_client = instrument(
+    AsyncOpenAI(base_url=GEMINI_BASE_URL, api_key=google_api_key)
+)
+if os.getenv("OPENAI_API_KEY"):
+    # Plain model names go through the SDK's default client
+    set_default_openai_client(instrument(AsyncOpenAI()), use_for_tracing=False)
 
 
+@lru_cache(maxsize=None)
 def get_model(model_name: str):
     if "/" in model_name:
         return OpenAIChatCompletionsModel(
@@ -59,19 +96,70 @@ def get_model(model_name: str):
         return model_name
 
 
-async def get_researcher(mcp_servers, model_name) -> Agent:
-    researcher = Agent(
+def _researcher_instructions(_run_context, _agent) -> str:
+    # Resolved per run so a cached agent still sees the current datetime
+    return researcher_instructions()
+
+
+def _build_researcher(mcp_servers, model_name) -> Agent:
+    return Agent(
         name="Researcher",
-        instructions=researcher_instructions(),
+        instructions=_researcher_instructions,
         model=get_model(model_name),
-        mcp_servers=mcp_servers,
+        mcp_servers=list(mcp_servers),
     )
-    return researcher
+
+
+async def get_researcher(mcp_servers, model_name) -> Agent:
+    return _build_researcher(mcp_servers, model_name)
+
+
+def _build_researcher_tool(mcp_servers, model_name) -> Tool:
+    researcher = _build_researcher(mcp_servers, model_name)
+    tool = researcher.as_tool(tool_name="Researcher", tool_description=research_tool())
+    tool.on_invoke_tool = timed("tool.Researcher")(tool.on_invoke_tool)
+    return tool
+
+
+def _build_trader_agent(name: str, model_name: str, researcher_tool: Tool) -> Agent:
+    return Agent(
+        name=name,
+        instructions=trader_instructions(name),
+        model=get_model(model_name),
+        tools=[researcher_tool, *cached_local_tools()],
+        mcp_servers=[],
+    )
+
+
+# Agents hold no per-run state, so with pooled MCP servers they are built once
+# per trader, model and server names. An entry whose servers were replaced (a
+# memory server evicted and recreated by the pool) is rebuilt in place, so the
+# caches never grow past one entry per key or keep stopped servers alive.
+_researcher_tools: dict[tuple, tuple[tuple, Tool]] = {}
+_trader_agents: dict[tuple, tuple[Tool, Agent]] = {}
+
+
+def _cached_researcher_tool(model_name: str, mcp_servers: tuple) -> Tool:
+    key = (model_name, tuple(server.name for server in mcp_servers))
+    cached = _researcher_tools.get(key)
+    if cached is None or any(a is not b for a, b in zip(cached[0], mcp_servers)):
+        cached = (mcp_servers, _build_researcher_tool(mcp_servers, model_name))
+        _researcher_tools[key] = cached
+    return cached[1]
+
+
+def _cached_trader_agent(name: str, model_name: str, mcp_servers: tuple) -> Agent:
+    researcher_tool = _cached_researcher_tool(model_name, mcp_servers)
+    key = (name, model_name)
+    cached = _trader_agents.get(key)
+    if cached is None or cached[0] is not researcher_tool:
+        cached = (researcher_tool, _build_trader_agent(name, model_name, researcher_tool))
+        _trader_agents[key] = cached
+    return cached[1]
 
 
 async def get_researcher_tool(mcp_servers, model_name) -> Tool:
-    researcher = await get_researcher(mcp_servers, model_name)
-    return researcher.as_tool(tool_name="Researcher", tool_description=research_tool())
+    return _cached_researcher_tool(model_name, tuple(mcp_servers))
 
 
 class Trader:
@@ -81,19 +169,24 @@ class Trader:
         self.agent = None
         self.model_name = model_name
         self.do_trade = True
+        self.time_to_first_action: float | None = None
 
-    async def create_agent(self, trader_mcp_servers, researcher_mcp_servers) -> Agent:
-        # Local in-process tools (accounts, market, push)
-        local_tools = make_local_tools()
-        # Researcher tool still via MCP servers
-        tool = await get_researcher_tool(researcher_mcp_servers, self.model_name)
-        self.agent = Agent(
-            name=self.name,
-            instructions=trader_instructions(self.name),
-            model=get_model(self.model_name),
-            tools=[tool, *local_tools],
-            mcp_servers=[],
-        )
+    async def create_agent(
+        self, trader_mcp_servers, researcher_mcp_servers, cache: bool = True
+    ) -> Agent:
+        # Researcher tool via MCP servers plus local in-process tools (accounts,
+        # market, push). Agents over pooled servers are cached; servers spawned
+        # for a single run are not worth caching, so those agents are built fresh
+        if cache:
+            self.agent = _cached_trader_agent(
+                self.name, self.model_name, tuple(researcher_mcp_servers)
+            )
+        else:
+            self.agent = _build_trader_agent(
+                self.name,
+                self.model_name,
+                _build_researcher_tool(researcher_mcp_servers, self.model_name),
+            )
         return self.agent
 
     async def get_account_report(self) -> str:
@@ -102,16 +195,35 @@ class Trader:
         account_json.pop("portfolio_value_time_series", None)
         return json.dumps(account_json)
 
-    async def run_agent(self, trader_mcp_servers, researcher_mcp_servers):
-        self.agent = await self.create_agent(trader_mcp_servers, researcher_mcp_servers)
+    async def run_agent(self, trader_mcp_servers, researcher_mcp_servers, cache: bool = True):
+        self.agent = await self.create_agent(trader_mcp_servers, researcher_mcp_servers, cache)
         account = await self.get_account_report()
-        strategy = Account.get(self.name).get_strategy()
-        message = (
-            trade_message(self.name, strategy, account)
-            if self.do_trade
-            else rebalance_message(self.name, strategy, account)
-        )
-        await Runner.run(self.agent, message, max_turns=MAX_TURNS)
+        # Pick up an interrupted run where it stopped rather than redoing its research
+        checkpoint = RunCheckpoint.load(self.name)
+        if checkpoint is not None:
+            orders = [describe_order(order) for order in checkpoint.orders]
+            run_input = checkpoint.resume(resume_message(self.name, orders, account))
+            print(
+                f"[{self.name}] Resuming interrupted run "
+                f"({len(run_input)} items, {len(orders)} orders already executed)"
+            )
+        else:
+            strategy = Account.get(self.name).get_strategy()
+            message = (
+                trade_message(self.name, strategy, account)
+                if self.do_trade
+                else rebalance_message(self.name, strategy, account)
+            )
+            checkpoint = RunCheckpoint.start(self.name, self.do_trade, message)
+            run_input = message
+        with span("runner.run"), checkpoint.guard_orders():
+            if AGENT_STREAMING:
+                result = await self._run_streamed(run_input, checkpoint)
+            else:
+                result = await Runner.run(
+                    self.agent, run_input, max_turns=MAX_TURNS, hooks=checkpoint
+                )
+        checkpoint.clear()
         # Print a concise summary to the terminal so runs are visible
         try:
             summary = json.loads(Account.get(self.name).report())
@@ -120,31 +232,110 @@ class Trader:
             print(f"[{self.name}] Balance: {bal:.2f}; Holdings: {holdings}")
         except Exception as e:
             print(f"[{self.name}] Unable to print summary: {e}")
+        return result
 
-    async def run_with_mcp_servers(self):
-        # Only start Researcher MCP servers; Trader tools are local now
-        async with AsyncExitStack() as stack:
-            researcher_mcp_servers = [
-                await stack.enter_async_context(
-                    MCPServerStdio(params, client_session_timeout_seconds=120)  # type: ignore[arg-type]
+    async def _run_streamed(self, run_input, hooks):
+        """Run with the streamed runner, logging each event as it arrives."""
+        start = time.perf_counter()
+        self.time_to_first_action = None
+        tool_names: dict[str, str] = {}
+        async with BatchedLogWriter() as writer:
+            writer.log(self.name, "trace", "Run started" if self.do_trade else "Rebalance started")
+            result = Runner.run_streamed(
+                self.agent, run_input, max_turns=MAX_TURNS, hooks=hooks
+            )
+            try:
+                async for event in result.stream_events():
+                    if event.type != "run_item_stream_event":
+                        continue
+                    item = event.item
+                    if event.name == "tool_called":
+                        raw = item.raw_item
+                        tool = getattr(raw, "name", None) or "tool"
+                        tool_names[getattr(raw, "call_id", "")] = tool
+                        if self.time_to_first_action is None:
+                            self.time_to_first_action = time.perf_counter() - start
+                            record("trader.time_to_first_action", self.time_to_first_action)
+                            writer.log(
+                                self.name,
+                                "trace",
+                                f"First action after {self.time_to_first_action:.1f}s",
+                            )
+                        arguments = getattr(raw, "arguments", "") or ""
+                        writer.log(
+                            self.name, "trace", f"Calling {tool} {arguments[:LOG_PREVIEW_CHARS]}"
+                        )
+                    elif event.name == "tool_output":
+                        call_id = item.raw_item.get("call_id", "") if isinstance(item.raw_item, dict) else ""
+                        tool = tool_names.get(call_id, "tool")
+                        writer.log(
+                            self.name,
+                            "trace",
+                            f"{tool} returned {str(item.output)[:LOG_PREVIEW_CHARS]}",
+                        )
+                    elif event.name == "message_output_created":
+                        text = ItemHelpers.text_message_output(item)
+                        if text:
+                            writer.log(self.name, "agent", text[:LOG_PREVIEW_CHARS * 2])
+            finally:
+                # Stop the background run if we were cancelled (e.g. deadline)
+                if not result.is_complete:
+                    result.cancel()
+        return result
+
+    @timed("trader.run_with_mcp_servers")
+    async def run_with_mcp_servers(self, mcp_pool: MCPServerPool | None = None):
+        # Only Researcher MCP servers are needed; Trader tools are local now
+        if mcp_pool is not None:
+            start = time.perf_counter()
+            async with mcp_pool.lease(self.name) as researcher_mcp_servers:
+                record("mcp.lease", time.perf_counter() - start)
+                return await self.run_agent(
+                    trader_mcp_servers=None,
+                    researcher_mcp_servers=researcher_mcp_servers,
                 )
-                for params in researcher_mcp_server_params(self.name)
-            ]
-            await self.run_agent(
-                trader_mcp_servers=None, researcher_mcp_servers=researcher_mcp_servers
+        async with AsyncExitStack() as stack:
+            with span("mcp.connect"):
+                researcher_mcp_servers = [
+                    await stack.enter_async_context(
+                        MCPServerStdio(params, client_session_timeout_seconds=120)  # type: ignore[arg-type]
+                    )
+                    for params in researcher_mcp_server_params(self.name)
+                ]
+            return await self.run_agent(
+                trader_mcp_servers=None,
+                researcher_mcp_servers=with_research_cache(researcher_mcp_servers),
+                cache=False,
             )
 
-    async def run_with_trace(self):
+    async def run_with_trace(self, mcp_pool: MCPServerPool | None = None):
         trace_name = (
             f"{self.name}-trading" if self.do_trade else f"{self.name}-rebalancing"
         )
         # Use default tracing without custom trace_id or processors
-        with trace(trace_name):
-            await self.run_with_mcp_servers()
+        with trace(trace_name), llm_run_context(self.name) as run_id:
+            with collect_spans() as spans:
+                try:
+                    return await self.run_with_mcp_servers(mcp_pool)
+                finally:
+                    if METRICS_ENABLED:
+                        self._save_spans(run_id, spans)
+
+    def _save_spans(self, run_id: str, spans) -> None:
+        try:
+            write_run_spans(run_id, self.name, {k: h.to_dict() for k, h in spans.items()})
+        except Exception as e:
+            print(f"[{self.name}] Unable to save run timings: {e}")
+            return
+        slowest = sorted(spans.items(), key=lambda item: item[1].sum, reverse=True)[:4]
+        print(
+            f"[{self.name}] Timings: "
+            + ", ".join(f"{k} {h.sum:.2f}s/{h.count}" for k, h in slowest)
+        )
 
-    async def run(self):
+    async def run(self, mcp_pool: MCPServerPool | None = None):
         try:
-            await self.run_with_trace()
+            await self.run_with_trace(mcp_pool)
         except Exception as e:
             print(f"Error running trader {self.name}: {e}")
         self.do_trade = not self.do_trade
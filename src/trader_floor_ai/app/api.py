@@ -0,0 +1,177 @@
+"""Read-only JSON API served next to the Gradio dashboard.
+
+Every response carries an ETag built from cheap version reads (account
+versions, valuation timestamps, newest transaction and log ids) before any
+body is assembled. A request whose `If-None-Match` still matches gets a 304
+without touching account data, so polling an idle floor costs a couple of
+indexed lookups.
+
+Transactions and logs are cursor-paginated: pass the `next_cursor` of one
+response as `after` in the next request to receive only newer entries.
+"""
+
+import hashlib
+import os
+from typing import Callable
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+
+from trader_floor_ai.services.database import (
+    read_account_summaries,
+    read_account_summary,
+    read_account_version,
+    read_account_versions,
+    read_latest_log_id,
+    read_latest_transaction_id,
+    read_logs_since,
+    read_transactions_since,
+    read_valuation,
+    read_valuations,
+)
+
+load_dotenv(override=True)
+
+API_MAX_PAGE = int(os.getenv("API_MAX_PAGE", "500"))
+
+router = APIRouter(prefix="/api")
+
+
+def etag(*parts) -> str:
+    return f'"{hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()}"'
+
+
+def conditional(request: Request, tag: str, build: Callable[[], object]) -> Response:
+    """304 if the client already has `tag`, otherwise the JSON from `build()`."""
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    presented = request.headers.get("if-none-match", "").split(",")
+    matches = {t.strip().removeprefix("W/") for t in presented}
+    if tag in matches or "*" in matches:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(build(), headers=headers)
+
+
+def _version(name: str) -> tuple:
+    """An account's version and its valuation timestamp; 404 if unknown."""
+    version = read_account_version(name)
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"Unknown account {name}")
+    return version
+
+
+def _account_summary(name: str) -> dict:
+    """`read_account_summary` of `name`; 404 if it was deleted since `_version`."""
+    summary = read_account_summary(name)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"Unknown account {name}")
+    return summary
+
+
+def _summary(account: dict, valuation: dict | None) -> dict:
+    return {
+        "name": account["name"],
+        "version": account["version"],
+        "balance": account["balance"],
+        "strategy": account["strategy"],
+        "value": valuation["value"] if valuation else None,
+        "pnl": valuation["pnl"] if valuation else None,
+        "valued_at": valuation["updated_at"] if valuation else None,
+    }
+
+
+@router.get("/accounts")
+def accounts(request: Request):
+    versions = read_account_versions()
+    valuations = read_valuations()
+    tag = etag(
+        sorted(versions.items()),
+        sorted((name, v["updated_at"]) for name, v in valuations.items()),
+    )
+
+    def build():
+        return [
+            _summary(account, valuations.get(account["name"]))
+            for account in read_account_summaries()
+        ]
+
+    return conditional(request, tag, build)
+
+
+@router.get("/accounts/{name}")
+def account(name: str, request: Request):
+    tag = etag(name.lower(), *_version(name))
+
+    def build():
+        summary = _account_summary(name)
+        return _summary(summary, read_valuation(name))
+
+    return conditional(request, tag, build)
+
+
+@router.get("/accounts/{name}/holdings")
+def holdings(name: str, request: Request):
+    tag = etag("holdings", name.lower(), *_version(name))
+
+    def build():
+        summary = _account_summary(name)
+        valuation = read_valuation(name) or {}
+        positions = valuation.get("positions", {})
+        return {
+            symbol: positions.get(symbol, {"quantity": quantity, "price": None, "value": None})
+            for symbol, quantity in summary["holdings"].items()
+        }
+
+    return conditional(request, tag, build)
+
+
+@router.get("/accounts/{name}/valuation")
+def valuation(name: str, request: Request):
+    tag = etag("valuation", name.lower(), *_version(name))
+    return conditional(request, tag, lambda: read_valuation(name))
+
+
+@router.get("/accounts/{name}/transactions")
+def transactions(
+    name: str,
+    request: Request,
+    after: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+):
+    _version(name)
+    limit = min(limit, API_MAX_PAGE)
+    tag = etag("transactions", name.lower(), after, limit, read_latest_transaction_id(name))
+
+    def build():
+        items = read_transactions_since(name, after, limit)
+        return {"items": items, "next_cursor": items[-1]["id"] if items else after}
+
+    return conditional(request, tag, build)
+
+
+@router.get("/accounts/{name}/logs")
+def logs(
+    name: str,
+    request: Request,
+    after: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+):
+    _version(name)
+    limit = min(limit, API_MAX_PAGE)
+    tag = etag("logs", name.lower(), after, limit, read_latest_log_id(name))
+
+    def build():
+        items = read_logs_since(name, after, limit)
+        return {"items": items, "next_cursor": items[-1]["id"] if items else after}
+
+    return conditional(request, tag, build)
+
+
+def create_api_app(app: FastAPI | None = None) -> FastAPI:
+    """Add the `/api` routes to `app` (or a new FastAPI app)."""
+    app = app or FastAPI()
+    app.include_router(router)
+    return app
+
+
+__all__ = ["create_api_app", "etag", "router"]
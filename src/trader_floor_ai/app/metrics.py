@@ -0,0 +1,30 @@
+"""Prometheus `/metrics` endpoint served next to the Gradio dashboard.
+
+Trader runs persist their span histograms (see `utils.timing`), so the
+dashboard process renders the cumulative totals from the database rather than
+its own in-memory state.
+"""
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from trader_floor_ai.services.database import read_span_totals
+from trader_floor_ai.utils.timing import Histogram, render_prometheus
+
+
+def metrics_text() -> str:
+    totals = read_span_totals()
+    return render_prometheus({name: Histogram.from_dict(h) for name, h in totals.items()})
+
+
+def create_metrics_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        return PlainTextResponse(metrics_text(), media_type="text/plain; version=0.0.4")
+
+    return app
+
+
+__all__ = ["metrics_text", "create_metrics_app"]
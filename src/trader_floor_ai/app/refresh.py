@@ -0,0 +1,180 @@
+"""One refresh loop per dashboard process, pushed to every open session.
+
+Sections of the page (a trader's logs, a trader's account panels, the
+leaderboard) are registered with a compute function and a cadence. A single
+background loop computes each due section once in a worker thread, hashes the
+result and only re-renders and publishes sections whose hash changed. Each
+browser session holds one streaming event that waits for a new version and
+yields just the components it has not seen yet, so database load does not grow
+with viewers.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import gradio as gr
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+# Cadence of the shared loop (and of log sections); account panels refresh less often
+DASHBOARD_REFRESH_SECONDS = float(os.getenv("DASHBOARD_REFRESH_SECONDS", "1"))
+DASHBOARD_ACCOUNT_REFRESH_SECONDS = float(os.getenv("DASHBOARD_ACCOUNT_REFRESH_SECONDS", "10"))
+# Idle sessions still get an empty update this often, so closed tabs are noticed
+DASHBOARD_HEARTBEAT_SECONDS = float(os.getenv("DASHBOARD_HEARTBEAT_SECONDS", "15"))
+
+
+def digest(data: Any) -> str:
+    return hashlib.blake2b(repr(data).encode(), digest_size=16).hexdigest()
+
+
+@dataclass
+class Section:
+    key: str
+    compute: Callable[[], Any]
+    # Turns computed data into one value per component of the section
+    render: Callable[[Any], tuple]
+    every: float
+    components: list = field(default_factory=list)
+
+
+class DashboardRefresher:
+    def __init__(self, interval: float = DASHBOARD_REFRESH_SECONDS):
+        self.interval = interval
+        self.sections: dict[str, Section] = {}
+        self.version = 0
+        self.subscribers = 0
+        self._hashes: dict[str, str] = {}
+        self._values: dict[str, tuple] = {}
+        self._versions: dict[str, int] = {}
+        self._due: dict[str, float] = {}
+        self._changed: asyncio.Condition | None = None
+        self._task: asyncio.Task | None = None
+
+    def add(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        render: Callable[[Any], tuple],
+        every: float | None = None,
+    ) -> tuple:
+        """Register a section and return its current rendered values, for the
+        components' initial state; attach the components with `bind`."""
+        self.sections[key] = Section(key, compute, render, every or self.interval)
+        self._apply(self._compute([self.sections[key]], time.monotonic()))
+        return self._values[key]
+
+    def bind(self, key: str, *components) -> None:
+        self.sections[key].components = list(components)
+
+    def outputs(self) -> list:
+        return [c for section in self.sections.values() for c in section.components]
+
+    def _compute(self, sections, now: float) -> list[tuple[str, str, tuple]]:
+        """Compute due sections and render the ones that changed; return their
+        (key, hash, rendered values). Runs in a worker thread, so charts are
+        built and their marks read off the server's event loop."""
+        changed = []
+        for section in sections:
+            if now < self._due.get(section.key, 0):
+                continue
+            self._due[section.key] = now + section.every
+            try:
+                data = section.compute()
+            except Exception as e:
+                print(f"Dashboard section {section.key} failed: {e}")
+                continue
+            hashed = digest(data)
+            if hashed == self._hashes.get(section.key):
+                continue
+            try:
+                values = tuple(section.render(data))
+            except Exception as e:
+                print(f"Dashboard section {section.key} failed to render: {e}")
+                continue
+            changed.append((section.key, hashed, values))
+        return changed
+
+    def _apply(self, changed: list[tuple[str, str, tuple]]) -> bool:
+        """Publish rendered sections; only assignments, so cheap on the loop."""
+        if not changed:
+            return False
+        self.version += 1
+        for key, hashed, values in changed:
+            self._hashes[key] = hashed
+            self._values[key] = values
+            self._versions[key] = self.version
+        return True
+
+    def tick(self) -> bool:
+        """Refresh every due section once; True when something changed."""
+        return self._apply(self._compute(list(self.sections.values()), time.monotonic()))
+
+    async def _run(self) -> None:
+        while True:
+            if self.subscribers:
+                changed = await asyncio.to_thread(
+                    self._compute, list(self.sections.values()), time.monotonic()
+                )
+                if self._apply(changed):
+                    async with self._changed:
+                        self._changed.notify_all()
+            await asyncio.sleep(self.interval)
+
+    def _start(self) -> None:
+        # Runs on the server's event loop, started by the first session
+        if self._task is None or self._task.done():
+            self._changed = asyncio.Condition()
+            self._task = asyncio.create_task(self._run())
+
+    async def stream(self):
+        """Per-session event: yield the sections this session has not seen,
+        then wait for the shared loop to publish a newer version."""
+        self._start()
+        self.subscribers += 1
+        seen: dict[str, int] = {}
+        try:
+            while True:
+                update = []
+                for key, section in self.sections.items():
+                    current = self._versions.get(key, 0)
+                    if key in self._values and seen.get(key) != current:
+                        seen[key] = current
+                        update.extend(self._values[key])
+                    else:
+                        update.extend(gr.skip() for _ in section.components)
+                yield tuple(update)
+                version = self.version
+                async with self._changed:
+                    try:
+                        await asyncio.wait_for(
+                            self._changed.wait_for(lambda: self.version != version),
+                            DASHBOARD_HEARTBEAT_SECONDS,
+                        )
+                    except TimeoutError:
+                        pass
+        finally:
+            self.subscribers -= 1
+
+    def connect(self, ui: gr.Blocks) -> None:
+        """Start one push stream per page load, covering every bound component."""
+        ui.load(
+            fn=self.stream,
+            inputs=[],
+            outputs=self.outputs(),
+            show_progress="hidden",
+            concurrency_limit=None,
+        )
+
+
+__all__ = [
+    "DASHBOARD_ACCOUNT_REFRESH_SECONDS",
+    "DASHBOARD_REFRESH_SECONDS",
+    "DashboardRefresher",
+    "Section",
+    "digest",
+]
@@ -1,14 +1,52 @@
 import os
 import gradio as gr
-from typing import Any
+import numpy as np
 import pandas as pd
 import plotly.express as px
 
+from trader_floor_ai.app.refresh import (
+    DASHBOARD_ACCOUNT_REFRESH_SECONDS,
+    DashboardRefresher,
+)
+from trader_floor_ai.utils.downsample import DOWNSAMPLERS
 from trader_floor_ai.utils.util import css, js, Color
-from trader_floor_ai.scheduler.run import names, lastnames, short_model_names
-from trader_floor_ai.domain.accounts import Account
-from trader_floor_ai.services.database import read_log
+from trader_floor_ai.domain.accounts import INITIAL_BALANCE, Account
+from trader_floor_ai.domain.traders import list_traders
+from trader_floor_ai.services.database import (
+    DB_READ_ONLY,
+    init_db,
+    read_account,
+    read_account_field,
+    read_log,
+    read_latest_mark,
+    read_latest_transaction_id,
+    read_marks,
+    read_transaction,
+    read_transactions,
+    read_valuation,
+    read_valuations,
+)
+from trader_floor_ai.utils.timing import METRICS_ENABLED
 
+# Read-only JSON API next to the dashboard (see app.api)
+API_ENABLED = os.getenv("API_ENABLED", "true").strip().lower() == "true"
+
+# Beyond this many traders, show a leaderboard and detail panels for the first few
+# Dashboard processes started by launch_workers, on consecutive ports; they hold no
+# account state, so a load balancer can spread viewers across them (Gradio's
+# queue needs sticky sessions, /api does not)
+UI_WORKERS = int(os.getenv("UI_WORKERS", "1"))
+UI_MAX_TRADER_PANELS = int(os.getenv("UI_MAX_TRADER_PANELS", "8"))
+# Points drawn per portfolio chart (about its width in pixels), and how they are picked
+CHART_MAX_POINTS = int(os.getenv("CHART_MAX_POINTS", "300"))
+CHART_DOWNSAMPLING = os.getenv("CHART_DOWNSAMPLING", "lttb").strip().lower()
+# Rows per page of the transactions table and characters of rationale shown per row
+UI_TRANSACTIONS_PAGE_SIZE = int(os.getenv("UI_TRANSACTIONS_PAGE_SIZE", "10"))
+UI_RATIONALE_PREVIEW_CHARS = int(os.getenv("UI_RATIONALE_PREVIEW_CHARS", "80"))
+# Largest positions listed individually; the rest are summed into one row
+UI_HOLDINGS_MAX_ROWS = int(os.getenv("UI_HOLDINGS_MAX_ROWS", "20"))
+
+TRANSACTION_COLUMNS = ["#", "Timestamp", "Symbol", "Quantity", "Price", "Rationale"]
 
 mapper = {
     "trace": Color.YELLOW,
@@ -17,30 +55,109 @@ mapper = {
 }
 
 
+class MarkSeries:
+    """An account's mark-to-market series kept in memory between refreshes;
+    each update reads only the marks since the last one seen."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.times = np.array([], dtype="datetime64[ns]")
+        self.values = np.array([], dtype=float)
+        self.last = None
+
+    def update(self) -> None:
+        new = read_marks(self.name, since=self.last)
+        if self.last is not None and (not new or new[0][0] != self.last):
+            # The series was rewritten (e.g. a reset); start over
+            self.__init__(self.name)
+            new = read_marks(self.name)
+        if not new:
+            return
+        # The newest cached bucket may have been re-marked with a new value
+        keep = len(self.times) - 1 if self.last is not None else 0
+        self.times = np.concatenate(
+            [self.times[:keep], pd.to_datetime([t for t, _ in new], format="ISO8601").values]
+        )
+        self.values = np.concatenate([self.values[:keep], [v for _, v in new]])
+        self.last = new[-1][0]
+
+
 class Trader:
+    """A trader's dashboard data. Everything is read from the database on
+    demand and nothing is written, so any number of read-only dashboard
+    workers can serve the same floor; only render caches live in memory."""
+
     def __init__(self, name: str, lastname: str, model_name: str):
         self.name = name
         self.lastname = lastname
         self.model_name = model_name
-        self.account = Account.get(name)
-
-    def reload(self):
-        self.account = Account.get(self.name)
+        self.marks = MarkSeries(name)
+        self._chart = None
+        self._chart_key = None
 
     def get_title(self) -> str:
         return f"<div style='text-align: center;font-size:34px;'>{self.name}<span style='color:#ccc;font-size:24px;'> ({self.model_name}) - {self.lastname}</span></div>"
 
-    def get_strategy(self) -> str:
-        return self.account.get_strategy()
+    def get_valuation(self, valuation: dict | None = None) -> dict:
+        """The latest valuation snapshot written by the trading side. An account
+        that was never valued falls back to its marked prices; neither path
+        calls the market API."""
+        valuation = valuation or read_valuation(self.name)
+        if valuation is None:
+            fields = read_account(self.name)
+            if fields is None:
+                return {"value": INITIAL_BALANCE, "pnl": 0.0, "positions": {}}
+            account = Account(**fields)
+            value, pnl, positions = account.valuation(account.marked_prices())
+            valuation = {"value": value, "pnl": pnl, "positions": positions}
+        return valuation
+
+    def get_legacy_series(self) -> list:
+        return read_account_field(self.name, "portfolio_value_time_series") or []
+
+    def get_series_key(self) -> tuple:
+        """Changes whenever a value point is added, without loading the series.
+        Marks are appended in time order and re-marking a bucket only changes
+        the newest one, so the latest mark identifies the series."""
+        legacy = self.get_legacy_series()
+        mark = read_latest_mark(self.name)
+        latest = (mark["datetime"], mark["value"]) if mark else None
+        return (len(legacy), legacy[-1] if legacy else None, latest)
 
-    def get_portfolio_value_df(self) -> pd.DataFrame:
-        df = pd.DataFrame(
-            self.account.portfolio_value_time_series, columns=["datetime", "value"]
+    def get_account_state(self) -> tuple:
+        """Everything the account panels show, read once per refresh."""
+        valuation = self.get_valuation()
+        return (
+            (valuation["value"], valuation["pnl"]),
+            self.get_series_key(),
+            valuation["positions"],
+            read_latest_transaction_id(self.name),
+        )
+
+    def get_portfolio_value_df(self, max_points: int = CHART_MAX_POINTS) -> pd.DataFrame:
+        """Legacy value points and marks, downsampled to at most `max_points`."""
+        self.marks.update()
+        legacy = self.get_legacy_series()
+        times = np.concatenate(
+            [pd.to_datetime([t for t, _ in legacy], format="ISO8601").values, self.marks.times]
         )
-        df["datetime"] = pd.to_datetime(df["datetime"])
-        return df
+        values = np.concatenate([[v for _, v in legacy], self.marks.values])
+        if len(times) > max_points:
+            downsample = DOWNSAMPLERS.get(CHART_DOWNSAMPLING, DOWNSAMPLERS["lttb"])
+            keep = downsample(times.astype("int64"), values, max_points)
+            times, values = times[keep], values[keep]
+        return pd.DataFrame({"datetime": times, "value": values})
+
+    def get_portfolio_value_chart(self, key=None):
+        """The chart at CHART_MAX_POINTS resolution, rebuilt only when the
+        series gained points since the cached figure was drawn."""
+        key = key or self.get_series_key()
+        if self._chart is None or key != self._chart_key:
+            self._chart = self._build_chart()
+            self._chart_key = key
+        return self._chart
 
-    def get_portfolio_value_chart(self):
+    def _build_chart(self):
         df = self.get_portfolio_value_df()
         fig = px.line(df, x="datetime", y="value")
         margin = dict(l=40, r=20, t=20, b=40)
@@ -56,45 +173,93 @@ class Trader:
         fig.update_yaxes(tickfont=dict(size=8), tickformat=",.0f")
         return fig
 
-    def get_holdings_df(self) -> pd.DataFrame:
-        holdings = self.account.get_holdings()
-        if not holdings:
-            return pd.DataFrame(columns=["Symbol", "Quantity"])
-        df = pd.DataFrame(
-            [
-                {"Symbol": symbol, "Quantity": quantity}
-                for symbol, quantity in holdings.items()
-            ]
+    def get_holdings_df(self, positions=None) -> pd.DataFrame:
+        if positions is None:
+            positions = self.get_valuation()["positions"]
+        if not positions:
+            return pd.DataFrame(columns=["Symbol", "Quantity", "Price", "Value"])
+        largest = sorted(positions.items(), key=lambda item: -item[1]["value"])
+        rows = [
+            {
+                "Symbol": symbol,
+                "Quantity": position["quantity"],
+                "Price": round(position["price"], 2),
+                "Value": round(position["value"], 2),
+            }
+            for symbol, position in largest[:UI_HOLDINGS_MAX_ROWS]
+        ]
+        rest = largest[UI_HOLDINGS_MAX_ROWS:]
+        if rest:
+            rows.append(
+                {
+                    "Symbol": f"{len(rest)} more",
+                    "Quantity": sum(position["quantity"] for _, position in rest),
+                    "Price": None,
+                    "Value": round(sum(position["value"] for _, position in rest), 2),
+                }
+            )
+        return pd.DataFrame(rows)
+
+    def get_transactions_page(
+        self, before_id=None, symbol=None, start=None, end=None
+    ) -> tuple[list[dict], int | None]:
+        """One page of transactions, newest first, and the cursor of the next
+        page (None on the last page)."""
+        rows = read_transactions(
+            self.name,
+            limit=UI_TRANSACTIONS_PAGE_SIZE + 1,
+            before_id=before_id,
+            symbol=symbol or None,
+            start=start or None,
+            end=end or None,
+            preview_chars=UI_RATIONALE_PREVIEW_CHARS,
         )
-        return df
+        page = rows[:UI_TRANSACTIONS_PAGE_SIZE]
+        more = len(rows) > UI_TRANSACTIONS_PAGE_SIZE
+        return page, page[-1]["id"] if more else None
 
-    def get_transactions_df(self) -> pd.DataFrame:
-        transactions = self.account.list_transactions()
-        if not transactions:
-            return pd.DataFrame(
-                columns=["Timestamp", "Symbol", "Quantity", "Price", "Rationale"]
-            )
-        return pd.DataFrame(transactions)
+    def get_transactions_df(self, rows=None) -> pd.DataFrame:
+        if rows is None:
+            rows, _ = self.get_transactions_page()
+        if not rows:
+            return pd.DataFrame(columns=TRANSACTION_COLUMNS)
+        return pd.DataFrame(
+            [
+                [
+                    row["id"],
+                    row["timestamp"],
+                    row["symbol"],
+                    row["quantity"],
+                    round(row["price"], 2),
+                    row["rationale"] + ("…" if row["truncated"] else ""),
+                ]
+                for row in rows
+            ],
+            columns=TRANSACTION_COLUMNS,
+        )
 
-    def get_portfolio_value(self) -> str:
-        portfolio_value = self.account.calculate_portfolio_value() or 0.0
-        pnl = self.account.calculate_profit_loss(portfolio_value) or 0.0
+    def get_portfolio_value(self, marked=None) -> str:
+        if marked is None:
+            valuation = self.get_valuation()
+            marked = valuation["value"], valuation["pnl"]
+        portfolio_value, pnl = marked
         color = "green" if pnl >= 0 else "red"
         emoji = "⬆" if pnl >= 0 else "⬇"
         return f"<div style='text-align: center;background-color:{color};'><span style='font-size:32px'>${portfolio_value:,.0f}</span><span style='font-size:24px'>&nbsp;&nbsp;&nbsp;{emoji}&nbsp;${pnl:,.0f}</span></div>"
 
-    def get_logs(self, previous=None) -> Any:
+    def get_log_entries(self) -> list:
         all_logs = list(read_log(self.name, last_n=100))
         allowed = {"account", "trace", "agent"}
-        filtered_logs = [log for log in all_logs if log[1] in allowed][-13:]
+        return [log for log in all_logs if log[1] in allowed][-13:]
+
+    def get_logs(self, entries=None) -> str:
+        if entries is None:
+            entries = self.get_log_entries()
         response = ""
-        for timestamp, type, message in filtered_logs:
+        for timestamp, type, message in entries:
             color = mapper.get(type, Color.WHITE).value
             response += f"<span style='color:{color}'>{timestamp} : [{type}] {message}</span><br/>"
-        response = f"<div style='height:250px; overflow-y:auto;'>{response}</div>"
-        if response != previous:
-            return response
-        return gr.update()
+        return f"<div style='height:250px; overflow-y:auto;'>{response}</div>"
 
 
 class TraderView:
@@ -104,96 +269,231 @@ class TraderView:
         self.chart = None
         self.holdings_table = None
         self.transactions_table = None
+        self.latest_transaction = None
+
+    def render_account(self, state) -> tuple:
+        marked, series_key, holdings, latest_transaction = state
+        return (
+            self.trader.get_portfolio_value(marked),
+            self.trader.get_portfolio_value_chart(series_key),
+            self.trader.get_holdings_df(holdings),
+            latest_transaction,
+        )
+
+    def show_page(self, cursors, symbol, start, end):
+        """Render the page at the end of `cursors` (the before_id of every page
+        visited so far) for this session's filters."""
+        rows, next_cursor = self.trader.get_transactions_page(cursors[-1], symbol, start, end)
+        label = f"Page {len(cursors)}" + ("" if next_cursor else " (last)")
+        return self.trader.get_transactions_df(rows), label, cursors, next_cursor
+
+    def first_page(self, symbol, start, end):
+        return self.show_page([None], symbol, start, end)
+
+    def older_page(self, cursors, next_cursor, symbol, start, end):
+        if next_cursor is None:
+            return gr.skip(), gr.skip(), cursors, next_cursor
+        return self.show_page([*cursors, next_cursor], symbol, start, end)
+
+    def newer_page(self, cursors, symbol, start, end):
+        return self.show_page(cursors[:-1] or [None], symbol, start, end)
+
+    def on_new_transaction(self, cursors, next_cursor, symbol, start, end):
+        # Only a session looking at the newest page needs to see the trade
+        if len(cursors) > 1:
+            return gr.skip(), gr.skip(), cursors, next_cursor
+        return self.show_page(cursors, symbol, start, end)
 
-    def make_ui(self):
+    def show_rationale(self, evt: gr.SelectData) -> str:
+        row = evt.row_value or []
+        transaction = read_transaction(int(row[0])) if row and row[0] is not None else None
+        return transaction["rationale"] if transaction else ""
+
+    def make_ui(self, refresher: DashboardRefresher):
+        key = self.trader.name.lower()
+        value, chart, holdings, latest_transaction = refresher.add(
+            f"{key}:account",
+            self.trader.get_account_state,
+            self.render_account,
+            every=DASHBOARD_ACCOUNT_REFRESH_SECONDS,
+        )
+        (logs,) = refresher.add(
+            f"{key}:logs",
+            self.trader.get_log_entries,
+            lambda entries: (self.trader.get_logs(entries),),
+        )
         with gr.Column():
             gr.HTML(self.trader.get_title())
             with gr.Row():
-                self.portfolio_value = gr.HTML(self.trader.get_portfolio_value)
+                self.portfolio_value = gr.HTML(value)
             with gr.Row():
-                self.chart = gr.Plot(
-                    self.trader.get_portfolio_value_chart,
-                    container=True,
-                    show_label=False,
-                )
+                self.chart = gr.Plot(chart, container=True, show_label=False)
             with gr.Row(variant="panel"):
-                self.log = gr.HTML(self.trader.get_logs)
+                self.log = gr.HTML(logs)
             with gr.Row():
                 self.holdings_table = gr.Dataframe(
-                    value=self.trader.get_holdings_df,
+                    value=holdings,
                     label="Holdings",
-                    headers=["Symbol", "Quantity"],
+                    headers=["Symbol", "Quantity", "Price", "Value"],
                     row_count=(5, "dynamic"),
-                    col_count=2,
+                    col_count=4,
                     max_height=300,
                     elem_classes=["dataframe-fix-small"],
                 )
+            with gr.Row():
+                symbol = gr.Textbox(label="Symbol", max_lines=1, scale=1)
+                start = gr.Textbox(label="From", placeholder="YYYY-MM-DD", max_lines=1, scale=1)
+                end = gr.Textbox(label="To", placeholder="YYYY-MM-DD", max_lines=1, scale=1)
+            rows, first_next = self.trader.get_transactions_page()
             with gr.Row():
                 self.transactions_table = gr.Dataframe(
-                    value=self.trader.get_transactions_df,
-                    label="Recent Transactions",
-                    headers=["Timestamp", "Symbol", "Quantity", "Price", "Rationale"],
+                    value=self.trader.get_transactions_df(rows),
+                    label="Transactions",
+                    headers=TRANSACTION_COLUMNS,
                     row_count=(5, "dynamic"),
-                    col_count=5,
+                    col_count=len(TRANSACTION_COLUMNS),
                     max_height=300,
+                    interactive=False,
                     elem_classes=["dataframe-fix"],
                 )
-        timer = gr.Timer(value=120)
-        timer.tick(
-            fn=self.refresh,
-            inputs=[],
-            outputs=[
-                self.portfolio_value,
-                self.chart,
-                self.holdings_table,
-                self.transactions_table,
-            ],
-            show_progress="hidden",
-            queue=False,
+            with gr.Row():
+                newer = gr.Button("◀ Newer", size="sm", scale=1)
+                page_label = gr.Markdown("Page 1" + ("" if first_next else " (last)"))
+                older = gr.Button("Older ▶", size="sm", scale=1)
+            rationale = gr.Textbox(
+                label="Rationale",
+                placeholder="Select a transaction to read its full rationale",
+                lines=3,
+                interactive=False,
+            )
+            # Paging state is per session; the shared refresher only pushes the
+            # id of the newest transaction, which reloads sessions on page 1
+            cursors = gr.State([None])
+            next_cursor = gr.State(first_next)
+            self.latest_transaction = gr.Number(latest_transaction, visible=False)
+
+        filters = [symbol, start, end]
+        page_outputs = [self.transactions_table, page_label, cursors, next_cursor]
+        for control in filters:
+            control.submit(self.first_page, filters, page_outputs, show_progress="hidden")
+        older.click(
+            self.older_page, [cursors, next_cursor, *filters], page_outputs, show_progress="hidden"
         )
-        log_timer = gr.Timer(value=0.5)
-        log_timer.tick(
-            fn=self.trader.get_logs,
-            inputs=[self.log],
-            outputs=[self.log],
+        newer.click(self.newer_page, [cursors, *filters], page_outputs, show_progress="hidden")
+        self.latest_transaction.change(
+            self.on_new_transaction,
+            [cursors, next_cursor, *filters],
+            page_outputs,
             show_progress="hidden",
-            queue=False,
         )
+        self.transactions_table.select(self.show_rationale, None, rationale, show_progress="hidden")
+        refresher.bind(
+            f"{key}:account",
+            self.portfolio_value,
+            self.chart,
+            self.holdings_table,
+            self.latest_transaction,
+        )
+        refresher.bind(f"{key}:logs", self.log)
 
     def refresh(self):
-        self.trader.reload()
-        return (
-            self.trader.get_portfolio_value(),
-            self.trader.get_portfolio_value_chart(),
-            self.trader.get_holdings_df(),
-            self.trader.get_transactions_df(),
+        return self.render_account(self.trader.get_account_state())
+
+
+class LeaderboardView:
+    def __init__(self, traders: list[Trader]):
+        self.traders = traders
+        self.table = None
+
+    def get_leaderboard_rows(self) -> list[dict]:
+        rows = []
+        # One query for every trader's snapshot instead of loading each account
+        valuations = read_valuations()
+        for trader in self.traders:
+            valuation = trader.get_valuation(valuations.get(trader.name.lower()))
+            portfolio_value, pnl = valuation["value"], valuation["pnl"]
+            rows.append(
+                {
+                    "Trader": trader.name,
+                    "Model": trader.model_name,
+                    "Value": round(portfolio_value, 2),
+                    "P&L": round(pnl, 2),
+                }
+            )
+        return rows
+
+    def get_leaderboard_df(self, rows=None) -> pd.DataFrame:
+        if rows is None:
+            rows = self.get_leaderboard_rows()
+        return pd.DataFrame(rows, columns=["Trader", "Model", "Value", "P&L"]).sort_values(
+            "Value", ascending=False
+        )
+
+    def make_ui(self, refresher: DashboardRefresher):
+        (leaderboard,) = refresher.add(
+            "leaderboard",
+            self.get_leaderboard_rows,
+            lambda rows: (self.get_leaderboard_df(rows),),
+            every=DASHBOARD_ACCOUNT_REFRESH_SECONDS,
         )
+        with gr.Row():
+            self.table = gr.Dataframe(
+                value=leaderboard,
+                label=f"Leaderboard ({len(self.traders)} traders)",
+                headers=["Trader", "Model", "Value", "P&L"],
+                max_height=400,
+            )
+        refresher.bind("leaderboard", self.table)
 
 
 def create_ui():
     traders = [
-        Trader(trader_name, lastname, model_name)
-        for trader_name, lastname, model_name in zip(
-            names, lastnames, short_model_names
-        )
+        Trader(profile.name, profile.lastname, profile.short_model_name)
+        for profile in list_traders()
     ]
-    trader_views = [TraderView(trader) for trader in traders]
+    trader_views = [TraderView(trader) for trader in traders[:UI_MAX_TRADER_PANELS]]
+    # One refresh loop serves every session; nothing below polls per viewer
+    refresher = DashboardRefresher()
     with gr.Blocks(
         title="Traders", css=css, js=js, theme="soft", fill_width=True
     ) as ui:
+        if len(traders) > UI_MAX_TRADER_PANELS:
+            LeaderboardView(traders).make_ui(refresher)
         for i in range(0, len(trader_views), 2):
             with gr.Row():
                 for trader_view in trader_views[i : i + 2]:
-                    trader_view.make_ui()
+                    trader_view.make_ui(refresher)
+        refresher.connect(ui)
     return ui
 
 
-def launch():
+def _base_port() -> int:
+    return int(os.getenv("GRADIO_SERVER_PORT") or os.getenv("PORT") or "7860")
+
+
+def launch(port: int | None = None):
+    # Read-only workers never touch the schema; the writer (scheduler) owns it
+    if not DB_READ_ONLY:
+        init_db()
     ui = create_ui()
-    port_env = os.getenv("GRADIO_SERVER_PORT") or os.getenv("PORT") or "7860"
+    port_env = str(port or _base_port())
     host = os.getenv("GRADIO_SERVER_NAME", os.getenv("HOST", "0.0.0.0"))
     print(f"Starting Gradio UI on {host}:{port_env}")
     try:
+        if METRICS_ENABLED or API_ENABLED:
+            # Serve /metrics and /api from the same port by mounting the UI on a FastAPI app
+            import uvicorn
+            from fastapi import FastAPI
+
+            from trader_floor_ai.app.api import create_api_app
+            from trader_floor_ai.app.metrics import create_metrics_app
+
+            app = create_metrics_app() if METRICS_ENABLED else FastAPI()
+            if API_ENABLED:
+                create_api_app(app)
+            app = gr.mount_gradio_app(app, ui, path="/", show_error=True)
+            uvicorn.run(app, host=host, port=int(port_env))
+            return
         ui.launch(
             server_name=host, 
             server_port=int(port_env), 
@@ -206,3 +506,34 @@ def launch():
         import traceback
         traceback.print_exc()
         raise
+
+
+def launch_workers(count: int = UI_WORKERS):
+    """Run `count` dashboard processes on consecutive ports from the base port.
+
+    Workers open the database read-only unless DB_READ_ONLY is set explicitly;
+    point DB_READ_PATH at a snapshot (see DB_SNAPSHOT_PATH) to keep their reads
+    off the scheduler's database file entirely.
+    """
+    if count <= 1:
+        launch()
+        return
+    import multiprocessing
+
+    os.environ.setdefault("DB_READ_ONLY", "true")
+    # Spawn so every worker re-reads the environment and builds its own UI
+    context = multiprocessing.get_context("spawn")
+    base = _base_port()
+    workers = [
+        context.Process(target=launch, args=(base + i,), name=f"dashboard-{i}")
+        for i in range(count)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
@@ -3,28 +3,23 @@ import json
 from dotenv import load_dotenv
 from datetime import datetime
 
+from trader_floor_ai.domain.ledger import replay
 from trader_floor_ai.services.market import get_share_price
-from trader_floor_ai.services.database import write_account, read_account, write_log
+from trader_floor_ai.services.database import (
+    write_account,
+    write_account_projections,
+    read_account,
+    write_log,
+    read_latest_mark,
+    read_marks,
+)
+from trader_floor_ai.services.symbols import SYMBOL_SYNONYMS, validate_symbol
 
 load_dotenv(override=True)
 
 INITIAL_BALANCE = 10_000.0
 SPREAD = 0.002
 
-# Map non-equity or alias tickers to equity proxies (ETFs/trusts) we can trade
-SYMBOL_SYNONYMS: dict[str, str] = {
-    # Bitcoin -> spot ETF or trust
-    "BTC-USD": "IBIT",
-    "BTCUSD": "IBIT",
-    "BTC": "IBIT",
-    "XBT-USD": "IBIT",
-    "XBTUSD": "IBIT",
-    # Ethereum -> trust (widely available ticker)
-    "ETH-USD": "ETHE",
-    "ETHUSD": "ETHE",
-    "ETH": "ETHE",
-}
-
 
 def normalize_symbol(symbol: str) -> tuple[str, str | None]:
     """Return a tradable equity symbol and a note if the symbol was mapped.
@@ -64,6 +59,11 @@ class Account(BaseModel):
     @classmethod
     def get(cls, name: str):
         fields = read_account(name.lower())
+        if not fields:
+            # A lost projection is recovered from the account's ledger
+            seq, fields = replay(name.lower())
+            if fields:
+                write_account_projections([(name, seq, fields)])
         if not fields:
             fields = {
                 "name": name.lower(),
@@ -73,11 +73,41 @@ class Account(BaseModel):
                 "transactions": [],
                 "portfolio_value_time_series": [],
             }
-            write_account(name, fields)
+            write_account(name, fields, event=("opened", fields))
         return cls(**fields)
 
-    def save(self):
-        write_account(self.name.lower(), self.model_dump())
+    @classmethod
+    def from_events(cls, name: str, from_scratch: bool = False):
+        """The account rebuilt from its latest snapshot and later events (or
+        every event with `from_scratch`), ignoring the stored account."""
+        _, fields = replay(name.lower(), from_scratch)
+        return cls(**fields) if fields else None
+
+    def save(
+        self,
+        event: tuple[str, dict],
+        prices: dict[str, float] | None = None,
+        transaction: Transaction | None = None,
+    ):
+        """Persist the account and append the (type, data) `event` that changed
+        it to its ledger. With `prices`, also replace the valuation snapshot the
+        dashboard reads, and with `transaction`, append it to the transactions
+        table, in the same database transaction. A reset also drops the
+        account's transactions and marks, so its history, chart and marked
+        prices start over."""
+        valuation = None
+        if prices is not None:
+            value, pnl, positions = self.valuation(prices)
+            updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            valuation = (updated_at, value, pnl, positions)
+        write_account(
+            self.name.lower(),
+            self.model_dump(),
+            valuation,
+            transaction.model_dump() if transaction else None,
+            event,
+            reset=event[0] == "reset",
+        )
 
     def reset(self, strategy: str):
         self.balance = INITIAL_BALANCE
@@ -85,7 +115,7 @@ class Account(BaseModel):
         self.holdings = {}
         self.transactions = []
         self.portfolio_value_time_series = []
-        self.save()
+        self.save(("reset", {"strategy": strategy, "balance": INITIAL_BALANCE}), {})
 
     def deposit(self, amount: float):
         """Deposit funds into the account."""
@@ -93,7 +123,7 @@ class Account(BaseModel):
             raise ValueError("Deposit amount must be positive.")
         self.balance += amount
         print(f"Deposited ${amount}. New balance: ${self.balance}")
-        self.save()
+        self.save(("deposit", {"amount": amount}), self.marked_prices())
 
     def withdraw(self, amount: float):
         """Withdraw funds from the account, ensuring it doesn't go negative."""
@@ -101,20 +131,21 @@ class Account(BaseModel):
             raise ValueError("Insufficient funds for withdrawal.")
         self.balance -= amount
         print(f"Withdrew ${amount}. New balance: ${self.balance}")
-        self.save()
+        self.save(("withdraw", {"amount": amount}), self.marked_prices())
 
     def buy_shares(self, symbol: str, quantity: int, rationale: str) -> str:
         """Buy shares of a stock if sufficient funds are available."""
-        symbol, map_note = normalize_symbol(symbol)
+        # Reject or auto-correct unknown symbols before any price lookup
+        symbol, map_note = validate_symbol(symbol)
         if map_note:
             rationale = f"{rationale} {map_note}"
         price = get_share_price(symbol)
-        buy_price = price * (1 + SPREAD)
-        total_cost = buy_price * quantity
-
         if price == 0:
             raise ValueError(f"Unrecognized symbol {symbol}")
 
+        buy_price = price * (1 + SPREAD)
+        total_cost = buy_price * quantity
+
         # If not enough cash, auto-size down to the maximum affordable quantity
         if total_cost > self.balance:
             max_affordable = int(self.balance // buy_price)
@@ -146,7 +177,11 @@ class Account(BaseModel):
 
         # Update balance
         self.balance -= total_cost
-        self.save()
+        self.save(
+            ("buy", transaction.model_dump()),
+            {**self.marked_prices(), symbol: price},
+            transaction,
+        )
         write_log(self.name, "account", f"Bought {quantity} of {symbol}")
         return "Completed. Latest details:\n" + self.report()
 
@@ -183,17 +218,73 @@ class Account(BaseModel):
 
         # Update balance
         self.balance += total_proceeds
-        self.save()
+        self.save(
+            ("sell", transaction.model_dump()),
+            {**self.marked_prices(), symbol: price},
+            transaction,
+        )
         write_log(self.name, "account", f"Sold {quantity} of {symbol}")
         return "Completed. Latest details:\n" + self.report()
 
-    def calculate_portfolio_value(self):
-        """Calculate the total value of the user's portfolio."""
+    def calculate_portfolio_value(self, prices: dict[str, float] | None = None):
+        """Calculate the total value of the user's portfolio.
+
+        Uses `prices` when given (e.g. a batched snapshot) and only looks up
+        symbols that are missing from it.
+        """
+        prices = prices or {}
         total_value = self.balance
         for symbol, quantity in self.holdings.items():
-            total_value += get_share_price(symbol) * quantity
+            price = prices.get(symbol)
+            if price is None:
+                price = get_share_price(symbol)
+            total_value += price * quantity
         return total_value
 
+    def marked_prices(self) -> dict[str, float]:
+        """Prices of current holdings from the latest mark, without network calls.
+
+        Symbols bought since the last mark fall back to their last traded price.
+        """
+        mark = read_latest_mark(self.name)
+        marked = mark["prices"] if mark else {}
+        # Zero marks were failed lookups, not prices
+        prices = {symbol: marked[symbol] for symbol in self.holdings if marked.get(symbol, 0) > 0}
+        unmarked = {symbol for symbol in self.holdings if symbol not in prices}
+        # One pass from the newest transaction, stopping once every symbol is priced
+        for transaction in reversed(self.transactions):
+            if not unmarked:
+                break
+            if transaction.symbol in unmarked:
+                prices[transaction.symbol] = transaction.price
+                unmarked.discard(transaction.symbol)
+        for symbol in unmarked:
+            prices[symbol] = 0.0
+        return prices
+
+    def marked_value(self) -> tuple[float, float]:
+        """Return (portfolio value, profit/loss) at the latest marked prices."""
+        portfolio_value = self.calculate_portfolio_value(self.marked_prices())
+        return portfolio_value, self.calculate_profit_loss(portfolio_value)
+
+    def valuation(self, prices: dict[str, float]) -> tuple[float, float, dict]:
+        """(value, profit/loss, positions) of the holdings at `prices`, where
+        positions maps each symbol to its quantity, price and value."""
+        positions = {
+            symbol: {
+                "quantity": quantity,
+                "price": prices.get(symbol, 0.0),
+                "value": prices.get(symbol, 0.0) * quantity,
+            }
+            for symbol, quantity in self.holdings.items()
+        }
+        value = self.balance + sum(p["value"] for p in positions.values())
+        return value, self.calculate_profit_loss(value), positions
+
+    def get_portfolio_value_time_series(self) -> list[tuple[str, float]]:
+        """Legacy in-account value points followed by the mark-to-market series."""
+        return [*self.portfolio_value_time_series, *read_marks(self.name)]
+
     def calculate_profit_loss(self, portfolio_value: float):
         """Calculate profit or loss from the initial spend."""
         initial_spend = sum(transaction.total() for transaction in self.transactions)
@@ -214,12 +305,7 @@ class Account(BaseModel):
 
     def report(self) -> str:
         """Return a json string representing the account."""
-        portfolio_value = self.calculate_portfolio_value()
-        self.portfolio_value_time_series.append(
-            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), portfolio_value)
-        )
-        self.save()
-        pnl = self.calculate_profit_loss(portfolio_value)
+        portfolio_value, pnl = self.marked_value()
         data = self.model_dump()
         data["total_portfolio_value"] = portfolio_value
         data["total_profit_loss"] = pnl
@@ -234,13 +320,14 @@ class Account(BaseModel):
     def change_strategy(self, strategy: str) -> str:
         """At your discretion, if you choose to, call this to change your investment strategy for the future"""
         self.strategy = strategy
-        self.save()
+        self.save(("strategy", {"strategy": strategy}), self.marked_prices())
         write_log(self.name, "account", f"Changed strategy")
         return "Changed strategy"
 
 
 __all__ = [
     "Account",
+    "SYMBOL_SYNONYMS",
     "Transaction",
     "normalize_symbol",
     "INITIAL_BALANCE",
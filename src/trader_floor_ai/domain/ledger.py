@@ -0,0 +1,146 @@
+"""Account ledger: replay of account events and projection rebuilds.
+
+Every account save appends an event (opened, deposit, withdraw, buy, sell,
+strategy, reset, or a whole-account 'state') to `account_events`; the
+`accounts` row is the projection of those events. An account is rebuilt from
+its latest snapshot plus the events after it, so replay cost is bounded by
+ACCOUNT_SNAPSHOT_EVERY rather than by the account's age.
+
+Usage: python -m trader_floor_ai.domain.ledger [--names warren george]
+       [--from-scratch] [--check]
+"""
+
+import argparse
+import sys
+import time
+
+from trader_floor_ai.services.database import (
+    init_db,
+    read_account,
+    read_account_event_names,
+    read_account_events,
+    read_account_snapshot,
+    write_account_projections,
+)
+
+
+def apply_event(account: dict | None, type: str, data: dict) -> dict:
+    """Return the account state after one event (mutating `account` in place)."""
+    if type in ("opened", "state"):
+        return {
+            **data,
+            "holdings": dict(data["holdings"]),
+            "transactions": list(data["transactions"]),
+        }
+    if account is None:
+        raise ValueError(f"'{type}' event before the account was opened")
+    if type == "deposit":
+        account["balance"] += data["amount"]
+    elif type == "withdraw":
+        account["balance"] -= data["amount"]
+    elif type in ("buy", "sell"):
+        # Sells carry a negative quantity, so both add quantity and pay quantity * price
+        symbol, quantity = data["symbol"], data["quantity"]
+        holdings = account["holdings"]
+        holdings[symbol] = holdings.get(symbol, 0) + quantity
+        if holdings[symbol] == 0:
+            del holdings[symbol]
+        if type == "buy":
+            account["balance"] -= data["price"] * quantity
+        else:
+            account["balance"] += data["price"] * -quantity
+        account["transactions"].append(data)
+    elif type == "strategy":
+        account["strategy"] = data["strategy"]
+    elif type == "reset":
+        account.update(
+            balance=data["balance"],
+            strategy=data["strategy"],
+            holdings={},
+            transactions=[],
+            portfolio_value_time_series=[],
+        )
+    else:
+        raise ValueError(f"Unknown account event type '{type}'")
+    return account
+
+
+def _replay(name: str, snapshot: tuple[int, dict] | None) -> tuple[int, dict | None, int]:
+    seq, account = snapshot or (0, None)
+    applied = 0
+    for event in read_account_events(name, after_seq=seq):
+        account = apply_event(account, event["type"], event["data"])
+        seq = event["seq"]
+        applied += 1
+    return seq, account, applied
+
+
+def replay(name: str, from_scratch: bool = False) -> tuple[int, dict | None]:
+    """(seq, account) of `name` rebuilt from its latest snapshot and the events
+    after it, or from the first event with `from_scratch`."""
+    seq, account, _ = _replay(name, None if from_scratch else read_account_snapshot(name))
+    return seq, account
+
+
+def rebuild_accounts(
+    names: list[str] | None = None,
+    from_scratch: bool = False,
+    check: bool = False,
+    batch: int = 50,
+) -> dict:
+    """Rebuild the stored account of each of `names` (default: every account
+    with a ledger) from its events, writing projections and snapshots in
+    batches. With `check`, only compare and report accounts that differ."""
+    started = time.perf_counter()
+    names = [n.lower() for n in names] if names else read_account_event_names()
+    pending = []
+    stats = {"accounts": 0, "events": 0, "mismatched": []}
+    for name in names:
+        snapshot = None if from_scratch else read_account_snapshot(name)
+        seq, account, applied = _replay(name, snapshot)
+        if account is None:
+            continue
+        stats["accounts"] += 1
+        stats["events"] += applied
+        if check:
+            if read_account(name) != account:
+                stats["mismatched"].append(name)
+            continue
+        pending.append((name, seq, account))
+        if len(pending) >= batch:
+            write_account_projections(pending)
+            pending = []
+    if pending:
+        write_account_projections(pending)
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild accounts from their event ledgers")
+    parser.add_argument("--names", nargs="*", help="accounts to rebuild (default: all)")
+    parser.add_argument(
+        "--from-scratch", action="store_true", help="replay every event, ignoring snapshots"
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="only report accounts that differ from their ledger"
+    )
+    args = parser.parse_args()
+
+    init_db()
+    stats = rebuild_accounts(args.names, args.from_scratch, args.check)
+    action = "Checked" if args.check else "Rebuilt"
+    print(
+        f"{action} {stats['accounts']} accounts from {stats['events']} events "
+        f"in {stats['seconds']:.2f}s"
+    )
+    if stats["mismatched"]:
+        print(f"Differ from their ledger: {', '.join(stats['mismatched'])}")
+        sys.exit(1)
+
+
+__all__ = ["apply_event", "rebuild_accounts", "replay"]
+
+
+if __name__ == "__main__":
+    main()
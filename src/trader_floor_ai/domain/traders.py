@@ -0,0 +1,158 @@
+"""Trader registry: which personas trade, with which model and strategy."""
+
+import os
+import zlib
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+from trader_floor_ai.services.database import DB_READ_ONLY, read_traders, write_trader
+
+load_dotenv(override=True)
+
+USE_MANY_MODELS = os.getenv("USE_MANY_MODELS", "false").strip().lower() == "true"
+
+
+jm_strategy = """
+You are Jose Manuel, and you are named in homage to your role model, Warren Buffett.
+You are a value-oriented investor who prioritizes long-term wealth creation.
+You identify high-quality companies trading below their intrinsic value.
+You invest patiently and hold positions through market fluctuations,
+relying on meticulous fundamental analysis, steady cash flows, strong management teams,
+and competitive advantages. You rarely react to short-term market movements,
+trusting your deep research and value-driven strategy.
+"""
+
+jaime_strategy = """
+You are Jaime, and you are named in homage to your role model, George Soros.
+You are an aggressive macro trader who actively seeks significant market
+mispricings. You look for large-scale economic and
+geopolitical events that create investment opportunities. Your approach is contrarian,
+willing to bet boldly against prevailing market sentiment when your macroeconomic analysis
+suggests a significant imbalance. You leverage careful timing and decisive action to
+capitalize on rapid market shifts.
+"""
+
+garbi_strategy = """
+You are Garbi, and you are named in homage to your role model, Ray Dalio.
+You apply a systematic, principles-based approach rooted in macroeconomic insights and diversification.
+You invest broadly across asset classes, utilizing risk parity strategies to achieve balanced returns
+in varying market environments. You pay close attention to macroeconomic indicators, central bank policies,
+and economic cycles, adjusting your portfolio strategically to manage risk and preserve capital across diverse market conditions.
+"""
+
+carmen_strategy = """
+You are Carmen, and you are named in homage to your role model, Cathie Wood.
+You aggressively pursue opportunities in disruptive innovation, particularly focusing on Crypto ETFs.
+Your strategy is to identify and invest boldly in sectors poised to revolutionize the economy,
+accepting higher volatility for potentially exceptional returns. You closely monitor technological breakthroughs,
+regulatory changes, and market sentiment in crypto ETFs, ready to take bold positions
+and actively manage your portfolio to capitalize on rapid growth trends.
+You focus your trading on crypto ETFs.
+"""
+
+
+class TraderProfile(BaseModel):
+    name: str
+    lastname: str
+    model_name: str
+    short_model_name: str
+    strategy: str
+    enabled: bool = True
+    position: int = 0
+
+
+def default_traders() -> list[TraderProfile]:
+    """The original four personas, used to seed an empty registry."""
+    names = ["Jose Manuel", "Jaime", "Garbi", "Carmen"]
+    lastnames = ["Patience", "Bold", "Systematic", "Crypto"]
+    strategies = [jm_strategy, jaime_strategy, garbi_strategy, carmen_strategy]
+    if USE_MANY_MODELS:
+        model_names = [
+            "gpt-4.1-mini",
+            "deepseek-chat",
+            "gemini-2.5-flash-preview-04-17",
+            "grok-3-mini-beta",
+        ]
+        short_model_names = [
+            "GPT 4.1 Mini",
+            "DeepSeek V3",
+            "Gemini 2.5 Flash",
+            "Grok 3 Mini",
+        ]
+    else:
+        model_names = ["gpt-4o-mini"] * 4
+        short_model_names = ["GPT 4o mini"] * 4
+    return [
+        TraderProfile(
+            name=name,
+            lastname=lastname,
+            model_name=model_name,
+            short_model_name=short_model_name,
+            strategy=strategy,
+            position=position,
+        )
+        for position, (name, lastname, model_name, short_model_name, strategy) in enumerate(
+            zip(names, lastnames, model_names, short_model_names, strategies)
+        )
+    ]
+
+
+def save_trader(profile: TraderProfile) -> None:
+    write_trader(profile.model_dump())
+
+
+_checked_models = False
+
+
+def _warn_on_model_mismatch(registered: list[dict]) -> None:
+    """Warn once if USE_MANY_MODELS disagrees with the models the default
+    personas were seeded with; the flag only applies to an empty registry."""
+    global _checked_models
+    if _checked_models:
+        return
+    _checked_models = True
+    seeded = {t["name"]: t["model_name"] for t in registered}
+    stale = [
+        p.name for p in default_traders() if p.name in seeded and seeded[p.name] != p.model_name
+    ]
+    if stale:
+        print(
+            f"USE_MANY_MODELS={str(USE_MANY_MODELS).lower()} does not match the models "
+            f"registered for {', '.join(stale)}; the flag only seeds an empty registry, "
+            "so update those traders in the registry to switch models"
+        )
+
+
+def seed_default_traders() -> None:
+    """Populate the registry with the default personas if it is empty."""
+    # Read-only dashboard workers show whatever the writer has registered
+    if DB_READ_ONLY:
+        return
+    registered = read_traders(enabled_only=False)
+    if registered:
+        _warn_on_model_mismatch(registered)
+        return
+    for profile in default_traders():
+        save_trader(profile)
+
+
+def list_traders(enabled_only: bool = True) -> list[TraderProfile]:
+    seed_default_traders()
+    return [TraderProfile(**fields) for fields in read_traders(enabled_only)]
+
+
+def in_shard(name: str, shard_index: int, shard_count: int) -> bool:
+    """Stable assignment of a trader to one of `shard_count` scheduler processes."""
+    if shard_count <= 1:
+        return True
+    return zlib.crc32(name.lower().encode()) % shard_count == shard_index
+
+
+__all__ = [
+    "TraderProfile",
+    "default_traders",
+    "save_trader",
+    "seed_default_traders",
+    "list_traders",
+    "in_shard",
+]
@@ -0,0 +1,160 @@
+"""Instrumented OpenAI-compatible clients.
+
+Every chat completion or response request is timed and recorded in the
+`llm_calls` table with its model, token usage and the trader and run it
+belongs to. With `LLM_CACHE=true`, non-streamed responses are also stored by
+a hash of the request, so development reruns and backtests replay identical
+calls without paying for them again.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import SimpleNamespace
+from typing import Any
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+from openai.types.responses import Response
+
+from trader_floor_ai.services.database import (
+    read_llm_cache,
+    write_llm_cache,
+    write_llm_call,
+)
+from trader_floor_ai.utils.timing import record
+
+load_dotenv(override=True)
+
+LLM_CACHE = os.getenv("LLM_CACHE", "false").strip().lower() == "true"
+
+current_trader: ContextVar[str | None] = ContextVar("current_trader", default=None)
+current_run_id: ContextVar[str | None] = ContextVar("current_run_id", default=None)
+
+
+@contextmanager
+def llm_run_context(name: str, run_id: str | None = None):
+    """Attribute LLM calls made inside the block to a trader and run."""
+    trader_token = current_trader.set(name)
+    run_token = current_run_id.set(run_id or uuid.uuid4().hex)
+    try:
+        yield current_run_id.get()
+    finally:
+        current_trader.reset(trader_token)
+        current_run_id.reset(run_token)
+
+
+def request_key(kind: str, kwargs: dict[str, Any]) -> str:
+    """Content address of a request; headers do not change the response."""
+    body = {k: v for k, v in kwargs.items() if k != "extra_headers"}
+    payload = json.dumps([kind, body], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _usage(response: Any) -> tuple[int | None, int | None, int | None]:
+    """(prompt, completion, total) tokens for chat completions or responses."""
+    usage = getattr(response, "usage", None)
+
+    def first(*names):
+        for name in names:
+            value = getattr(usage, name, None)
+            if value is not None:
+                return value
+        return None
+
+    return (
+        first("prompt_tokens", "input_tokens"),
+        first("completion_tokens", "output_tokens"),
+        first("total_tokens"),
+    )
+
+
+class _InstrumentedCreate:
+    """Wraps an endpoint's `create` (chat.completions or responses)."""
+
+    def __init__(self, endpoint: Any, kind: str, response_type: type, cache: bool):
+        self._endpoint = endpoint
+        self._kind = kind
+        self._response_type = response_type
+        self._cache = cache
+
+    def __getattr__(self, name: str):
+        return getattr(self._endpoint, name)
+
+    async def create(self, **kwargs):
+        model = str(kwargs.get("model", ""))
+        cacheable = self._cache and not kwargs.get("stream")
+        key = request_key(self._kind, kwargs) if cacheable else None
+        start = time.perf_counter()
+        if key:
+            cached = await asyncio.to_thread(read_llm_cache, key)
+            if cached is not None:
+                response = self._response_type.model_validate_json(cached)
+                await self._record(model, start, response, cached=True)
+                return response
+        try:
+            response = await self._endpoint.create(**kwargs)
+        except Exception as e:
+            await self._record(model, start, None, error=str(e))
+            raise
+        # Streams are timed to the first byte; their usage is not known here
+        await self._record(model, start, None if kwargs.get("stream") else response)
+        if key:
+            await asyncio.to_thread(write_llm_cache, key, model, response.model_dump_json())
+        return response
+
+    async def _record(self, model, start, response, cached=False, error=None):
+        prompt, completion, total = _usage(response)
+        elapsed = time.perf_counter() - start
+        record(f"llm.{self._kind}", elapsed)
+        try:
+            # SQLite commits stay off the event loop the other traders share
+            await asyncio.to_thread(
+                write_llm_call,
+                current_trader.get(),
+                current_run_id.get(),
+                model,
+                elapsed * 1000,
+                prompt,
+                completion,
+                total,
+                cached=cached,
+                error=error,
+            )
+        except Exception as e:
+            print(f"Unable to record LLM call metrics: {e}")
+
+
+class InstrumentedAsyncOpenAI:
+    """Drop-in stand-in for `AsyncOpenAI` that records every model call."""
+
+    def __init__(self, client: AsyncOpenAI, cache: bool = LLM_CACHE):
+        self._client = client
+        self.chat = SimpleNamespace(
+            completions=_InstrumentedCreate(
+                client.chat.completions, "chat", ChatCompletion, cache
+            )
+        )
+        self.responses = _InstrumentedCreate(client.responses, "responses", Response, cache)
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+def instrument(client: AsyncOpenAI) -> AsyncOpenAI:
+    return InstrumentedAsyncOpenAI(client)  # type: ignore[return-value]
+
+
+__all__ = [
+    "LLM_CACHE",
+    "InstrumentedAsyncOpenAI",
+    "instrument",
+    "llm_run_context",
+    "request_key",
+]
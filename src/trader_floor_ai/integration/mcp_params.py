@@ -3,8 +3,18 @@ from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
-
-def researcher_mcp_server_params(name: str):
+# Minimal env to quiet npx so stdout stays JSON-only for the MCP client
+npm_quiet = {
+    "npm_config_loglevel": "silent",
+    "npm_config_audit": "false",
+    "npm_config_fund": "false",
+    "npm_config_update_notifier": "false",
+    "NO_UPDATE_NOTIFIER": "1",
+    "NO_COLOR": "1",
+}
+
+
+def memory_dir() -> str:
     # Use persistent data volume for memory DBs (Railway provides single volume)
     # Falls back to local "memory" dir for dev environments
     db_path = os.getenv("DB_PATH", "accounts.db")
@@ -13,27 +23,17 @@ def researcher_mcp_server_params(name: str):
     # Otherwise (local dev with just "accounts.db"), use current dir
     if "/" in db_path:
         data_dir = db_path.rsplit("/", 1)[0]  # Get /app/data from /app/data/accounts.db
-        memory_dir = os.path.join(data_dir, "memory")
+        directory = os.path.join(data_dir, "memory")
     else:
-        memory_dir = "memory"  # Local dev: memory/ in current directory
-
-    os.makedirs(memory_dir, exist_ok=True)
-    libsql_path = os.path.abspath(os.path.join(memory_dir, f"{name}.db"))
-    libsql_url = f"file:{libsql_path}"
-
-    # Minimal env to quiet npx so stdout stays JSON-only for the MCP client
-    npm_quiet = {
-        "npm_config_loglevel": "silent",
-        "npm_config_audit": "false",
-        "npm_config_fund": "false",
-        "npm_config_update_notifier": "false",
-        "NO_UPDATE_NOTIFIER": "1",
-        "NO_COLOR": "1",
-    }
+        directory = "memory"  # Local dev: memory/ in current directory
 
-    brave_env = {**npm_quiet, "BRAVE_API_KEY": os.getenv("BRAVE_API_KEY", "")}
-    memory_env = {**npm_quiet, "LIBSQL_URL": libsql_url}
+    os.makedirs(directory, exist_ok=True)
+    return directory
 
+
+def shared_researcher_mcp_server_params():
+    """Servers with no per-trader state; one instance can serve every trader."""
+    brave_env = {**npm_quiet, "BRAVE_API_KEY": os.getenv("BRAVE_API_KEY", "")}
     return [
         {"command": "mcp-server-fetch", "args": []},
         {
@@ -41,9 +41,19 @@ def researcher_mcp_server_params(name: str):
             "args": ["-y", "@modelcontextprotocol/server-brave-search"],
             "env": brave_env,
         },
-        {
-            "command": "npx",
-            "args": ["-y", "mcp-memory-libsql"],
-            "env": memory_env,
-        },
     ]
+
+
+def memory_mcp_server_params(name: str):
+    """Knowledge-graph memory server backed by the trader's own libsql DB."""
+    libsql_path = os.path.abspath(os.path.join(memory_dir(), f"{name}.db"))
+    memory_env = {**npm_quiet, "LIBSQL_URL": f"file:{libsql_path}"}
+    return {
+        "command": "npx",
+        "args": ["-y", "mcp-memory-libsql"],
+        "env": memory_env,
+    }
+
+
+def researcher_mcp_server_params(name: str):
+    return [*shared_researcher_mcp_server_params(), memory_mcp_server_params(name)]
@@ -0,0 +1,252 @@
+"""Long-lived researcher MCP servers shared across traders and runs.
+
+Spawning `mcp-server-fetch` and resolving `npx` packages dominates the start of
+every trader session. The pool starts each server once per scheduler process,
+keeps it healthy and leases it to traders. Fetch and Brave search hold no
+per-trader state and are shared; the libsql memory server is bound to one DB
+file at spawn time, so one warm instance per trader is kept (bounded, LRU) and
+selected when that trader leases.
+"""
+
+import asyncio
+import os
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Callable
+
+from agents.mcp import MCPServer, MCPServerStdio
+from dotenv import load_dotenv
+
+from trader_floor_ai.integration.mcp_params import (
+    memory_mcp_server_params,
+    shared_researcher_mcp_server_params,
+)
+from trader_floor_ai.integration.research_cache import with_research_cache
+
+load_dotenv(override=True)
+
+MCP_POOL_MAX_MEMORY_SERVERS = int(os.getenv("MCP_POOL_MAX_MEMORY_SERVERS", "16"))
+MCP_HEALTH_CHECK_SECONDS = float(os.getenv("MCP_HEALTH_CHECK_SECONDS", "60"))
+MCP_SESSION_TIMEOUT_SECONDS = 120
+
+
+class PooledMCPServer(MCPServer):
+    """Stable handle to a stdio MCP server that the pool can restart underneath.
+
+    The underlying server is entered and exited by a dedicated supervisor task,
+    since the stdio transport must be closed by the task that opened it. Agents
+    hold on to this handle, so restarts are invisible to them and `connect` and
+    `cleanup` are no-ops; the pool owns the lifecycle.
+    """
+
+    def __init__(self, params: dict, name: str):
+        super().__init__()
+        self.params = params
+        self._name = name
+        self._server: MCPServerStdio | None = None
+        self._task: asyncio.Task | None = None
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._error: BaseException | None = None
+        self._lock = asyncio.Lock()
+        self.restarts = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def is_running(self) -> bool:
+        return self._server is not None
+
+    async def _supervise(self):
+        try:
+            async with MCPServerStdio(
+                self.params,  # type: ignore[arg-type]
+                name=self._name,
+                cache_tools_list=True,
+                client_session_timeout_seconds=MCP_SESSION_TIMEOUT_SECONDS,
+            ) as server:
+                self._server = server
+                self._ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._server = None
+            self._ready.set()
+
+    async def start(self):
+        async with self._lock:
+            if self.is_running:
+                return
+            self._ready = asyncio.Event()
+            self._stop = asyncio.Event()
+            self._error = None
+            self._task = asyncio.create_task(self._supervise())
+            await self._ready.wait()
+            if self._error:
+                raise self._error
+
+    async def stop(self):
+        async with self._lock:
+            if self._task is None:
+                return
+            self._stop.set()
+            await self._task
+            self._task = None
+
+    async def restart(self):
+        await self.stop()
+        self.restarts += 1
+        await self.start()
+
+    async def healthy(self, timeout: float = 10) -> bool:
+        server = self._server
+        if server is None or server.session is None:
+            return False
+        try:
+            await asyncio.wait_for(server.session.send_ping(), timeout)
+            return True
+        except Exception:
+            return False
+
+    async def _running(self) -> MCPServerStdio:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        return self._server
+
+    async def connect(self):
+        await self._running()
+
+    async def cleanup(self):
+        pass
+
+    async def list_tools(self, run_context: Any = None, agent: Any = None):
+        return await (await self._running()).list_tools(run_context, agent)
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any] | None):
+        return await (await self._running()).call_tool(tool_name, arguments)
+
+    async def list_prompts(self):
+        return await (await self._running()).list_prompts()
+
+    async def get_prompt(self, name: str, arguments: dict[str, Any] | None = None):
+        return await (await self._running()).get_prompt(name, arguments)
+
+
+class MCPServerPool:
+    """Starts researcher MCP servers once per process and leases them to traders.
+
+    Use as `async with MCPServerPool() as pool:` and, per trader run,
+    `async with pool.lease(name) as servers:`.
+    """
+
+    def __init__(
+        self,
+        max_memory_servers: int = MCP_POOL_MAX_MEMORY_SERVERS,
+        health_check_seconds: float = MCP_HEALTH_CHECK_SECONDS,
+        shared_params: list[dict] | None = None,
+        memory_params: Callable[[str], dict] = memory_mcp_server_params,
+    ):
+        self.max_memory_servers = max_memory_servers
+        self.health_check_seconds = health_check_seconds
+        # Server params can be swapped out, e.g. for stub servers in benchmarks
+        self.memory_params = memory_params
+        self.shared = [
+            PooledMCPServer(params, name=f"shared: {(params['args'] or [params['command']])[-1]}")
+            for params in (
+                shared_params
+                if shared_params is not None
+                else shared_researcher_mcp_server_params()
+            )
+        ]
+        # Search and fetch results are shared across traders via the research cache
+        self._leased_shared = with_research_cache(self.shared)
+        self._memory: OrderedDict[str, PooledMCPServer] = OrderedDict()
+        self._leases: Counter[str] = Counter()
+        # Memory servers between creation and the end of their first start
+        self._starting: set[str] = set()
+        self._lock = asyncio.Lock()
+        self._health_task: asyncio.Task | None = None
+
+    async def start(self):
+        results = await asyncio.gather(
+            *[server.start() for server in self.shared], return_exceptions=True
+        )
+        for server, result in zip(self.shared, results):
+            # Not fatal: the server is started again on first use or health check
+            if isinstance(result, Exception):
+                print(f"Unable to start MCP server {server.name}: {result}")
+        self._health_task = asyncio.create_task(self._health_loop())
+
+    async def close(self):
+        if self._health_task:
+            self._health_task.cancel()
+            self._health_task = None
+        servers = [*self.shared, *self._memory.values()]
+        await asyncio.gather(*[server.stop() for server in servers], return_exceptions=True)
+        self._memory.clear()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _memory_server(self, name: str) -> PooledMCPServer:
+        """The memory server for `name`, started if needed and already leased:
+        the lease is taken under the lock so the server cannot be evicted while
+        it starts. The caller releases it by decrementing `_leases[name]`."""
+        async with self._lock:
+            self._leases[name] += 1
+            server = self._memory.get(name)
+            if server is not None:
+                self._memory.move_to_end(name)
+                return server
+            # Evict the least recently used idle memory servers to stay under the cap
+            for key in list(self._memory):
+                if len(self._memory) < self.max_memory_servers:
+                    break
+                if self._leases[key] == 0 and key not in self._starting:
+                    await self._memory.pop(key).stop()
+            server = PooledMCPServer(self.memory_params(name), name=f"memory: {name}")
+            self._memory[name] = server
+            self._starting.add(name)
+        try:
+            await server.start()
+        except BaseException:
+            self._leases[name] -= 1
+            raise
+        finally:
+            self._starting.discard(name)
+        return server
+
+    @asynccontextmanager
+    async def lease(self, name: str):
+        """Yield the researcher servers for `name`: shared fetch/search plus its memory."""
+        memory = await self._memory_server(name)
+        try:
+            yield [*self._leased_shared, memory]
+        finally:
+            self._leases[name] -= 1
+
+    async def check_health(self):
+        """Restart any server that stopped or no longer answers pings."""
+        for server in [*self.shared, *self._memory.values()]:
+            if not await server.healthy():
+                print(f"MCP server {server.name} is unhealthy; restarting")
+                try:
+                    await server.restart()
+                except Exception as e:
+                    print(f"Unable to restart MCP server {server.name}: {e}")
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_seconds)
+            await self.check_health()
+
+
+__all__ = ["MCPServerPool", "PooledMCPServer"]
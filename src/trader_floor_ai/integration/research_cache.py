@@ -0,0 +1,231 @@
+"""Shared cache of researcher web search and fetch results.
+
+Traders ask the Researcher for overlapping market news every cycle. Results of
+the Brave search and fetch tools are cached in SQLite next to `DB_PATH`, keyed
+by tool, normalized arguments and time bucket, so one trader's search serves
+the others within the same bucket.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any
+
+from agents.mcp import MCPServer
+from dotenv import load_dotenv
+from mcp.types import CallToolResult
+
+from trader_floor_ai.services.database import DB
+
+load_dotenv(override=True)
+
+RESEARCH_CACHE_ENABLED = (
+    os.getenv("RESEARCH_CACHE_ENABLED", "true").strip().lower() == "true"
+)
+RESEARCH_CACHE_PATH = os.getenv(
+    "RESEARCH_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(DB)), "research_cache.db"),
+)
+RESEARCH_CACHE_TTL_MINUTES = float(os.getenv("RESEARCH_CACHE_TTL_MINUTES", "120"))
+RESEARCH_CACHE_BUCKET_MINUTES = float(os.getenv("RESEARCH_CACHE_BUCKET_MINUTES", "60"))
+RESEARCH_CACHE_MAX_ENTRIES = int(os.getenv("RESEARCH_CACHE_MAX_ENTRIES", "5000"))
+RESEARCH_CACHE_MAX_MB = float(os.getenv("RESEARCH_CACHE_MAX_MB", "100"))
+
+# Tools whose results depend only on their arguments and the time of day
+CACHEABLE_TOOLS = frozenset({"fetch", "brave_web_search", "brave_local_search"})
+
+
+def normalize_arguments(arguments: dict[str, Any] | None) -> dict[str, Any]:
+    """Collapse whitespace in all strings and case in free-text queries."""
+    normalized = {}
+    for key, value in sorted((arguments or {}).items()):
+        if isinstance(value, str):
+            value = " ".join(value.split())
+            if key in ("query", "q"):
+                value = value.lower()
+        normalized[key] = value
+    return normalized
+
+
+class ResearchCache:
+    def __init__(
+        self,
+        path: str = RESEARCH_CACHE_PATH,
+        ttl_minutes: float = RESEARCH_CACHE_TTL_MINUTES,
+        bucket_minutes: float = RESEARCH_CACHE_BUCKET_MINUTES,
+        max_entries: int = RESEARCH_CACHE_MAX_ENTRIES,
+        max_mb: float = RESEARCH_CACHE_MAX_MB,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_minutes * 60
+        self.bucket_seconds = max(bucket_minutes, 1) * 60
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1_000_000)
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        # get() runs in worker threads, so counter updates are serialized
+        self._stats_lock = threading.Lock()
+        with sqlite3.connect(self.path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS research_cache (
+                    key TEXT PRIMARY KEY,
+                    tool TEXT,
+                    created_at REAL,
+                    expires_at REAL,
+                    latency REAL,
+                    size INTEGER,
+                    result TEXT
+                )
+            """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS research_cache_created ON research_cache (created_at)"
+            )
+            conn.commit()
+
+    def key(self, tool: str, arguments: dict[str, Any] | None, now: float | None = None) -> str:
+        bucket = int((now or time.time()) // self.bucket_seconds)
+        payload = json.dumps([tool, normalize_arguments(arguments), bucket], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> CallToolResult | None:
+        with sqlite3.connect(self.path) as conn:
+            row = conn.execute(
+                "SELECT result, latency FROM research_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        with self._stats_lock:
+            if not row:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.saved_seconds += row[1]
+        return CallToolResult.model_validate_json(row[0])
+
+    def put(self, key: str, tool: str, result: CallToolResult, latency: float) -> None:
+        data = result.model_dump_json()
+        now = time.time()
+        with sqlite3.connect(self.path) as conn:
+            conn.execute(
+                """
+                INSERT INTO research_cache (key, tool, created_at, expires_at, latency, size, result)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    created_at=excluded.created_at, expires_at=excluded.expires_at,
+                    latency=excluded.latency, size=excluded.size, result=excluded.result
+            """,
+                (key, tool, now, now + self.ttl_seconds, latency, len(data), data),
+            )
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM research_cache WHERE expires_at <= ?", (now,))
+        count, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM research_cache"
+        ).fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        # Drop oldest entries until both limits hold
+        excess_bytes = size - self.max_bytes
+        excess_rows = count - self.max_entries
+        doomed = []
+        for key, entry_size in conn.execute(
+            "SELECT key, size FROM research_cache ORDER BY created_at"
+        ):
+            if excess_rows <= 0 and excess_bytes <= 0:
+                break
+            doomed.append((key,))
+            excess_rows -= 1
+            excess_bytes -= entry_size
+        conn.executemany("DELETE FROM research_cache WHERE key = ?", doomed)
+
+    def clear(self) -> None:
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("DELETE FROM research_cache")
+            conn.commit()
+
+    def cycle_report(self) -> str:
+        """Summarize hits since the last report and start counting afresh."""
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            rate = self.hits / lookups if lookups else 0.0
+            report = (
+                f"Research cache: {self.hits}/{lookups} hits ({rate:.0%}), "
+                f"~{self.saved_seconds:.1f}s of tool latency saved"
+            )
+            self.hits = 0
+            self.misses = 0
+            self.saved_seconds = 0.0
+        return report
+
+
+@lru_cache(maxsize=1)
+def get_research_cache() -> ResearchCache:
+    return ResearchCache()
+
+
+class CachedMCPServer(MCPServer):
+    """Serves cacheable researcher tool calls from the research cache."""
+
+    def __init__(self, server: MCPServer, cache: ResearchCache | None = None):
+        super().__init__(use_structured_content=server.use_structured_content)
+        self.server = server
+        self.cache = cache or get_research_cache()
+
+    @property
+    def name(self) -> str:
+        return self.server.name
+
+    async def connect(self):
+        await self.server.connect()
+
+    async def cleanup(self):
+        await self.server.cleanup()
+
+    async def list_tools(self, run_context: Any = None, agent: Any = None):
+        return await self.server.list_tools(run_context, agent)
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any] | None):
+        if tool_name not in CACHEABLE_TOOLS:
+            return await self.server.call_tool(tool_name, arguments)
+        key = self.cache.key(tool_name, arguments)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return cached
+        start = time.perf_counter()
+        result = await self.server.call_tool(tool_name, arguments)
+        if not result.isError:
+            await asyncio.to_thread(
+                self.cache.put, key, tool_name, result, time.perf_counter() - start
+            )
+        return result
+
+    async def list_prompts(self):
+        return await self.server.list_prompts()
+
+    async def get_prompt(self, name: str, arguments: dict[str, Any] | None = None):
+        return await self.server.get_prompt(name, arguments)
+
+
+def with_research_cache(servers: list[MCPServer]) -> list[MCPServer]:
+    """Wrap researcher servers with the shared cache when it is enabled."""
+    if not RESEARCH_CACHE_ENABLED:
+        return list(servers)
+    return [CachedMCPServer(server) for server in servers]
+
+
+__all__ = [
+    "ResearchCache",
+    "CachedMCPServer",
+    "get_research_cache",
+    "with_research_cache",
+    "RESEARCH_CACHE_ENABLED",
+]
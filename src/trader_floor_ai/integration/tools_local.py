@@ -1,14 +1,18 @@
+import asyncio
 import json
-import os
+from functools import lru_cache
 from typing import List
 
 from agents import FunctionTool
 from dotenv import load_dotenv
 
+from trader_floor_ai.agents.checkpoint import already_executed
 from trader_floor_ai.domain.accounts import Account
+from trader_floor_ai.integration.llm_metrics import current_trader
 from trader_floor_ai.services.market import get_share_price
-
-import requests
+from trader_floor_ai.services.notifications import enqueue_push, push_enabled
+from trader_floor_ai.services.symbols import search_symbols
+from trader_floor_ai.utils.timing import timed
 
 
 load_dotenv(override=True)
@@ -44,12 +48,16 @@ def make_accounts_tools() -> List[FunctionTool]:
 
     async def _buy_shares(_ctx, args_json: str):
         args = json.loads(args_json)
+        if duplicate := already_executed("buy_shares", args):
+            return duplicate
         return Account.get(args["name"]).buy_shares(
             args["symbol"], int(args["quantity"]), args["rationale"]
         )
 
     async def _sell_shares(_ctx, args_json: str):
         args = json.loads(args_json)
+        if duplicate := already_executed("sell_shares", args):
+            return duplicate
         return Account.get(args["name"]).sell_shares(
             args["symbol"], int(args["quantity"]), args["rationale"]
         )
@@ -105,6 +113,12 @@ def make_market_tools() -> List[FunctionTool]:
         args = json.loads(args_json)
         return get_share_price(args["symbol"])
 
+    async def _search_symbol(_ctx, args_json: str):
+        args = json.loads(args_json)
+        limit = args.get("limit")
+        limit = 10 if limit is None else max(1, min(int(limit), 50))
+        return json.dumps(search_symbols(args["query"], limit))
+
     return [
         FunctionTool(
             name="get_share_price",
@@ -116,28 +130,32 @@ def make_market_tools() -> List[FunctionTool]:
                 "additionalProperties": False,
             },
             on_invoke_tool=_get_share_price,
-        )
+        ),
+        FunctionTool(
+            name="search_symbol",
+            description="Find tradable symbols matching a ticker or partial ticker, with asset type and last price.",
+            params_json_schema={
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string"},
+                    "limit": {"type": "integer"},
+                },
+                "required": ["query", "limit"],
+                "additionalProperties": False,
+            },
+            on_invoke_tool=_search_symbol,
+        ),
     ]
 
 
 def make_push_tools() -> List[FunctionTool]:
-    pushover_user = os.getenv("PUSHOVER_USER")
-    pushover_token = os.getenv("PUSHOVER_TOKEN")
-    pushover_url = "https://api.pushover.net/1/messages.json"
-
     async def _push(_ctx, args_json: str):
         args = json.loads(args_json)
-        payload = {
-            "user": pushover_user,
-            "token": pushover_token,
-            "message": args["message"],
-        }
-        try:
-            r = requests.post(pushover_url, data=payload, timeout=10)
-            r.raise_for_status()
-            return "Push notification sent"
-        except Exception as e:
-            return f"Failed to send push: {e}"
+        if not push_enabled():
+            return "Push notifications are not configured"
+        # Delivered by the process's PushSender; never wait on Pushover here
+        await asyncio.to_thread(enqueue_push, args["message"], current_trader.get())
+        return "Push notification queued"
 
     return [
         FunctionTool(
@@ -156,11 +174,21 @@ def make_push_tools() -> List[FunctionTool]:
 
 def make_local_tools() -> List[FunctionTool]:
     """Return all locally-implemented tools for Trader agent."""
-    return make_accounts_tools() + make_market_tools() + make_push_tools()
+    tools = make_accounts_tools() + make_market_tools() + make_push_tools()
+    for tool in tools:
+        tool.on_invoke_tool = timed(f"tool.{tool.name}")(tool.on_invoke_tool)
+    return tools
+
+
+@lru_cache(maxsize=1)
+def cached_local_tools() -> tuple[FunctionTool, ...]:
+    """Local tools built once per process; the handlers hold no per-run state."""
+    return tuple(make_local_tools())
 
 
 __all__ = [
     "make_local_tools",
+    "cached_local_tools",
     "make_accounts_tools",
     "make_market_tools",
     "make_push_tools",
@@ -0,0 +1,83 @@
+"""Wall-clock tick arithmetic for the scheduler.
+
+Ticks fall on multiples of the interval since the Unix epoch, so a cycle that
+runs long never pushes later cycles back. Market hours are the regular US
+equity session (09:30-16:00 America/New_York, Monday to Friday); exchange
+holidays are not modeled here and are caught by `is_market_open()` at tick time.
+"""
+
+import asyncio
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def floor_boundary(now: datetime, interval_minutes: float) -> datetime:
+    """The latest tick at or before `now`."""
+    step = max(interval_minutes, 1 / 60) * 60
+    return datetime.fromtimestamp(now.timestamp() - now.timestamp() % step, timezone.utc)
+
+
+def next_boundary(now: datetime, interval_minutes: float) -> datetime:
+    """The first tick strictly after `now`."""
+    return floor_boundary(now, interval_minutes) + timedelta(minutes=interval_minutes)
+
+
+def is_market_hours(now: datetime) -> bool:
+    local = now.astimezone(MARKET_TZ)
+    return local.weekday() < 5 and MARKET_OPEN <= local.time() < MARKET_CLOSE
+
+
+def next_market_open(now: datetime) -> datetime:
+    """`now` if the session is open, else the start of the next weekday session."""
+    if is_market_hours(now):
+        return now
+    local = now.astimezone(MARKET_TZ)
+    day = local.date()
+    if local.time() >= MARKET_OPEN:
+        day += timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return datetime.combine(day, MARKET_OPEN, MARKET_TZ).astimezone(timezone.utc)
+
+
+def missed_ticks(
+    last_tick: datetime, now: datetime, interval_minutes: float, limit: int = 100
+) -> tuple[int, list[datetime]]:
+    """Count ticks after `last_tick` up to `now`, and return the latest `limit`
+    of them oldest first."""
+    first = next_boundary(last_tick, interval_minutes)
+    if first > now:
+        return 0, []
+    step = timedelta(minutes=interval_minutes)
+    count = int((now - first) / step) + 1
+    kept = min(count, limit)
+    return count, [first + step * i for i in range(count - kept, count)]
+
+
+async def sleep_until(when: datetime, max_chunk_seconds: float = 300) -> None:
+    """Sleep until a wall-clock time, re-checking the clock so suspends and clock
+    adjustments do not make the wake-up late."""
+    while True:
+        remaining = (when - utcnow()).total_seconds()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(remaining, max_chunk_seconds))
+
+
+__all__ = [
+    "utcnow",
+    "floor_boundary",
+    "next_boundary",
+    "is_market_hours",
+    "next_market_open",
+    "missed_ticks",
+    "sleep_until",
+]
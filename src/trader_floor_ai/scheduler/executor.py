@@ -0,0 +1,154 @@
+"""Bounded-concurrency execution of trader runs with per-run deadlines."""
+
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+from dotenv import load_dotenv
+
+from trader_floor_ai.agents.trader import Trader
+from trader_floor_ai.integration.mcp_pool import MCPServerPool
+from trader_floor_ai.integration.research_cache import (
+    RESEARCH_CACHE_ENABLED,
+    get_research_cache,
+)
+
+load_dotenv(override=True)
+
+# How many traders run at once, and how long one run may take before it is cancelled
+TRADER_CONCURRENCY = int(os.getenv("TRADER_CONCURRENCY", "4"))
+TRADER_DEADLINE_SECONDS = float(os.getenv("TRADER_DEADLINE_SECONDS", "900"))
+# Spread trader starts over this window so providers do not see a burst each tick
+TRADER_START_JITTER_SECONDS = float(os.getenv("TRADER_START_JITTER_SECONDS", "0"))
+
+
+@dataclass
+class TraderRunResult:
+    name: str
+    success: bool
+    duration: float
+    turns: int = 0
+    timed_out: bool = False
+    error: str | None = None
+    # Seconds until the first tool call; only measured for streamed runs
+    first_action: float | None = None
+
+
+class TraderExecutor:
+    """Runs traders through a fixed number of workers.
+
+    Each run gets a wall-clock deadline and is cancelled when it expires, so
+    one stuck agent cannot stall the cycle. Without an explicit priority,
+    traders whose previous run took longest start first, which keeps the
+    cycle's total duration close to the longest single run.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = TRADER_CONCURRENCY,
+        deadline_seconds: float | None = TRADER_DEADLINE_SECONDS,
+        mcp_pool: MCPServerPool | None = None,
+        start_jitter_seconds: float = TRADER_START_JITTER_SECONDS,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.deadline_seconds = deadline_seconds or None
+        self.mcp_pool = mcp_pool
+        self.start_jitter_seconds = start_jitter_seconds
+        self._last_durations: dict[str, float] = {}
+        self._workers: list[asyncio.Task] = []
+
+    def _default_priority(self, trader: Trader) -> float:
+        # Unknown durations sort first, then longest previous run first
+        return -self._last_durations.get(trader.name, float("inf"))
+
+    async def run_one(self, trader: Trader) -> TraderRunResult:
+        start = time.perf_counter()
+        outcome = TraderRunResult(name=trader.name, success=False, duration=0.0)
+        try:
+            result = await asyncio.wait_for(
+                trader.run_with_trace(self.mcp_pool), timeout=self.deadline_seconds
+            )
+            outcome.success = True
+            outcome.turns = len(getattr(result, "raw_responses", []) or [])
+        except asyncio.TimeoutError:
+            outcome.timed_out = True
+            outcome.error = f"deadline of {self.deadline_seconds:g}s exceeded"
+        except Exception as e:
+            outcome.error = str(e)
+        outcome.first_action = trader.time_to_first_action
+        outcome.duration = time.perf_counter() - start
+        self._last_durations[trader.name] = outcome.duration
+        # Alternate between trading and rebalancing, as Trader.run does
+        trader.do_trade = not trader.do_trade
+        status = "ok" if outcome.success else f"failed: {outcome.error}"
+        print(
+            f"[{trader.name}] {status} in {outcome.duration:.1f}s ({outcome.turns} turns)"
+        )
+        return outcome
+
+    async def run(
+        self,
+        traders: Iterable[Trader],
+        priority: Callable[[Trader], float] | None = None,
+    ) -> list[TraderRunResult]:
+        """Run every trader once; results are returned in start order."""
+        ordered = sorted(traders, key=priority or self._default_priority)
+        loop = asyncio.get_running_loop()
+        cycle_start = loop.time()
+        # Evenly staggered start offsets with a little random jitter, in start order
+        slot = self.start_jitter_seconds / max(len(ordered), 1)
+        queue: asyncio.Queue[tuple[float, Trader]] = asyncio.Queue()
+        for i, trader in enumerate(ordered):
+            offset = i * slot + random.uniform(0, slot) if slot else 0.0
+            queue.put_nowait((cycle_start + offset, trader))
+        results: dict[str, TraderRunResult] = {}
+
+        async def worker():
+            while not queue.empty():
+                start_at, trader = queue.get_nowait()
+                delay = start_at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                results[trader.name] = await self.run_one(trader)
+
+        start = time.perf_counter()
+        self._workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.concurrency, len(ordered)))
+        ]
+        try:
+            await asyncio.gather(*self._workers)
+        finally:
+            self._workers = []
+        succeeded = sum(result.success for result in results.values())
+        print(
+            f"Cycle finished: {succeeded}/{len(ordered)} traders succeeded in "
+            f"{time.perf_counter() - start:.1f}s (concurrency {self.concurrency})"
+        )
+        first_actions = sorted(
+            r.first_action for r in results.values() if r.first_action is not None
+        )
+        if first_actions:
+            print(
+                f"Time to first action: median {first_actions[len(first_actions) // 2]:.1f}s, "
+                f"max {first_actions[-1]:.1f}s"
+            )
+        if RESEARCH_CACHE_ENABLED:
+            print(get_research_cache().cycle_report())
+        return [results[trader.name] for trader in ordered if trader.name in results]
+
+    def cancel(self):
+        """Cancel all in-flight runs of the current cycle."""
+        for task in self._workers:
+            task.cancel()
+
+
+__all__ = [
+    "TRADER_CONCURRENCY",
+    "TRADER_DEADLINE_SECONDS",
+    "TRADER_START_JITTER_SECONDS",
+    "TraderExecutor",
+    "TraderRunResult",
+]
@@ -0,0 +1,84 @@
+"""Mark-to-market stage: value every account from one batched price snapshot."""
+
+import asyncio
+import os
+from datetime import datetime
+from dotenv import load_dotenv
+
+from trader_floor_ai.domain.accounts import Account
+from trader_floor_ai.scheduler.clock import next_boundary, sleep_until, utcnow
+from trader_floor_ai.services.database import (
+    read_all_accounts,
+    write_marks,
+    write_valuations,
+)
+from trader_floor_ai.services.market import get_share_prices
+
+load_dotenv(override=True)
+
+MARK_EVERY_N_MINUTES = int(os.getenv("MARK_EVERY_N_MINUTES", "60"))
+
+
+def mark_bucket(now: datetime | None = None, minutes: int = MARK_EVERY_N_MINUTES) -> str:
+    """Start of the mark interval containing `now`, so each interval has one point."""
+    now = now or datetime.now()
+    step = max(minutes, 1) * 60
+    start = now.timestamp() - now.timestamp() % step
+    return datetime.fromtimestamp(start).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def mark_to_market(now: datetime | None = None) -> int:
+    """Write one value point per account for the current interval and refresh
+    each account's valuation snapshot.
+
+    All holdings across all accounts are priced in a single batched lookup and
+    the marks are written in a single transaction. Returns the number of marks.
+    """
+    accounts = [Account(**fields) for fields in read_all_accounts()]
+    if not accounts:
+        return 0
+    prices = get_share_prices(
+        symbol for account in accounts for symbol in account.holdings
+    )
+    bucket = mark_bucket(now)
+    updated_at = (now or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    marks = []
+    valuations = []
+    for account in accounts:
+        held = {symbol: prices.get(symbol) or 0.0 for symbol in account.holdings}
+        # A symbol the batched lookup could not price keeps its last known price
+        # rather than being valued at $0
+        missing = [symbol for symbol, price in held.items() if price <= 0]
+        if missing:
+            fallback = account.marked_prices()
+            held.update({symbol: fallback[symbol] for symbol in missing})
+            print(
+                f"[{account.name}] no price for {', '.join(sorted(missing))}; "
+                "using the last marked or traded price"
+            )
+        value, pnl, positions = account.valuation(held)
+        marks.append((account.name, bucket, value, pnl, held))
+        valuations.append((account.name, updated_at, value, pnl, positions))
+    write_marks(marks)
+    # The dashboard reads these snapshots instead of pricing holdings itself
+    write_valuations(valuations)
+    return len(marks)
+
+
+async def run_mark_to_market_every_n_minutes():
+    """Mark now, then on every MARK_EVERY_N_MINUTES wall-clock boundary."""
+    while True:
+        try:
+            count = await asyncio.to_thread(mark_to_market)
+            print(f"Marked {count} accounts to market")
+        except Exception as e:
+            print(f"Mark-to-market failed: {e}")
+        await sleep_until(next_boundary(utcnow(), MARK_EVERY_N_MINUTES))
+
+
+__all__ = [
+    "MARK_EVERY_N_MINUTES",
+    "mark_bucket",
+    "mark_to_market",
+    "run_mark_to_market_every_n_minutes",
+]
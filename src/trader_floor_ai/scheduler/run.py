@@ -1,10 +1,30 @@
-from typing import List
+from contextlib import AsyncExitStack
+from datetime import datetime
+from typing import TYPE_CHECKING, List
 import asyncio
 import os
 from dotenv import load_dotenv
 
-from trader_floor_ai.agents.trader import Trader  # type: ignore
+from trader_floor_ai.domain.traders import list_traders, in_shard
 from trader_floor_ai.services.market import is_market_open  # type: ignore
+from trader_floor_ai.scheduler.clock import (
+    is_market_hours,
+    missed_ticks,
+    next_boundary,
+    next_market_open,
+    sleep_until,
+    utcnow,
+)
+from trader_floor_ai.scheduler.mark import run_mark_to_market_every_n_minutes
+from trader_floor_ai.scheduler.snapshot import (
+    DB_SNAPSHOT_PATH,
+    run_snapshots_every_n_seconds,
+)
+from trader_floor_ai.services.database import init_db, read_state, write_state
+from trader_floor_ai.worker import TraderRef, enqueue_trader_runs
+
+if TYPE_CHECKING:
+    from trader_floor_ai.agents.trader import Trader
 
 load_dotenv(override=True)
 
@@ -12,54 +32,150 @@ RUN_EVERY_N_MINUTES = int(os.getenv("RUN_EVERY_N_MINUTES", "1440"))  # 24 hours
 RUN_EVEN_WHEN_MARKET_IS_CLOSED = (
     os.getenv("RUN_EVEN_WHEN_MARKET_IS_CLOSED", "false").strip().lower() == "true"
 )
-USE_MANY_MODELS = os.getenv("USE_MANY_MODELS", "false").strip().lower() == "true"
 MAX_ITERATIONS = int(os.getenv("MAX_ITERATIONS", "7"))  # Run for 7 days
+# Run only a slice of the registry in this process: shard SHARD_INDEX of SHARD_COUNT
+SHARD_INDEX = int(os.getenv("SHARD_INDEX", "0"))
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "1"))
+# "inline" runs traders in this process; "queue" enqueues jobs for
+# `python -m trader_floor_ai.worker` processes to execute
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "inline").strip().lower()
+# What to do about ticks missed while the scheduler was down: "coalesce" runs once
+# straight away, "catchup" replays up to MAX_CATCHUP_TICKS of them, "skip" waits
+MISSED_TICK_POLICY = os.getenv("MISSED_TICK_POLICY", "coalesce").strip().lower()
+MAX_CATCHUP_TICKS = int(os.getenv("MAX_CATCHUP_TICKS", "3"))
 
-names = ["Jose Manuel", "Jaime", "Garbi", "Carmen"]
-lastnames = ["Patience", "Bold", "Systematic", "Crypto"]
 
-if USE_MANY_MODELS:
-    model_names = [
-        "gpt-4.1-mini",
-        "deepseek-chat",
-        "gemini-2.5-flash-preview-04-17",
-        "grok-3-mini-beta",
-    ]
-    short_model_names = [
-        "GPT 4.1 Mini",
-        "DeepSeek V3",
-        "Gemini 2.5 Flash",
-        "Grok 3 Mini",
+def create_traders(
+    shard_index: int = SHARD_INDEX, shard_count: int = SHARD_COUNT
+) -> List["Trader"]:
+    # The agent stack (SDK, MCP, model clients) loads only when traders run here
+    from trader_floor_ai.agents.trader import Trader
+
+    return [
+        Trader(profile.name, profile.lastname, profile.model_name)
+        for profile in list_traders()
+        if in_shard(profile.name, shard_index, shard_count)
     ]
-else:
-    model_names = ["gpt-4o-mini"] * 4
-    short_model_names = ["GPT 4o mini"] * 4
 
 
-def create_traders() -> List[Trader]:
-    traders = []
-    for name, lastname, model_name in zip(names, lastnames, model_names):
-        traders.append(Trader(name, lastname, model_name))
-    return traders
+def _state_key() -> str:
+    return f"last_tick:{SHARD_INDEX}"
+
+
+def _startup_ticks(now: datetime) -> list[datetime]:
+    """Ticks to run immediately on startup, per MISSED_TICK_POLICY."""
+    saved = read_state(_state_key())
+    if saved is None:
+        # First start: run straight away, as before
+        return [now]
+    missed, ticks = missed_ticks(
+        datetime.fromisoformat(saved), now, RUN_EVERY_N_MINUTES, limit=MAX_CATCHUP_TICKS
+    )
+    if not missed or MISSED_TICK_POLICY == "skip":
+        if missed:
+            print(f"Skipping {missed} ticks missed while stopped")
+        return []
+    if MISSED_TICK_POLICY == "catchup":
+        if missed > len(ticks):
+            print(f"Dropping {missed - len(ticks)} missed ticks beyond MAX_CATCHUP_TICKS")
+        return ticks
+    print(f"Coalescing {missed} missed ticks into one run")
+    return [ticks[-1]]
+
+
+def _next_tick(now: datetime) -> datetime:
+    """The next wall-clock boundary, pushed to the next session open when closed."""
+    tick = next_boundary(now, RUN_EVERY_N_MINUTES)
+    if RUN_EVEN_WHEN_MARKET_IS_CLOSED or is_market_hours(tick):
+        return tick
+    return next_market_open(tick)
+
+
+def trader_refs(
+    shard_index: int = SHARD_INDEX, shard_count: int = SHARD_COUNT
+) -> List[TraderRef]:
+    """This shard's traders as queue references, for SCHEDULER_MODE=queue."""
+    return [
+        TraderRef(profile.name)
+        for profile in list_traders()
+        if in_shard(profile.name, shard_index, shard_count)
+    ]
 
 
 async def run_every_n_minutes():
-    traders = create_traders()
+    init_db()
+    traders = trader_refs() if SCHEDULER_MODE == "queue" else create_traders()
+    # Value points are written on their own interval, independent of trading runs;
+    # marks cover every account, so only the first shard runs the marker
+    marker = (
+        asyncio.create_task(run_mark_to_market_every_n_minutes())
+        if SHARD_INDEX == 0
+        else None
+    )
+    # A replica for read-only dashboard workers, when one is configured
+    snapshots = (
+        asyncio.create_task(run_snapshots_every_n_seconds())
+        if DB_SNAPSHOT_PATH and SHARD_INDEX == 0
+        else None
+    )
     iterations_completed = 0
-    while iterations_completed < MAX_ITERATIONS:
-        if RUN_EVEN_WHEN_MARKET_IS_CLOSED or is_market_open():
-            await asyncio.gather(*[trader.run() for trader in traders])
-            iterations_completed += 1
-        else:
-            print("Market is closed, skipping run")
-        if iterations_completed < MAX_ITERATIONS:
-            await asyncio.sleep(RUN_EVERY_N_MINUTES * 60)
+    try:
+        async with AsyncExitStack() as stack:
+            executor = None
+            if SCHEDULER_MODE != "queue":
+                from trader_floor_ai.integration.mcp_pool import MCPServerPool
+                from trader_floor_ai.scheduler.executor import TraderExecutor
+
+                from trader_floor_ai.services.notifications import PushSender, push_enabled
+
+                # Researcher MCP servers start once and are leased to traders every cycle
+                mcp_pool = await stack.enter_async_context(MCPServerPool())
+                executor = TraderExecutor(mcp_pool=mcp_pool)
+                # Pushes queued by the traders' push tool are delivered in the background
+                if push_enabled():
+                    await stack.enter_async_context(PushSender())
+
+            pending = _startup_ticks(utcnow())
+            while iterations_completed < MAX_ITERATIONS:
+                if pending:
+                    tick = pending.pop(0)
+                else:
+                    tick = _next_tick(utcnow())
+                    await sleep_until(tick)
+                started = utcnow()
+                print(
+                    f"Cycle for tick {tick.isoformat(timespec='seconds')} started "
+                    f"{(started - tick).total_seconds():.1f}s after schedule"
+                )
+                if RUN_EVEN_WHEN_MARKET_IS_CLOSED or is_market_open():
+                    if executor:
+                        await executor.run(traders)
+                    else:
+                        print(f"Queued {enqueue_trader_runs(traders)} trader runs")
+                    iterations_completed += 1
+                else:
+                    print("Market is closed, skipping run")
+                write_state(_state_key(), tick.isoformat())
+
+                # A cycle that overran its interval skips the ticks it covered
+                # rather than pushing every later cycle back
+                finished = utcnow()
+                overrun, _ = missed_ticks(tick, finished, RUN_EVERY_N_MINUTES, limit=0)
+                if overrun and not pending:
+                    print(
+                        f"Cycle overran by {overrun} tick(s) "
+                        f"({(finished - tick).total_seconds():.0f}s); skipping to the next"
+                    )
+    finally:
+        for task in (marker, snapshots):
+            if task:
+                task.cancel()
 
 
 __all__ = [
-    "names",
-    "lastnames",
-    "short_model_names",
+    "SCHEDULER_MODE",
+    "MISSED_TICK_POLICY",
     "run_every_n_minutes",
     "create_traders",
+    "trader_refs",
 ]
@@ -0,0 +1,39 @@
+"""Replica snapshots of the database for read-only dashboard workers."""
+
+import asyncio
+import os
+from dotenv import load_dotenv
+
+from trader_floor_ai.services.database import snapshot_db
+
+load_dotenv(override=True)
+
+# Dashboard workers started with DB_READ_PATH set to this file read the copy
+DB_SNAPSHOT_PATH = os.getenv("DB_SNAPSHOT_PATH", "")
+DB_SNAPSHOT_EVERY_SECONDS = float(os.getenv("DB_SNAPSHOT_EVERY_SECONDS", "30"))
+
+
+def take_snapshot() -> bool:
+    """Refresh the replica if DB_SNAPSHOT_PATH is set; True when one was written."""
+    if not DB_SNAPSHOT_PATH:
+        return False
+    try:
+        snapshot_db(DB_SNAPSHOT_PATH)
+        return True
+    except Exception as e:
+        print(f"Database snapshot failed: {e}")
+        return False
+
+
+async def run_snapshots_every_n_seconds():
+    while True:
+        await asyncio.to_thread(take_snapshot)
+        await asyncio.sleep(DB_SNAPSHOT_EVERY_SECONDS)
+
+
+__all__ = [
+    "DB_SNAPSHOT_EVERY_SECONDS",
+    "DB_SNAPSHOT_PATH",
+    "run_snapshots_every_n_seconds",
+    "take_snapshot",
+]
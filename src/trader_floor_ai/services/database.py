@@ -8,59 +8,544 @@ import sqlite3
 import json
 import os
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 
+from trader_floor_ai.utils.timing import timed
+
 load_dotenv(override=True)
 
 # Use persistent path in Railway via volume mount, fallback to local for dev
 DB = os.getenv("DB_PATH", "accounts.db")
+# Dashboard workers open the database read-only, optionally from a replica
+# snapshot file (DB_READ_PATH) so viewer traffic never touches the writer's file
+DB_READ_ONLY = os.getenv("DB_READ_ONLY", "false").strip().lower() == "true"
+DB_READ_PATH = os.getenv("DB_READ_PATH") or DB
+# Write-ahead logging lets readers run while the scheduler and workers write
+DB_WAL = os.getenv("DB_WAL", "true").strip().lower() == "true"
+# Every account save appends an event; every Nth event also snapshots the account
+ACCOUNT_SNAPSHOT_EVERY = int(os.getenv("ACCOUNT_SNAPSHOT_EVERY", "100"))
+ACCOUNT_EVENTS_BATCH = int(os.getenv("ACCOUNT_EVENTS_BATCH", "500"))
 
 
-with sqlite3.connect(DB) as conn:
-    cursor = conn.cursor()
-    cursor.execute(
-        "CREATE TABLE IF NOT EXISTS accounts (name TEXT PRIMARY KEY, account TEXT)"
-    )
-    cursor.execute(
+def _connect() -> sqlite3.Connection:
+    if DB_READ_ONLY:
+        return sqlite3.connect(f"{Path(DB_READ_PATH).absolute().as_uri()}?mode=ro", uri=True)
+    return sqlite3.connect(DB)
+
+
+def init_db() -> None:
+    """Create any missing tables. Entry points call this once at startup;
+    importing this module has no side effects on the database."""
+    if DB_READ_ONLY:
+        # Read-only workers rely on the writer having created the schema
+        return
+    with _connect() as conn:
+        cursor = conn.cursor()
+        if DB_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        # Workers, the scheduler and the dashboard may start together; hold the
+        # write lock so migrations and backfills run exactly once
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS accounts (
+                name TEXT PRIMARY KEY,
+                account TEXT,
+                version INTEGER DEFAULT 0,
+                seq INTEGER DEFAULT 0
+            )
+        """
+        )
+        # Databases created before accounts were versioned or event-sourced
+        cursor.execute("PRAGMA table_info(accounts)")
+        columns = {row[1] for row in cursor.fetchall()}
+        for column in ("version", "seq"):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE accounts ADD COLUMN {column} INTEGER DEFAULT 0")
+        # Append-only ledger of account mutations; `accounts` is its projection
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS account_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                datetime TEXT,
+                data TEXT
+            )
+        """
+        )
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS account_events_seq ON account_events (name, seq)"
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS account_events_immutable
+            BEFORE UPDATE ON account_events
+            BEGIN
+                SELECT RAISE(ABORT, 'account events are immutable');
+            END
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS account_snapshots (
+                name TEXT PRIMARY KEY,
+                seq INTEGER,
+                datetime TEXT,
+                account TEXT
+            )
+        """
+        )
+        # Accounts saved before the ledger existed start it with their full state
+        cursor.execute(
+            """
+            INSERT INTO account_events (name, seq, type, datetime, data)
+            SELECT name, 1, 'state', datetime('now'), account FROM accounts
+            WHERE NOT EXISTS (SELECT 1 FROM account_events e WHERE e.name = accounts.name)
+        """
+        )
+        cursor.execute("UPDATE accounts SET seq = 1 WHERE seq = 0")
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                datetime DATETIME,
+                type TEXT,
+                message TEXT
+            )
+        """
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS logs_name ON logs (name, id)")
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS market (date TEXT PRIMARY KEY, data TEXT)"
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS marks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                datetime TEXT,
+                value REAL,
+                pnl REAL,
+                prices TEXT,
+                UNIQUE(name, datetime)
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS valuations (
+                name TEXT PRIMARY KEY,
+                updated_at TEXT,
+                value REAL,
+                pnl REAL,
+                positions TEXT
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS traders (
+                name TEXT PRIMARY KEY,
+                lastname TEXT,
+                model_name TEXT,
+                short_model_name TEXT,
+                strategy TEXT,
+                enabled INTEGER DEFAULT 1,
+                position INTEGER DEFAULT 0
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_calls (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                datetime DATETIME,
+                name TEXT,
+                run_id TEXT,
+                model TEXT,
+                latency_ms REAL,
+                prompt_tokens INTEGER,
+                completion_tokens INTEGER,
+                total_tokens INTEGER,
+                cached INTEGER,
+                error TEXT
+            )
+        """
+        )
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, model TEXT, response TEXT)"
+        )
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS scheduler_state (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS run_spans (
+                run_id TEXT,
+                name TEXT,
+                datetime DATETIME,
+                span TEXT,
+                count INTEGER,
+                total_ms REAL,
+                max_ms REAL,
+                histogram TEXT,
+                PRIMARY KEY (run_id, span)
+            )
+        """
+        )
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS span_totals (span TEXT PRIMARY KEY, histogram TEXT)"
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS run_checkpoints (
+                name TEXT PRIMARY KEY,
+                do_trade INTEGER,
+                items TEXT,
+                orders TEXT,
+                resumes INTEGER DEFAULT 0,
+                created_at REAL,
+                updated_at REAL
+            )
+        """
+        )
+        # Conversation items of a checkpoint, appended as the run progresses
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS run_checkpoint_items (
+                name TEXT,
+                position INTEGER,
+                item TEXT,
+                PRIMARY KEY (name, position)
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT,
+                payload TEXT,
+                dedupe_key TEXT,
+                status TEXT,
+                priority INTEGER DEFAULT 0,
+                attempts INTEGER DEFAULT 0,
+                max_attempts INTEGER DEFAULT 3,
+                available_at REAL,
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                created_at REAL,
+                updated_at REAL,
+                result TEXT,
+                error TEXT
+            )
+        """
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority, available_at)"
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                timestamp TEXT,
+                symbol TEXT,
+                quantity INTEGER,
+                price REAL,
+                rationale TEXT
+            )
+        """
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS transactions_name ON transactions (name, id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS transactions_symbol ON transactions (name, symbol, id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS transactions_time ON transactions (name, timestamp)"
+        )
+        # Accounts created before the table existed keep their history in JSON
+        # only. One statement, so processes starting together cannot both backfill
+        cursor.execute(
+            """
+            INSERT INTO transactions (name, timestamp, symbol, quantity, price, rationale)
+            SELECT accounts.name,
+                   json_extract(t.value, '$.timestamp'),
+                   json_extract(t.value, '$.symbol'),
+                   json_extract(t.value, '$.quantity'),
+                   json_extract(t.value, '$.price'),
+                   json_extract(t.value, '$.rationale')
+            FROM accounts, json_each(accounts.account, '$.transactions') AS t
+            WHERE NOT EXISTS (SELECT 1 FROM transactions)
+            ORDER BY accounts.name, t.key
         """
-        CREATE TABLE IF NOT EXISTS logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT,
-            datetime DATETIME,
-            type TEXT,
-            message TEXT
         )
+        conn.commit()
+
+
+@timed("db.write_account")
+def write_account(
+    name,
+    account_dict,
+    valuation: tuple | None = None,
+    transaction: dict | None = None,
+    event: tuple[str, dict] | None = None,
+    reset: bool = False,
+) -> int:
+    """Save an account and append the (type, data) `event` that produced it to
+    the account's ledger; without one, the whole account is recorded as a
+    'state' event. In the same transaction, an (updated_at, value, pnl,
+    positions) `valuation` replaces the account's valuation snapshot and a new
+    `transaction` is appended to the transactions table. `reset` first drops
+    the account's transactions and value history (marks).
+
+    Returns the event's sequence number within the account.
     """
+    name = name.lower()
+    json_data = json.dumps(account_dict)
+    event_type, event_data = event or ("state", None)
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT COALESCE(MAX(seq), 0) + 1 FROM account_events WHERE name = ?", (name,)
+        )
+        seq = cursor.fetchone()[0]
+        if reset:
+            cursor.execute("DELETE FROM transactions WHERE name = ?", (name,))
+            cursor.execute("DELETE FROM marks WHERE name = ?", (name,))
+        # A concurrent writer taking the same seq fails on the unique index
+        cursor.execute(
+            """
+            INSERT INTO account_events (name, seq, type, datetime, data)
+            VALUES (?, ?, ?, datetime('now'), ?)
+        """,
+            (
+                name,
+                seq,
+                event_type,
+                json_data if event_data is None else json.dumps(event_data),
+            ),
+        )
+        cursor.execute(
+            """
+            INSERT INTO accounts (name, account, seq)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                account=excluded.account, seq=excluded.seq, version=accounts.version + 1
+        """,
+            (name, json_data, seq),
+        )
+        if seq % ACCOUNT_SNAPSHOT_EVERY == 0:
+            _upsert_account_snapshots(cursor, [(name, seq, json_data)])
+        if valuation is not None:
+            _upsert_valuations(cursor, [(name, *valuation)])
+        if transaction is not None:
+            cursor.execute(
+                """
+                INSERT INTO transactions (name, timestamp, symbol, quantity, price, rationale)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    name.lower(),
+                    transaction["timestamp"],
+                    transaction["symbol"],
+                    transaction["quantity"],
+                    transaction["price"],
+                    transaction["rationale"],
+                ),
+            )
+        conn.commit()
+    return seq
+
+
+def _upsert_account_snapshots(cursor, snapshots) -> None:
+    cursor.executemany(
+        """
+        INSERT INTO account_snapshots (name, seq, datetime, account)
+        VALUES (?, ?, datetime('now'), ?)
+        ON CONFLICT(name) DO UPDATE SET
+            seq=excluded.seq, datetime=excluded.datetime, account=excluded.account
+    """,
+        snapshots,
     )
-    cursor.execute(
-        "CREATE TABLE IF NOT EXISTS market (date TEXT PRIMARY KEY, data TEXT)"
-    )
-    conn.commit()
 
 
-def write_account(name, account_dict):
-    json_data = json.dumps(account_dict)
-    with sqlite3.connect(DB) as conn:
+def read_account_events(name: str, after_seq: int = 0):
+    """Yield the account's events after `after_seq` in order, as dicts with
+    seq, type, datetime and data, fetching ACCOUNT_EVENTS_BATCH rows at a time."""
+    conn = _connect()
+    try:
+        cursor = conn.execute(
+            """
+            SELECT seq, type, datetime, data FROM account_events
+            WHERE name = ? AND seq > ? ORDER BY seq
+        """,
+            (name.lower(), after_seq),
+        )
+        while rows := cursor.fetchmany(ACCOUNT_EVENTS_BATCH):
+            for seq, type, when, data in rows:
+                yield {"seq": seq, "type": type, "datetime": when, "data": json.loads(data)}
+    finally:
+        conn.close()
+
+
+@timed("db.read_account_event_names")
+def read_account_event_names() -> list[str]:
+    """Names of every account with a ledger."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT DISTINCT name FROM account_events ORDER BY name")
+        return [row[0] for row in cursor.fetchall()]
+
+
+@timed("db.read_account_snapshot")
+def read_account_snapshot(name: str) -> tuple[int, dict] | None:
+    """(seq, account) of the account's latest snapshot, if any."""
+    with _connect() as conn:
         cursor = conn.cursor()
         cursor.execute(
+            "SELECT seq, account FROM account_snapshots WHERE name = ?", (name.lower(),)
+        )
+        row = cursor.fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+
+@timed("db.read_account_seq")
+def read_account_seq(name: str) -> int | None:
+    """Sequence number of the last event applied to the stored account."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT seq FROM accounts WHERE name = ?", (name.lower(),))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+
+@timed("db.write_account_projections")
+def write_account_projections(projections: list[tuple[str, int, dict]]) -> None:
+    """Replace stored accounts with (name, seq, account) states rebuilt from
+    their ledgers and snapshot each one, without appending events."""
+    rows = [(name.lower(), seq, json.dumps(account)) for name, seq, account in projections]
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
             """
-            INSERT INTO accounts (name, account)
-            VALUES (?, ?)
-            ON CONFLICT(name) DO UPDATE SET account=excluded.account
+            INSERT INTO accounts (name, seq, account)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                account=excluded.account, seq=excluded.seq, version=accounts.version + 1
         """,
-            (name.lower(), json_data),
+            rows,
         )
+        _upsert_account_snapshots(cursor, rows)
         conn.commit()
 
 
+@timed("db.read_account")
 def read_account(name):
-    with sqlite3.connect(DB) as conn:
+    with _connect() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT account FROM accounts WHERE name = ?", (name.lower(),))
         row = cursor.fetchone()
         return json.loads(row[0]) if row else None
 
 
+@timed("db.read_all_accounts")
+def read_all_accounts() -> list[dict]:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT account FROM accounts ORDER BY name")
+        return [json.loads(row[0]) for row in cursor.fetchall()]
+
+
+@timed("db.read_account_field")
+def read_account_field(name: str, field: str):
+    """One top-level field of an account, extracted in SQLite so the rest of
+    the account (e.g. its transaction history) is not decoded; None if absent."""
+    path = f"$.{field}"
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT json_type(account, ?), json_extract(account, ?) FROM accounts WHERE name = ?",
+            (path, path, name.lower()),
+        )
+        row = cursor.fetchone()
+        if not row or row[1] is None:
+            return None
+        return json.loads(row[1]) if row[0] in ("array", "object") else row[1]
+
+
+_SUMMARY_COLUMNS = """
+    name, version,
+    json_extract(account, '$.balance'),
+    json_extract(account, '$.strategy'),
+    json_extract(account, '$.holdings')
+"""
+
+
+def _summary(row) -> dict:
+    return {
+        "name": row[0],
+        "version": row[1],
+        "balance": row[2],
+        "strategy": row[3],
+        "holdings": json.loads(row[4] or "{}"),
+    }
+
+
+@timed("db.read_account_summaries")
+def read_account_summaries() -> list[dict]:
+    """Name, version, balance, strategy and holdings of every account, without
+    decoding transaction histories."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {_SUMMARY_COLUMNS} FROM accounts ORDER BY name")
+        return [_summary(row) for row in cursor.fetchall()]
+
+
+@timed("db.read_account_summary")
+def read_account_summary(name: str) -> dict | None:
+    """`read_account_summaries` for one account; None if it does not exist."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {_SUMMARY_COLUMNS} FROM accounts WHERE name = ?", (name.lower(),))
+        row = cursor.fetchone()
+        return _summary(row) if row else None
+
+
+@timed("db.read_account_versions")
+def read_account_versions() -> dict[str, int]:
+    """Version of every account; it increases each time the account is saved."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name, version FROM accounts")
+        return dict(cursor.fetchall())
+
+
+@timed("db.read_account_version")
+def read_account_version(name: str) -> tuple[int, str | None] | None:
+    """(version, valuation updated_at) of one account, in one indexed lookup;
+    None if the account does not exist."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT accounts.version, valuations.updated_at FROM accounts
+            LEFT JOIN valuations ON valuations.name = accounts.name
+            WHERE accounts.name = ?
+        """,
+            (name.lower(),),
+        )
+        row = cursor.fetchone()
+        return tuple(row) if row else None
+
+
+@timed("db.write_log")
 def write_log(name: str, type: str, message: str):
     """
     Write a log entry to the logs table.
@@ -72,7 +557,7 @@ def write_log(name: str, type: str, message: str):
     """
     now = datetime.now().isoformat()
 
-    with sqlite3.connect(DB) as conn:
+    with _connect() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -84,6 +569,24 @@ def write_log(name: str, type: str, message: str):
         conn.commit()
 
 
+@timed("db.write_logs")
+def write_logs(entries: list[tuple[str, str, str, str]]) -> None:
+    """Write many (name, datetime, type, message) log entries in one transaction.
+
+    `datetime` is UTC in the same "YYYY-MM-DD HH:MM:SS" form as `write_log`.
+    """
+    if not entries:
+        return
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "INSERT INTO logs (name, datetime, type, message) VALUES (?, ?, ?, ?)",
+            [(name.lower(), when, type, message) for name, when, type, message in entries],
+        )
+        conn.commit()
+
+
+@timed("db.read_log")
 def read_log(name: str, last_n=10):
     """
     Read the most recent log entries for a given name.
@@ -95,7 +598,7 @@ def read_log(name: str, last_n=10):
     Returns:
         list: A list of tuples containing (datetime, type, message)
     """
-    with sqlite3.connect(DB) as conn:
+    with _connect() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -110,9 +613,10 @@ def read_log(name: str, last_n=10):
         return reversed(cursor.fetchall())
 
 
+@timed("db.write_market")
 def write_market(date: str, data: dict) -> None:
     data_json = json.dumps(data)
-    with sqlite3.connect(DB) as conn:
+    with _connect() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -125,28 +629,672 @@ def write_market(date: str, data: dict) -> None:
         conn.commit()
 
 
+@timed("db.read_market")
 def read_market(date: str) -> dict | None:
-    with sqlite3.connect(DB) as conn:
+    with _connect() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT data FROM market WHERE date = ?", (date,))
         row = cursor.fetchone()
         return json.loads(row[0]) if row else None
 
 
+@timed("db.write_marks")
+def write_marks(marks: list[tuple[str, str, float, float, dict]]) -> None:
+    """Write (name, datetime, value, pnl, prices) marks in a single transaction.
+
+    There is at most one mark per account per datetime bucket; re-marking the
+    same bucket overwrites it.
+    """
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            """
+            INSERT INTO marks (name, datetime, value, pnl, prices)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(name, datetime) DO UPDATE SET
+                value=excluded.value, pnl=excluded.pnl, prices=excluded.prices
+        """,
+            [
+                (name.lower(), dt, value, pnl, json.dumps(prices))
+                for name, dt, value, pnl, prices in marks
+            ],
+        )
+        conn.commit()
+
+
+@timed("db.read_latest_mark")
+def read_latest_mark(name: str) -> dict | None:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT datetime, value, pnl, prices FROM marks
+            WHERE name = ?
+            ORDER BY datetime DESC
+            LIMIT 1
+        """,
+            (name.lower(),),
+        )
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return {
+            "datetime": row[0],
+            "value": row[1],
+            "pnl": row[2],
+            "prices": json.loads(row[3]),
+        }
+
+
+@timed("db.read_marks")
+def read_marks(name: str, since: str | None = None) -> list[tuple[str, float]]:
+    """Return the (datetime, value) series of marks for an account, oldest first,
+    optionally only the marks at or after `since`."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT datetime, value FROM marks
+            WHERE name = ? AND datetime >= ?
+            ORDER BY datetime
+        """,
+            (name.lower(), since or ""),
+        )
+        return cursor.fetchall()
+
+
+def _upsert_valuations(cursor, valuations) -> None:
+    cursor.executemany(
+        """
+        INSERT INTO valuations (name, updated_at, value, pnl, positions)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            updated_at=excluded.updated_at, value=excluded.value,
+            pnl=excluded.pnl, positions=excluded.positions
+    """,
+        [
+            (name.lower(), updated_at, value, pnl, json.dumps(positions))
+            for name, updated_at, value, pnl, positions in valuations
+        ],
+    )
+
+
+@timed("db.read_logs_since")
+def read_logs_since(name: str, after_id: int = 0, limit: int = 100) -> list[dict]:
+    """Log entries with an id above `after_id`, oldest first; pass the last id
+    returned to continue."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT id, datetime, type, message FROM logs
+            WHERE name = ? AND id > ?
+            ORDER BY id
+            LIMIT ?
+        """,
+            (name.lower(), after_id, limit),
+        )
+        return [
+            {"id": row[0], "datetime": row[1], "type": row[2], "message": row[3]}
+            for row in cursor.fetchall()
+        ]
+
+
+@timed("db.read_latest_log_id")
+def read_latest_log_id(name: str) -> int | None:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT MAX(id) FROM logs WHERE name = ?", (name.lower(),))
+        return cursor.fetchone()[0]
+
+
+@timed("db.read_transactions_since")
+def read_transactions_since(name: str, after_id: int = 0, limit: int = 100) -> list[dict]:
+    """Transactions with an id above `after_id`, oldest first."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT id, timestamp, symbol, quantity, price, rationale
+            FROM transactions
+            WHERE name = ? AND id > ?
+            ORDER BY id
+            LIMIT ?
+        """,
+            (name.lower(), after_id, limit),
+        )
+        return [
+            dict(zip(("id", "timestamp", "symbol", "quantity", "price", "rationale"), row))
+            for row in cursor.fetchall()
+        ]
+
+
+@timed("db.read_transactions")
+def read_transactions(
+    name: str,
+    limit: int = 10,
+    before_id: int | None = None,
+    symbol: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    preview_chars: int | None = None,
+) -> list[dict]:
+    """A page of an account's transactions, newest first.
+
+    Pages are keyset-paginated: pass the smallest `id` of the previous page as
+    `before_id` for the next one. `symbol`, `start` and `end` (inclusive
+    timestamps or dates) filter the rows. With `preview_chars`, rationales are
+    cut to that length in SQL and `truncated` says whether text was dropped.
+    """
+    clauses = ["name = ?"]
+    params: list = [name.lower()]
+    if before_id is not None:
+        clauses.append("id < ?")
+        params.append(before_id)
+    if symbol:
+        clauses.append("symbol = ?")
+        params.append(symbol.strip().upper())
+    if start:
+        clauses.append("timestamp >= ?")
+        params.append(start)
+    if end:
+        # A bare date includes the whole day
+        clauses.append("timestamp <= ?")
+        params.append(end if len(end) > 10 else f"{end} 23:59:59")
+    if preview_chars is None:
+        rationale = "rationale, 0"
+    else:
+        rationale = "substr(rationale, 1, ?), length(rationale) > ?"
+        params = [preview_chars, preview_chars, *params]
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT id, timestamp, symbol, quantity, price, {rationale}
+            FROM transactions
+            WHERE {" AND ".join(clauses)}
+            ORDER BY id DESC
+            LIMIT ?
+        """,
+            (*params, limit),
+        )
+        return [
+            {
+                "id": row[0],
+                "timestamp": row[1],
+                "symbol": row[2],
+                "quantity": row[3],
+                "price": row[4],
+                "rationale": row[5],
+                "truncated": bool(row[6]),
+            }
+            for row in cursor.fetchall()
+        ]
+
+
+@timed("db.read_transaction")
+def read_transaction(transaction_id: int) -> dict | None:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT id, name, timestamp, symbol, quantity, price, rationale
+            FROM transactions WHERE id = ?
+        """,
+            (transaction_id,),
+        )
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return dict(
+            zip(("id", "name", "timestamp", "symbol", "quantity", "price", "rationale"), row)
+        )
+
+
+@timed("db.read_latest_transaction_id")
+def read_latest_transaction_id(name: str) -> int | None:
+    """Id of the account's newest transaction; changes whenever one is added."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT MAX(id) FROM transactions WHERE name = ?", (name.lower(),))
+        return cursor.fetchone()[0]
+
+
+@timed("db.write_valuations")
+def write_valuations(valuations: list[tuple[str, str, float, float, dict]]) -> None:
+    """Replace the latest (name, updated_at, value, pnl, positions) snapshot of
+    each account in a single transaction. `positions` maps symbol to its
+    quantity, price and value."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        _upsert_valuations(cursor, valuations)
+        conn.commit()
+
+
+def _valuation(row) -> dict:
+    return {
+        "name": row[0],
+        "updated_at": row[1],
+        "value": row[2],
+        "pnl": row[3],
+        "positions": json.loads(row[4]),
+    }
+
+
+@timed("db.read_valuation")
+def read_valuation(name: str) -> dict | None:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT name, updated_at, value, pnl, positions FROM valuations WHERE name = ?",
+            (name.lower(),),
+        )
+        row = cursor.fetchone()
+        return _valuation(row) if row else None
+
+
+@timed("db.read_valuations")
+def read_valuations() -> dict[str, dict]:
+    """Latest valuation of every account, keyed by lowercase name."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name, updated_at, value, pnl, positions FROM valuations")
+        return {row[0]: _valuation(row) for row in cursor.fetchall()}
+
+
+_TRADER_COLUMNS = (
+    "name",
+    "lastname",
+    "model_name",
+    "short_model_name",
+    "strategy",
+    "enabled",
+    "position",
+)
+
+
+@timed("db.write_trader")
+def write_trader(trader: dict) -> None:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO traders (name, lastname, model_name, short_model_name, strategy, enabled, position)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                lastname=excluded.lastname,
+                model_name=excluded.model_name,
+                short_model_name=excluded.short_model_name,
+                strategy=excluded.strategy,
+                enabled=excluded.enabled,
+                position=excluded.position
+        """,
+            tuple(
+                int(trader[column]) if column == "enabled" else trader[column]
+                for column in _TRADER_COLUMNS
+            ),
+        )
+        conn.commit()
+
+
+@timed("db.read_traders")
+def read_traders(enabled_only: bool = True) -> list[dict]:
+    """Return registered traders ordered by position, then name."""
+    query = f"SELECT {', '.join(_TRADER_COLUMNS)} FROM traders"
+    if enabled_only:
+        query += " WHERE enabled = 1"
+    query += " ORDER BY position, name"
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query)
+        return [
+            {**dict(zip(_TRADER_COLUMNS, row)), "enabled": bool(row[5])}
+            for row in cursor.fetchall()
+        ]
+
+
+@timed("db.write_llm_call")
+def write_llm_call(
+    name: str | None,
+    run_id: str | None,
+    model: str,
+    latency_ms: float,
+    prompt_tokens: int | None,
+    completion_tokens: int | None,
+    total_tokens: int | None,
+    cached: bool = False,
+    error: str | None = None,
+) -> None:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO llm_calls (datetime, name, run_id, model, latency_ms,
+                prompt_tokens, completion_tokens, total_tokens, cached, error)
+            VALUES (datetime('now'), ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                name.lower() if name else None,
+                run_id,
+                model,
+                latency_ms,
+                prompt_tokens,
+                completion_tokens,
+                total_tokens,
+                int(cached),
+                error,
+            ),
+        )
+        conn.commit()
+
+
+@timed("db.read_llm_usage")
+def read_llm_usage(run_id: str | None = None) -> list[dict]:
+    """Per trader and model: calls, cache hits, mean latency and token totals."""
+    query = """
+        SELECT name, model, COUNT(*), SUM(cached), AVG(latency_ms),
+            SUM(prompt_tokens), SUM(completion_tokens), SUM(total_tokens)
+        FROM llm_calls
+    """
+    params: tuple = ()
+    if run_id:
+        query += " WHERE run_id = ?"
+        params = (run_id,)
+    query += " GROUP BY name, model ORDER BY name, model"
+    columns = (
+        "name",
+        "model",
+        "calls",
+        "cached",
+        "avg_latency_ms",
+        "prompt_tokens",
+        "completion_tokens",
+        "total_tokens",
+    )
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+@timed("db.read_llm_cache")
+def read_llm_cache(key: str) -> str | None:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT response FROM llm_cache WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+
+@timed("db.write_llm_cache")
+def write_llm_cache(key: str, model: str, response: str) -> None:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO llm_cache (key, model, response)
+            VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET response=excluded.response
+        """,
+            (key, model, response),
+        )
+        conn.commit()
+
+
+@timed("db.write_state")
+def write_state(key: str, value: str) -> None:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO scheduler_state (key, value)
+            VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value=excluded.value
+        """,
+            (key, value),
+        )
+        conn.commit()
+
+
+@timed("db.read_state")
+def read_state(key: str) -> str | None:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM scheduler_state WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+
+def write_run_spans(run_id: str, name: str, spans: dict[str, dict]) -> None:
+    """Store one run's span histograms and fold them into the running totals.
+
+    `spans` maps span name to a `Histogram.to_dict()` payload.
+    """
+    if not spans:
+        return
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            """
+            INSERT OR REPLACE INTO run_spans
+                (run_id, name, datetime, span, count, total_ms, max_ms, histogram)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            [
+                (
+                    run_id,
+                    name,
+                    now,
+                    span,
+                    h["count"],
+                    h["sum"] * 1000,
+                    h["max"] * 1000,
+                    json.dumps(h),
+                )
+                for span, h in spans.items()
+            ],
+        )
+        for span, h in spans.items():
+            cursor.execute("SELECT histogram FROM span_totals WHERE span = ?", (span,))
+            row = cursor.fetchone()
+            if row:
+                total = json.loads(row[0])
+                h = {
+                    "counts": [a + b for a, b in zip(total["counts"], h["counts"])],
+                    "count": total["count"] + h["count"],
+                    "sum": total["sum"] + h["sum"],
+                    "max": max(total["max"], h["max"]),
+                }
+            cursor.execute(
+                "INSERT OR REPLACE INTO span_totals (span, histogram) VALUES (?, ?)",
+                (span, json.dumps(h)),
+            )
+        conn.commit()
+
+
+def read_run_spans(run_id: str) -> list[dict]:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT span, count, total_ms, max_ms FROM run_spans
+            WHERE run_id = ? ORDER BY total_ms DESC
+        """,
+            (run_id,),
+        )
+        return [
+            {"span": span, "count": count, "total_ms": total_ms, "max_ms": max_ms}
+            for span, count, total_ms, max_ms in cursor.fetchall()
+        ]
+
+
+def read_span_totals() -> dict[str, dict]:
+    """Cumulative span histograms across all runs, keyed by span name."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT span, histogram FROM span_totals")
+        return {span: json.loads(histogram) for span, histogram in cursor.fetchall()}
+
+
+@timed("db.write_checkpoint")
+def write_checkpoint(name: str, checkpoint: dict, items_from: int = 0) -> None:
+    """Save a run checkpoint. Only `checkpoint["items"]` from position
+    `items_from` on are written; earlier items are kept as stored."""
+    name = name.lower()
+    items = checkpoint["items"][items_from:]
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO run_checkpoints
+                (name, do_trade, items, orders, resumes, created_at, updated_at)
+            VALUES (?, ?, NULL, ?, ?, ?, ?)
+        """,
+            (
+                name,
+                int(checkpoint["do_trade"]),
+                json.dumps(checkpoint["orders"]),
+                checkpoint["resumes"],
+                checkpoint["created_at"],
+                checkpoint["updated_at"],
+            ),
+        )
+        cursor.execute(
+            "DELETE FROM run_checkpoint_items WHERE name = ? AND position >= ?",
+            (name, items_from),
+        )
+        cursor.executemany(
+            "INSERT INTO run_checkpoint_items (name, position, item) VALUES (?, ?, ?)",
+            [(name, items_from + i, json.dumps(item)) for i, item in enumerate(items)],
+        )
+        conn.commit()
+
+
+@timed("db.read_checkpoint")
+def read_checkpoint(name: str) -> dict | None:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT do_trade, items, orders, resumes, created_at, updated_at
+            FROM run_checkpoints WHERE name = ?
+        """,
+            (name.lower(),),
+        )
+        row = cursor.fetchone()
+        if not row:
+            return None
+        cursor.execute(
+            "SELECT item FROM run_checkpoint_items WHERE name = ? ORDER BY position",
+            (name.lower(),),
+        )
+        stored = [json.loads(item) for (item,) in cursor.fetchall()]
+    do_trade, items, orders, resumes, created_at, updated_at = row
+    return {
+        "do_trade": bool(do_trade),
+        # Checkpoints written before items had their own table keep them inline
+        "items": json.loads(items) if items else stored,
+        "orders": json.loads(orders),
+        "resumes": resumes,
+        "created_at": created_at,
+        "updated_at": updated_at,
+    }
+
+
+@timed("db.delete_checkpoint")
+def delete_checkpoint(name: str) -> None:
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM run_checkpoints WHERE name = ?", (name.lower(),))
+        cursor.execute("DELETE FROM run_checkpoint_items WHERE name = ?", (name.lower(),))
+        conn.commit()
+
+
+# --- Columnar export ---
+
+# Each query returns (date, trader, key, *columns) rows with key > the
+# watermark, ordered so that every (date, trader) partition is contiguous
+EXPORT_QUERIES = {
+    "transactions": """
+        SELECT substr(timestamp, 1, 10), name, id,
+               id, name, timestamp, symbol, quantity, price, rationale
+        FROM transactions WHERE id > ? ORDER BY 1, 2, id
+    """,
+    "marks": """
+        SELECT substr(datetime, 1, 10), name, id,
+               id, name, datetime, value, pnl, prices
+        FROM marks WHERE id > ? ORDER BY 1, 2, id
+    """,
+    "logs": """
+        SELECT substr(datetime, 1, 10), name, id,
+               id, name, datetime, type, message
+        FROM logs WHERE id > ? ORDER BY 1, 2, id
+    """,
+    # One row per symbol and date; market snapshots are not per trader
+    "market": """
+        SELECT market.date, NULL, market.date, prices.key, prices.value
+        FROM market, json_each(market.data) AS prices
+        WHERE market.date > ? ORDER BY market.date, prices.key
+    """,
+}
+
+
+def read_export_rows(dataset: str, after=0, chunk_rows: int = 50_000):
+    """Yield lists of at most `chunk_rows` rows of an EXPORT_QUERIES dataset
+    whose key is greater than `after`."""
+    conn = _connect()
+    try:
+        cursor = conn.execute(EXPORT_QUERIES[dataset], (after,))
+        while rows := cursor.fetchmany(chunk_rows):
+            yield rows
+    finally:
+        conn.close()
+
+
 # --- Maintenance helpers ---
 
 
+def snapshot_db(path: str) -> None:
+    """Copy the database to `path` with SQLite's online backup, replacing the
+    previous copy atomically, for read-only workers with DB_READ_PATH=path."""
+    temporary = f"{path}.tmp"
+    source = sqlite3.connect(DB)
+    target = sqlite3.connect(temporary)
+    try:
+        source.backup(target)
+        # Readers of the copy open it read-only, which a WAL file would not allow
+        target.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        target.close()
+        source.close()
+    os.replace(temporary, path)
+
+
 def _clear_table(table: str) -> None:
-    with sqlite3.connect(DB) as conn:
+    with _connect() as conn:
         cursor = conn.cursor()
         cursor.execute(f"DELETE FROM {table}")
         conn.commit()
 
 
 def reset_database() -> None:
-    """Delete all rows from accounts, logs, and market tables.
+    """Delete all rows from accounts and their ledgers, transactions, logs,
+    market, marks, valuations and run checkpoints.
 
     Tables remain intact and will be reused. Use this before re-seeding accounts.
+    The trader registry is kept so custom personas survive a reset.
     """
-    for table in ("accounts", "logs", "market"):
+    for table in (
+        "accounts",
+        "account_events",
+        "account_snapshots",
+        "transactions",
+        "logs",
+        "market",
+        "marks",
+        "valuations",
+        "run_checkpoints",
+        "run_checkpoint_items",
+    ):
         _clear_table(table)
@@ -0,0 +1,224 @@
+"""Columnar export of transactions, marks, logs and market snapshots.
+
+Rows are streamed from SQLite in chunks of EXPORT_CHUNK_ROWS and written to
+Parquet (or Arrow IPC) files partitioned Hive-style by date and trader:
+
+    <out>/<dataset>/date=2025-01-02/trader=warren/part-<first key>.parquet
+
+Only one partition file is open at a time, so memory is bounded by a chunk.
+The last exported key of each dataset is kept in `<out>/_watermarks.json`, and
+the next run only exports newer rows into new part files. Requires pyarrow
+(`pip install ".[export]"`).
+
+Usage: python -m trader_floor_ai.services.export [--out exports]
+       [--format parquet|arrow] [--datasets transactions marks logs market]
+       [--full]
+"""
+
+import argparse
+import json
+import os
+import shutil
+from urllib.parse import quote
+
+from dotenv import load_dotenv
+
+from trader_floor_ai.services.database import EXPORT_QUERIES, read_export_rows
+
+load_dotenv(override=True)
+
+EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
+EXPORT_FORMAT = os.getenv("EXPORT_FORMAT", "parquet")
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "50000"))
+EXPORT_COMPRESSION = os.getenv("EXPORT_COMPRESSION", "zstd")
+
+# Columns of each dataset after its (date, trader, key) partition fields
+SCHEMAS = {
+    "transactions": [
+        ("id", "int64"),
+        ("name", "string"),
+        ("timestamp", "string"),
+        ("symbol", "string"),
+        ("quantity", "int64"),
+        ("price", "float64"),
+        ("rationale", "string"),
+    ],
+    "marks": [
+        ("id", "int64"),
+        ("name", "string"),
+        ("datetime", "string"),
+        ("value", "float64"),
+        ("pnl", "float64"),
+        # JSON object of symbol -> marked price
+        ("prices", "string"),
+    ],
+    "logs": [
+        ("id", "int64"),
+        ("name", "string"),
+        ("datetime", "string"),
+        ("type", "string"),
+        ("message", "string"),
+    ],
+    "market": [("symbol", "string"), ("price", "float64")],
+}
+
+EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+WATERMARKS_FILE = "_watermarks.json"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError('Columnar export needs pyarrow: pip install ".[export]"') from e
+    return pyarrow
+
+
+def read_watermarks(out: str) -> dict:
+    path = os.path.join(out, WATERMARKS_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_watermarks(out: str, watermarks: dict) -> None:
+    path = os.path.join(out, WATERMARKS_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(watermarks, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+class _PartitionFile:
+    """One part file, written under a temporary name and renamed on close so
+    readers never see a file without its footer."""
+
+    def __init__(self, pa, path: str, schema, format: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.temporary = f"{path}.tmp"
+        if format == "parquet":
+            self.writer = pa.parquet.ParquetWriter(
+                self.temporary, schema, compression=EXPORT_COMPRESSION
+            )
+        else:
+            self.writer = pa.ipc.new_file(self.temporary, schema)
+
+    def write(self, table) -> None:
+        self.writer.write_table(table)
+
+    def close(self) -> None:
+        self.writer.close()
+        os.replace(self.temporary, self.path)
+
+
+def export_dataset(
+    dataset: str,
+    out: str = EXPORT_DIR,
+    format: str = EXPORT_FORMAT,
+    after=0,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> dict:
+    """Export rows of `dataset` with a key greater than `after`; return the
+    number of rows and files written and the new watermark."""
+    pa = _pyarrow()
+    schema = pa.schema([(name, getattr(pa, type)()) for name, type in SCHEMAS[dataset]])
+    partition = None
+    current = None
+    stats = {"rows": 0, "files": 0, "watermark": after}
+
+    def open_partition(date, trader, key) -> _PartitionFile:
+        parts = [out, dataset, f"date={quote(date or 'unknown', safe='-')}"]
+        if trader is not None:
+            parts.append(f"trader={quote(trader, safe='')}")
+        filename = f"part-{quote(str(key), safe='-')}.{EXTENSIONS[format]}"
+        stats["files"] += 1
+        return _PartitionFile(pa, os.path.join(*parts, filename), schema, format)
+
+    try:
+        for chunk in read_export_rows(dataset, after, chunk_rows):
+            start = 0
+            # Write each contiguous run of one partition as a single table
+            for end in range(1, len(chunk) + 1):
+                if end < len(chunk) and chunk[end][:2] == chunk[start][:2]:
+                    continue
+                run = chunk[start:end]
+                if run[0][:2] != partition:
+                    if current:
+                        current.close()
+                    partition = run[0][:2]
+                    current = open_partition(*run[0][:3])
+                columns = list(zip(*(row[3:] for row in run)))
+                current.write(
+                    pa.Table.from_arrays(
+                        [pa.array(values, type=f.type) for values, f in zip(columns, schema)],
+                        schema=schema,
+                    )
+                )
+                start = end
+            newest = max(row[2] for row in chunk)
+            if not stats["rows"] or newest > stats["watermark"]:
+                stats["watermark"] = newest
+            stats["rows"] += len(chunk)
+    finally:
+        if current:
+            current.close()
+    return stats
+
+
+def export_all(
+    out: str = EXPORT_DIR,
+    format: str = EXPORT_FORMAT,
+    datasets: list[str] | None = None,
+    full: bool = False,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> dict[str, dict]:
+    """Export each dataset from its watermark and advance the watermark once
+    the dataset's files are complete. `full` replaces the datasets' previous
+    files with a complete export."""
+    watermarks = read_watermarks(out)
+    results = {}
+    for dataset in datasets or list(EXPORT_QUERIES):
+        if full:
+            shutil.rmtree(os.path.join(out, dataset), ignore_errors=True)
+        after = 0 if full else watermarks.get(dataset, 0)
+        results[dataset] = export_dataset(dataset, out, format, after, chunk_rows)
+        watermarks[dataset] = results[dataset]["watermark"]
+        os.makedirs(out, exist_ok=True)
+        write_watermarks(out, watermarks)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export trading data to Parquet or Arrow")
+    parser.add_argument("--out", default=EXPORT_DIR)
+    parser.add_argument("--format", choices=list(EXTENSIONS), default=EXPORT_FORMAT)
+    parser.add_argument("--datasets", nargs="+", choices=list(EXPORT_QUERIES))
+    parser.add_argument(
+        "--full", action="store_true", help="re-export everything, replacing previous files"
+    )
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    results = export_all(args.out, args.format, args.datasets, args.full, args.chunk_rows)
+    for dataset, stats in results.items():
+        print(
+            f"{dataset}: {stats['rows']} rows in {stats['files']} files "
+            f"(watermark {stats['watermark']})"
+        )
+
+
+__all__ = [
+    "EXPORT_CHUNK_ROWS",
+    "EXPORT_DIR",
+    "EXPORT_FORMAT",
+    "export_all",
+    "export_dataset",
+    "read_watermarks",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""SQLite-backed job queue with leases and heartbeats.
+
+The scheduler enqueues jobs and any number of worker processes claim them.
+A claimed job carries a lease that the worker extends with heartbeats; if a
+worker dies, the lease expires and another worker reclaims the job. Failed
+jobs are retried with exponential backoff up to `max_attempts`.
+
+All workers must see the same database file (one machine, or a shared volume
+with working file locks). The `jobs` table is created by `database.init_db()`.
+"""
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+
+from trader_floor_ai.services.database import DB
+
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+
+
+def _connect() -> sqlite3.Connection:
+    # Several processes contend for the queue; wait for the write lock
+    return sqlite3.connect(DB, timeout=30, isolation_level=None)
+
+
+def enqueue_job(
+    kind: str,
+    payload: dict,
+    priority: int = 0,
+    max_attempts: int = 3,
+    dedupe_key: str | None = None,
+) -> int | None:
+    """Queue a job; returns its id, or None if `dedupe_key` already has one pending."""
+    now = time.time()
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if dedupe_key is not None:
+            existing = conn.execute(
+                "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running')",
+                (dedupe_key,),
+            ).fetchone()
+            if existing:
+                conn.execute("COMMIT")
+                return None
+        cursor = conn.execute(
+            """
+            INSERT INTO jobs (kind, payload, dedupe_key, status, priority, max_attempts,
+                available_at, created_at, updated_at)
+            VALUES (?, ?, ?, 'queued', ?, ?, ?, ?, ?)
+        """,
+            (kind, json.dumps(payload), dedupe_key, priority, max_attempts, now, now, now),
+        )
+        conn.execute("COMMIT")
+        return cursor.lastrowid
+
+
+def claim_job(worker_id: str, lease_seconds: float, kinds: list[str] | None = None) -> Job | None:
+    """Atomically lease the next available job, including ones whose lease expired."""
+    jobs = claim_jobs(worker_id, lease_seconds, kinds, limit=1)
+    return jobs[0] if jobs else None
+
+
+def claim_jobs(
+    worker_id: str, lease_seconds: float, kinds: list[str] | None = None, limit: int = 1
+) -> list[Job]:
+    """Atomically lease up to `limit` available jobs, in claim order."""
+    now = time.time()
+    query = """
+        SELECT id, kind, payload, attempts, max_attempts FROM jobs
+        WHERE ((status = 'queued' AND available_at <= ?)
+            OR (status = 'running' AND lease_expires_at < ?))
+    """
+    params: list = [now, now]
+    if kinds:
+        query += f" AND kind IN ({', '.join('?' for _ in kinds)})"
+        params += kinds
+    query += " ORDER BY priority DESC, available_at, id LIMIT ?"
+    params.append(limit)
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        # Workers that died on their last attempt leave expired leases behind
+        conn.execute(
+            """
+            UPDATE jobs SET status = 'failed', error = 'lease expired', updated_at = ?
+            WHERE status = 'running' AND lease_expires_at < ? AND attempts >= max_attempts
+        """,
+            (now, now),
+        )
+        rows = conn.execute(query, params).fetchall()
+        conn.executemany(
+            """
+            UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?,
+                lease_expires_at = ?, updated_at = ?
+            WHERE id = ?
+        """,
+            [(worker_id, now + lease_seconds, now, row[0]) for row in rows],
+        )
+        conn.execute("COMMIT")
+    return [
+        Job(
+            id=row[0],
+            kind=row[1],
+            payload=json.loads(row[2]),
+            attempts=row[3] + 1,
+            max_attempts=row[4],
+        )
+        for row in rows
+    ]
+
+
+def heartbeat_job(job_id: int, worker_id: str, lease_seconds: float) -> bool:
+    """Extend the lease; False means the lease was lost to another worker."""
+    now = time.time()
+    with _connect() as conn:
+        cursor = conn.execute(
+            """
+            UPDATE jobs SET lease_expires_at = ?, updated_at = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'running'
+        """,
+            (now + lease_seconds, now, job_id, worker_id),
+        )
+        return cursor.rowcount == 1
+
+
+def complete_job(job_id: int, worker_id: str, result: dict | None = None) -> None:
+    with _connect() as conn:
+        conn.execute(
+            """
+            UPDATE jobs SET status = 'done', result = ?, error = NULL, updated_at = ?
+            WHERE id = ? AND lease_owner = ?
+        """,
+            (json.dumps(result or {}), time.time(), job_id, worker_id),
+        )
+
+
+def fail_job(
+    job_id: int, worker_id: str, error: str, backoff_seconds: float = 30, retry: bool = True
+) -> None:
+    """Requeue with exponential backoff, or mark failed once attempts run out
+    (or straight away when `retry` is False)."""
+    now = time.time()
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND lease_owner = ?",
+            (job_id, worker_id),
+        ).fetchone()
+        if row:
+            attempts, max_attempts = row
+            retry = retry and attempts < max_attempts
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, available_at = ?,
+                    lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE id = ?
+            """,
+                (
+                    "queued" if retry else "failed",
+                    error,
+                    now + backoff_seconds * 2 ** (attempts - 1),
+                    now,
+                    job_id,
+                ),
+            )
+        conn.execute("COMMIT")
+
+
+def count_jobs() -> dict[str, int]:
+    with _connect() as conn:
+        rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+    return dict(rows)
+
+
+__all__ = [
+    "Job",
+    "enqueue_job",
+    "claim_job",
+    "claim_jobs",
+    "heartbeat_job",
+    "complete_job",
+    "fail_job",
+    "count_jobs",
+]
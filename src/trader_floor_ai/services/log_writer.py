@@ -0,0 +1,67 @@
+"""Batched log writer for streamed agent events.
+
+A streamed run emits a log line for every tool call, tool result and model
+message. Writing each one in its own SQLite transaction would contend with the
+other traders, so lines are buffered and flushed together when the batch fills
+up or `LOG_FLUSH_SECONDS` pass, whichever comes first.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+from trader_floor_ai.services.database import write_logs
+
+load_dotenv(override=True)
+
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "50"))
+LOG_FLUSH_SECONDS = float(os.getenv("LOG_FLUSH_SECONDS", "1"))
+
+
+class BatchedLogWriter:
+    """Use as `async with BatchedLogWriter() as writer: writer.log(...)`."""
+
+    def __init__(self, batch_size: int = LOG_BATCH_SIZE, flush_seconds: float = LOG_FLUSH_SECONDS):
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self._pending: list[tuple[str, str, str, str]] = []
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def log(self, name: str, type: str, message: str) -> None:
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        self._pending.append((name, now, type, message))
+        if len(self._pending) >= self.batch_size:
+            self._full.set()
+
+    async def flush(self) -> None:
+        entries, self._pending = self._pending, []
+        self._full.clear()
+        if not entries:
+            return
+        try:
+            await asyncio.to_thread(write_logs, entries)
+        except Exception as e:
+            print(f"Unable to write {len(entries)} log entries: {e}")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._flush_loop())
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+
+__all__ = ["BatchedLogWriter", "LOG_BATCH_SIZE", "LOG_FLUSH_SECONDS"]
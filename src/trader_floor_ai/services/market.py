@@ -4,7 +4,6 @@ Migrated from the legacy root `market.py` to packaged services. Root module
 will import from here to preserve compatibility.
 """
 
-from polygon import RESTClient
 from dotenv import load_dotenv
 import os
 from datetime import datetime
@@ -13,6 +12,7 @@ from functools import lru_cache
 from datetime import timezone
 
 from trader_floor_ai.services.database import write_market, read_market
+from trader_floor_ai.utils.timing import timed
 
 load_dotenv(override=True)
 
@@ -23,8 +23,15 @@ is_paid_polygon = polygon_plan == "paid"
 is_realtime_polygon = polygon_plan == "realtime"
 
 
+def _client():
+    # The polygon client is slow to import; only load it when prices are fetched
+    from polygon import RESTClient
+
+    return RESTClient(polygon_api_key)
+
+
 def is_market_open() -> bool:
-    client = RESTClient(polygon_api_key)
+    client = _client()
     status = client.get_market_status()
     # Status may be a dict-like object in some client versions
     market_value = getattr(status, "market", None)
@@ -35,7 +42,7 @@ def is_market_open() -> bool:
 
 def get_all_share_prices_polygon_eod() -> dict[str, float]:
     """With much thanks to student Reema R. for fixing the timezone issue with this!"""
-    client = RESTClient(polygon_api_key)
+    client = _client()
 
     # Some client versions return a sequence, others a named object
     previous = client.get_previous_close_agg("SPY")
@@ -78,7 +85,7 @@ def get_share_price_polygon_eod(symbol) -> float:
 
 
 def get_share_price_polygon_min(symbol) -> float:
-    client = RESTClient(polygon_api_key)
+    client = _client()
     result = client.get_snapshot_ticker("stocks", symbol)
     # Prefer min.close; fallback to prev_day.close
     m = getattr(result, "min", None)
@@ -96,6 +103,41 @@ def get_share_price_polygon(symbol) -> float:
         return get_share_price_polygon_eod(symbol)
 
 
+def get_share_prices_polygon(symbols: list[str]) -> dict[str, float]:
+    if not (is_paid_polygon or is_realtime_polygon):
+        today = datetime.now().date().strftime("%Y-%m-%d")
+        market_data = get_market_for_prior_date(today)
+        return {symbol: market_data.get(symbol, 0.0) for symbol in symbols}
+    client = _client()
+    prices = {symbol: 0.0 for symbol in symbols}
+    for result in client.get_snapshot_all("stocks", tickers=symbols):
+        ticker = getattr(result, "ticker", None)
+        m = getattr(result, "min", None)
+        prev = getattr(result, "prev_day", None)
+        m_close = getattr(m, "close", None) if m is not None else None
+        p_close = getattr(prev, "close", None) if prev is not None else None
+        if ticker in prices:
+            prices[ticker] = float(m_close or p_close or 0.0)
+    return prices
+
+
+@timed("market.get_share_prices")
+def get_share_prices(symbols) -> dict[str, float]:
+    """Price many symbols from a single snapshot call instead of one call each."""
+    symbols = sorted(set(symbols))
+    if not symbols:
+        return {}
+    if polygon_api_key:
+        try:
+            return get_share_prices_polygon(symbols)
+        except Exception as e:
+            print(
+                f"Was not able to use the polygon API due to {e}; using random numbers"
+            )
+    return {symbol: float(random.randint(1, 100)) for symbol in symbols}
+
+
+@timed("market.get_share_price")
 def get_share_price(symbol) -> float:
     if polygon_api_key:
         try:
@@ -110,6 +152,7 @@ def get_share_price(symbol) -> float:
 __all__ = [
     "is_market_open",
     "get_share_price",
+    "get_share_prices",
     "is_paid_polygon",
     "is_realtime_polygon",
 ]
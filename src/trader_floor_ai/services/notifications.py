@@ -0,0 +1,189 @@
+"""Push notification outbox.
+
+The `push` tool only enqueues a `push` job in the SQLite job queue and
+returns. A `PushSender` running in the scheduler or worker process claims
+queued pushes in batches, coalesces them into as few Pushover messages as
+fit (so the end-of-cycle summaries of every trader arrive as one
+notification) and posts them over a single reused HTTP connection. Failed
+deliveries are retried with exponential backoff by the job queue; rejected
+requests (4xx other than 429) are not retried.
+
+Point PUSHOVER_URL at `benchmarks/push_outbox.py --serve` to test without
+sending real notifications.
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+
+import httpx
+from dotenv import load_dotenv
+
+from trader_floor_ai.services.jobs import claim_jobs, complete_job, enqueue_job, fail_job
+
+load_dotenv(override=True)
+
+PUSH_JOB = "push"
+
+PUSHOVER_URL = os.getenv("PUSHOVER_URL", "https://api.pushover.net/1/messages.json")
+PUSH_BATCH_SIZE = int(os.getenv("PUSH_BATCH_SIZE", "20"))
+PUSH_FLUSH_SECONDS = float(os.getenv("PUSH_FLUSH_SECONDS", "5"))
+PUSH_TIMEOUT_SECONDS = float(os.getenv("PUSH_TIMEOUT_SECONDS", "10"))
+PUSH_MAX_ATTEMPTS = int(os.getenv("PUSH_MAX_ATTEMPTS", "5"))
+PUSH_BACKOFF_SECONDS = float(os.getenv("PUSH_BACKOFF_SECONDS", "10"))
+# Pushover rejects longer messages
+PUSH_MAX_CHARS = int(os.getenv("PUSH_MAX_CHARS", "1024"))
+
+
+def push_enabled() -> bool:
+    return bool(os.getenv("PUSHOVER_USER") and os.getenv("PUSHOVER_TOKEN"))
+
+
+def enqueue_push(message: str, name: str | None = None) -> int:
+    """Queue a notification from trader `name`; returns the job id."""
+    return enqueue_job(
+        PUSH_JOB, {"message": message, "name": name}, max_attempts=PUSH_MAX_ATTEMPTS
+    )
+
+
+def coalesce(jobs, max_chars: int = PUSH_MAX_CHARS) -> list[tuple[str, list[int]]]:
+    """Group queued pushes into (message, job ids) pairs of at most `max_chars`.
+
+    A single push is sent as written; several are listed one per line,
+    prefixed with the trader's name.
+    """
+    if len(jobs) == 1:
+        return [(jobs[0].payload["message"][:max_chars], [jobs[0].id])]
+    groups: list[tuple[str, list[int]]] = []
+    lines: list[str] = []
+    ids: list[int] = []
+    for job in jobs:
+        name = job.payload.get("name")
+        message = job.payload["message"]
+        line = (f"{name.title()}: {message}" if name else message)[:max_chars]
+        if lines and len("\n".join([*lines, line])) > max_chars:
+            groups.append(("\n".join(lines), ids))
+            lines, ids = [], []
+        lines.append(line)
+        ids.append(job.id)
+    if lines:
+        groups.append(("\n".join(lines), ids))
+    return groups
+
+
+class PushSender:
+    """Delivers queued pushes in the background.
+
+    Use as `async with PushSender():`; on exit, pushes already queued get one
+    last delivery attempt.
+    """
+
+    def __init__(
+        self,
+        url: str = PUSHOVER_URL,
+        batch_size: int = PUSH_BATCH_SIZE,
+        flush_seconds: float = PUSH_FLUSH_SECONDS,
+    ):
+        self.url = url
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.sender_id = f"{socket.gethostname()}:{os.getpid()}:push-{uuid.uuid4().hex[:6]}"
+        self.sent = 0
+        self.failed = 0
+        self._client: httpx.AsyncClient | None = None
+        self._task: asyncio.Task | None = None
+        self._delivery: asyncio.Future | None = None
+
+    async def _post(self, message: str) -> tuple[bool, bool, str]:
+        """(delivered, worth retrying, error) for one Pushover message."""
+        try:
+            response = await self._client.post(
+                self.url,
+                data={
+                    "user": os.getenv("PUSHOVER_USER"),
+                    "token": os.getenv("PUSHOVER_TOKEN"),
+                    "message": message,
+                },
+            )
+        except httpx.HTTPError as e:
+            return False, True, f"{type(e).__name__}: {e}"
+        if response.is_success:
+            return True, False, ""
+        retry = response.status_code == 429 or response.status_code >= 500
+        return False, retry, f"HTTP {response.status_code}: {response.text[:200]}"
+
+    async def _deliver(self, message: str, ids: list[int]) -> None:
+        """Send one message and ack or release its jobs."""
+        delivered, retry, error = await self._post(message)
+        for job_id in ids:
+            if delivered:
+                await asyncio.to_thread(complete_job, job_id, self.sender_id)
+            else:
+                await asyncio.to_thread(
+                    fail_job, job_id, self.sender_id, error, PUSH_BACKOFF_SECONDS, retry
+                )
+        if delivered:
+            self.sent += len(ids)
+        else:
+            self.failed += len(ids)
+            print(f"Push delivery failed for {len(ids)} notifications: {error}")
+
+    async def flush(self) -> int:
+        """Deliver one batch of queued pushes; returns how many were claimed."""
+        lease = PUSH_TIMEOUT_SECONDS * 2 + 30
+        jobs = await asyncio.to_thread(
+            claim_jobs, self.sender_id, lease, [PUSH_JOB], self.batch_size
+        )
+        for message, ids in coalesce(jobs):
+            # Cancelling the flush must not drop the ack of a message Pushover
+            # may already have accepted; the send and its ack finish together
+            self._delivery = asyncio.ensure_future(self._deliver(message, ids))
+            await asyncio.shield(self._delivery)
+        return len(jobs)
+
+    async def _settle(self) -> None:
+        """Wait for a delivery left running by a cancelled flush."""
+        if self._delivery is not None and not self._delivery.done():
+            await asyncio.gather(self._delivery, return_exceptions=True)
+
+    async def _send_loop(self) -> None:
+        while True:
+            try:
+                # A full batch means more may be waiting; otherwise let pushes gather
+                if await self.flush() < self.batch_size:
+                    await asyncio.sleep(self.flush_seconds)
+            except Exception as e:
+                print(f"Push sender error: {e}")
+                await asyncio.sleep(self.flush_seconds)
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(timeout=PUSH_TIMEOUT_SECONDS)
+        self._task = asyncio.create_task(self._send_loop())
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        try:
+            await self._settle()
+            while await self.flush() == self.batch_size:
+                pass
+        except Exception as e:
+            print(f"Push sender error: {e}")
+        finally:
+            await self._settle()
+            await self._client.aclose()
+
+
+__all__ = [
+    "PUSH_JOB",
+    "PUSHOVER_URL",
+    "PushSender",
+    "coalesce",
+    "enqueue_push",
+    "push_enabled",
+]
@@ -0,0 +1,202 @@
+"""Tradable symbol universe (reference data) built from the daily market snapshot.
+
+The universe is loaded once per process per trading day and gives O(1) symbol
+validation before any price lookup, plus a cheap fuzzy search for agents.
+"""
+
+import bisect
+import difflib
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+
+from trader_floor_ai.services.market import get_market_for_prior_date, polygon_api_key
+
+# Map non-equity or alias tickers to equity proxies (ETFs/trusts) we can trade
+SYMBOL_SYNONYMS: dict[str, str] = {
+    # Bitcoin -> spot ETF or trust
+    "BTC-USD": "IBIT",
+    "BTCUSD": "IBIT",
+    "BTC": "IBIT",
+    "XBT-USD": "IBIT",
+    "XBTUSD": "IBIT",
+    # Ethereum -> trust (widely available ticker)
+    "ETH-USD": "ETHE",
+    "ETHUSD": "ETHE",
+    "ETH": "ETHE",
+}
+
+# Grouped daily aggregates carry no asset type; tag the funds agents commonly use
+KNOWN_ETFS: frozenset[str] = frozenset(
+    {
+        "SPY", "IVV", "VOO", "VTI", "QQQ", "DIA", "IWM", "EFA", "EEM", "VEA",
+        "VWO", "AGG", "BND", "TLT", "IEF", "SHY", "LQD", "HYG", "GLD", "SLV",
+        "USO", "UNG", "DBC", "VNQ", "XLK", "XLF", "XLE", "XLV", "XLI", "XLY",
+        "XLP", "XLU", "XLB", "XLRE", "XLC", "ARKK", "ARKW", "ARKG", "ARKF",
+        "SMH", "SOXX", "IBIT", "FBTC", "GBTC", "BITO", "ETHE", "ETHA", "BLOK",
+    }
+)
+
+
+@dataclass(frozen=True)
+class SymbolInfo:
+    symbol: str
+    asset_type: str
+    last_price: float
+
+
+def _squash(symbol: str) -> str:
+    """Collapse punctuation so "$brk.b", "BRK-B" and "BRK B" compare equal."""
+    return "".join(ch for ch in symbol.upper() if ch.isalnum())
+
+
+class SymbolUniverse:
+    """Symbol set, aliases, asset types and last prices for one market snapshot."""
+
+    def __init__(
+        self,
+        prices: dict[str, float],
+        aliases: dict[str, str] | None = None,
+        date: str | None = None,
+    ):
+        self.date = date
+        self._symbols: dict[str, SymbolInfo] = {
+            symbol.upper(): SymbolInfo(
+                symbol=symbol.upper(),
+                asset_type="etf" if symbol.upper() in KNOWN_ETFS else "stock",
+                last_price=float(price),
+            )
+            for symbol, price in prices.items()
+            if price
+        }
+        self._aliases = {
+            alias.upper(): target.upper()
+            for alias, target in (aliases or {}).items()
+            if target.upper() in self._symbols
+        }
+        self._squashed: dict[str, str] = {}
+        for symbol in self._symbols:
+            self._squashed.setdefault(_squash(symbol), symbol)
+        self._sorted = sorted(self._symbols)
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.strip().upper() in self._symbols
+
+    @property
+    def is_loaded(self) -> bool:
+        """False when no snapshot was available; callers should then not reject."""
+        return bool(self._symbols)
+
+    def get(self, symbol: str) -> SymbolInfo | None:
+        return self._symbols.get(symbol.strip().upper())
+
+    def resolve(self, symbol: str) -> tuple[str | None, str | None]:
+        """Return (tradable symbol, note) or (None, None) if the symbol is unknown.
+
+        Exact matches and aliases are O(1); a punctuation-insensitive match is
+        accepted as an auto-correction and reported in the note.
+        """
+        upper = symbol.strip().upper()
+        if upper in self._symbols:
+            return upper, None
+        if upper in self._aliases:
+            mapped = self._aliases[upper]
+            return mapped, f"(mapped from {upper} to {mapped})"
+        corrected = self._squashed.get(_squash(upper))
+        if corrected:
+            return corrected, f"(corrected from {upper} to {corrected})"
+        return None, None
+
+    def search(self, query: str, limit: int = 10) -> list[SymbolInfo]:
+        """Fuzzy lookup: exact/alias first, then prefix matches, then close matches."""
+        upper = query.strip().upper()
+        if not upper:
+            return []
+        found: list[str] = []
+        resolved, _ = self.resolve(upper)
+        if resolved:
+            found.append(resolved)
+        start = bisect.bisect_left(self._sorted, upper)
+        for symbol in self._sorted[start:]:
+            if len(found) >= limit or not symbol.startswith(upper):
+                break
+            if symbol not in found:
+                found.append(symbol)
+        if len(found) < limit:
+            # Only compare against symbols sharing the first letter to keep this cheap
+            lo = bisect.bisect_left(self._sorted, upper[0])
+            hi = bisect.bisect_left(self._sorted, chr(ord(upper[0]) + 1))
+            for symbol in difflib.get_close_matches(
+                upper, self._sorted[lo:hi], n=limit, cutoff=0.6
+            ):
+                if len(found) >= limit:
+                    break
+                if symbol not in found:
+                    found.append(symbol)
+        return [self._symbols[symbol] for symbol in found]
+
+
+@lru_cache(maxsize=2)
+def _load_universe(today: str) -> SymbolUniverse:
+    # Fetch errors propagate so that lru_cache does not keep a failed load
+    prices = get_market_for_prior_date(today) if polygon_api_key else {}
+    return SymbolUniverse(prices, SYMBOL_SYNONYMS, date=today)
+
+
+def get_symbol_universe() -> SymbolUniverse:
+    """Return the process-wide universe for today's market snapshot.
+
+    If the snapshot cannot be fetched, an empty universe is returned for this
+    call only and the next call tries again.
+    """
+    today = datetime.now().date().strftime("%Y-%m-%d")
+    try:
+        return _load_universe(today)
+    except Exception as e:
+        print(f"Unable to load symbol universe for {today}: {e}")
+        return SymbolUniverse({}, SYMBOL_SYNONYMS, date=today)
+
+
+def validate_symbol(symbol: str) -> tuple[str, str | None]:
+    """Return a tradable symbol and an optional note, or raise ValueError.
+
+    Aliases are always applied. When no snapshot is available the symbol is
+    passed through unchanged so trading still works without Polygon.
+    """
+    upper = symbol.strip().upper()
+    universe = get_symbol_universe()
+    if not universe.is_loaded:
+        mapped = SYMBOL_SYNONYMS.get(upper)
+        if mapped and mapped != upper:
+            return mapped, f"(mapped from {upper} to {mapped})"
+        return upper, None
+    resolved, note = universe.resolve(upper)
+    if resolved is None:
+        suggestions = ", ".join(info.symbol for info in universe.search(upper, 5))
+        hint = f" Did you mean: {suggestions}?" if suggestions else ""
+        raise ValueError(f"Unrecognized symbol {upper}.{hint}")
+    return resolved, note
+
+
+def search_symbols(query: str, limit: int = 10) -> list[dict]:
+    return [
+        {
+            "symbol": info.symbol,
+            "asset_type": info.asset_type,
+            "last_price": info.last_price,
+        }
+        for info in get_symbol_universe().search(query, limit)
+    ]
+
+
+__all__ = [
+    "SYMBOL_SYNONYMS",
+    "SymbolInfo",
+    "SymbolUniverse",
+    "get_symbol_universe",
+    "validate_symbol",
+    "search_symbols",
+]
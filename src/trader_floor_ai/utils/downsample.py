@@ -0,0 +1,70 @@
+"""Downsampling of time series for charts.
+
+A chart is a few hundred pixels wide, so drawing more points than that only
+grows the payload and the render time. `lttb` (Largest-Triangle-Three-Buckets)
+keeps the points that best preserve the visual shape; `min_max` keeps the
+extremes of each bucket, for when spikes must never be dropped.
+"""
+
+import numpy as np
+
+
+def _as_arrays(x, y) -> tuple[np.ndarray, np.ndarray]:
+    return np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+
+
+def lttb(x, y, threshold: int) -> np.ndarray:
+    """Indices of at most `threshold` points of (x, y) chosen by LTTB.
+
+    The first and last points are always kept. `x` must be increasing.
+    """
+    x, y = _as_arrays(x, y)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    # Middle points split into threshold - 2 buckets of (almost) equal size
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        if i + 2 < len(edges):
+            next_x = x[end : edges[i + 2]].mean()
+            next_y = y[end : edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Twice the triangle area between the previous pick, each candidate
+        # and the next bucket's average; the largest triangle wins
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(areas.argmax())
+        selected[i + 1] = previous
+    return selected
+
+
+def min_max(x, y, threshold: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each of threshold // 2 buckets,
+    in order, plus the first and last points."""
+    x, y = _as_arrays(x, y)
+    n = len(x)
+    if threshold >= n or threshold < 4:
+        return np.arange(n)
+    edges = np.linspace(0, n, threshold // 2 + 1).astype(int)
+    picks = {0, n - 1}
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            bucket = y[start:end]
+            picks.add(start + int(bucket.argmin()))
+            picks.add(start + int(bucket.argmax()))
+    return np.array(sorted(picks))
+
+
+DOWNSAMPLERS = {"lttb": lttb, "minmax": min_max}
+
+
+__all__ = ["DOWNSAMPLERS", "lttb", "min_max"]
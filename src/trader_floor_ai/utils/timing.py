@@ -0,0 +1,159 @@
+"""Lightweight timing spans for the trading hot paths.
+
+Spans are aggregated into fixed-bucket histograms for the run they happen in
+(see `collect_spans`), persisted per run by the caller and rendered in the
+Prometheus text format by the dashboard's `/metrics` endpoint.
+
+With `METRICS_ENABLED=false` (the default) `timed` returns functions
+unchanged and `span` returns a shared no-op context, so disabled
+instrumentation costs one attribute lookup per call site at most.
+"""
+
+import functools
+import inspect
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").strip().lower() == "true"
+
+# Upper bounds in seconds, from SQLite statements up to full agent runs
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+
+class Histogram:
+    """Per-bucket (non-cumulative) counts plus count, sum and max, in seconds."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self, counts=None, count=0, sum=0.0, max=0.0):
+        self.counts = list(counts) if counts else [0] * (len(BUCKETS) + 1)
+        self.count = count
+        self.sum = sum
+        self.max = max
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "Histogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> dict:
+        return {"counts": self.counts, "count": self.count, "sum": self.sum, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        return cls(data["counts"], data["count"], data["sum"], data["max"])
+
+
+_run_spans: ContextVar[dict[str, Histogram] | None] = ContextVar("run_spans", default=None)
+_NOOP = nullcontext()
+
+
+def record(name: str, seconds: float) -> None:
+    """Add one observation to the current run's histograms, if collecting."""
+    spans = _run_spans.get()
+    if spans is None:
+        return
+    histogram = spans.get(name)
+    if histogram is None:
+        histogram = spans[name] = Histogram()
+    histogram.observe(seconds)
+
+
+@contextmanager
+def _span(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def span(name: str):
+    """Time a block: `with span("market.get_share_price"): ...`."""
+    return _span(name) if METRICS_ENABLED else _NOOP
+
+
+def timed(name: str):
+    """Decorator timing every call of a sync or async function as span `name`."""
+
+    def decorate(func):
+        if not METRICS_ENABLED:
+            return func
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    record(name, time.perf_counter() - start)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorate
+
+
+@contextmanager
+def collect_spans():
+    """Collect spans recorded inside the block (including threads started with
+    `asyncio.to_thread`, which copy the context) into a fresh dict."""
+    spans: dict[str, Histogram] = {}
+    token = _run_spans.set(spans if METRICS_ENABLED else None)
+    try:
+        yield spans
+    finally:
+        _run_spans.reset(token)
+
+
+def render_prometheus(histograms: dict[str, Histogram], metric: str = "trader_floor_span_seconds") -> str:
+    """Prometheus text exposition of span histograms, labelled by span name."""
+    lines = [
+        f"# HELP {metric} Duration of instrumented trading hot paths.",
+        f"# TYPE {metric} histogram",
+    ]
+    for name in sorted(histograms):
+        histogram = histograms[name]
+        cumulative = 0
+        for bound, count in zip((*BUCKETS, "+Inf"), histogram.counts):
+            cumulative += count
+            lines.append(f'{metric}_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'{metric}_sum{{span="{name}"}} {histogram.sum:.6f}')
+        lines.append(f'{metric}_count{{span="{name}"}} {histogram.count}')
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "METRICS_ENABLED",
+    "BUCKETS",
+    "Histogram",
+    "record",
+    "span",
+    "timed",
+    "collect_spans",
+    "render_prometheus",
+]
@@ -0,0 +1,170 @@
+"""Trader worker: claims `trader.run` jobs from the queue and executes them.
+
+Run with `python -m trader_floor_ai.worker [--processes N] [--concurrency M]`.
+Each process owns its own event loop, MCP server pool and executor, so
+traders spread across cores (and across machines sharing the database).
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import uuid
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from dotenv import load_dotenv
+
+from trader_floor_ai.domain.traders import list_traders
+from trader_floor_ai.services.database import init_db
+from trader_floor_ai.services.jobs import (
+    claim_job,
+    complete_job,
+    enqueue_job,
+    fail_job,
+    heartbeat_job,
+)
+
+load_dotenv(override=True)
+
+TRADER_RUN_JOB = "trader.run"
+WORKER_LEASE_SECONDS = float(os.getenv("WORKER_LEASE_SECONDS", "60"))
+WORKER_POLL_SECONDS = float(os.getenv("WORKER_POLL_SECONDS", "5"))
+
+
+@dataclass
+class TraderRef:
+    """All the queue needs to know about a trader; enqueueing does not load the
+    agent stack, so a scheduler in queue mode stays light."""
+
+    name: str
+    do_trade: bool = True
+
+
+def enqueue_trader_runs(traders) -> int:
+    """Queue one run per trader and advance each trader's trade/rebalance mode.
+
+    A trader that still has a queued or running job is skipped rather than
+    stacked up behind itself. Returns the number of jobs queued.
+    """
+    queued = 0
+    for trader in traders:
+        job_id = enqueue_job(
+            TRADER_RUN_JOB,
+            {"name": trader.name, "do_trade": trader.do_trade},
+            dedupe_key=f"{TRADER_RUN_JOB}:{trader.name.lower()}",
+        )
+        if job_id is None:
+            print(f"[{trader.name}] previous run still pending, not queued")
+            continue
+        trader.do_trade = not trader.do_trade
+        queued += 1
+    return queued
+
+
+async def _execute(job, worker_id, executor, profiles):
+    from trader_floor_ai.agents.trader import Trader
+
+    profile = profiles.get(job.payload["name"].lower())
+    if profile is None:
+        # Retrying cannot help; the trader is not in the registry
+        fail_job(job.id, worker_id, f"Unknown trader {job.payload['name']}", retry=False)
+        return
+    trader = Trader(profile.name, profile.lastname, profile.model_name)
+    trader.do_trade = job.payload.get("do_trade", True)
+    run = asyncio.create_task(executor.run_one(trader))
+
+    # Keep the lease alive while the run is in flight; stop if another worker took it
+    while not run.done():
+        await asyncio.wait({run}, timeout=WORKER_LEASE_SECONDS / 3)
+        if not run.done() and not heartbeat_job(job.id, worker_id, WORKER_LEASE_SECONDS):
+            print(f"[{trader.name}] lease lost for job {job.id}; cancelling")
+            run.cancel()
+            return
+    outcome = run.result()
+    if outcome.success:
+        complete_job(job.id, worker_id, asdict(outcome))
+    else:
+        fail_job(job.id, worker_id, outcome.error or "unknown error")
+
+
+async def work(concurrency: int, once: bool = False):
+    """Claim and execute jobs until stopped (or, with `once`, until the queue is empty)."""
+    from trader_floor_ai.integration.mcp_pool import MCPServerPool
+    from trader_floor_ai.integration.research_cache import (
+        RESEARCH_CACHE_ENABLED,
+        get_research_cache,
+    )
+    from trader_floor_ai.scheduler.executor import TraderExecutor
+    from trader_floor_ai.services.notifications import PushSender, push_enabled
+
+    init_db()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+    print(f"Worker {worker_id} started (concurrency {concurrency})")
+    running: set[asyncio.Task] = set()
+    # Jobs started since the queue was last drained, i.e. this worker's share of a cycle
+    started = 0
+    # Pushes queued by this worker's traders are delivered from the same process
+    push_sender = PushSender() if push_enabled() else nullcontext()
+    async with MCPServerPool() as mcp_pool, push_sender:
+        executor = TraderExecutor(concurrency=concurrency, mcp_pool=mcp_pool)
+        while True:
+            while len(running) < concurrency:
+                job = claim_job(worker_id, WORKER_LEASE_SECONDS, kinds=[TRADER_RUN_JOB])
+                if job is None:
+                    break
+                profiles = {p.name.lower(): p for p in list_traders(enabled_only=False)}
+                task = asyncio.create_task(_execute(job, worker_id, executor, profiles))
+                running.add(task)
+                task.add_done_callback(running.discard)
+                started += 1
+            if started and not running:
+                if RESEARCH_CACHE_ENABLED:
+                    print(get_research_cache().cycle_report())
+                started = 0
+            if once and not running:
+                break
+            if running:
+                await asyncio.wait(
+                    running,
+                    timeout=WORKER_POLL_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            else:
+                await asyncio.sleep(WORKER_POLL_SECONDS)
+    print(f"Worker {worker_id} stopped")
+
+
+def _run_process(concurrency: int, once: bool):
+    asyncio.run(work(concurrency, once))
+
+
+def main():
+    from trader_floor_ai.scheduler.executor import TRADER_CONCURRENCY
+
+    parser = argparse.ArgumentParser(description="Run trader jobs from the queue")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=TRADER_CONCURRENCY,
+        help="trader runs in flight per process",
+    )
+    parser.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _run_process(args.concurrency, args.once)
+        return
+    processes = [
+        multiprocessing.Process(target=_run_process, args=(args.concurrency, args.once))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
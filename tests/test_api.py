@@ -0,0 +1,36 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from trader_floor_ai.app.api import create_api_app
+from trader_floor_ai.services import database
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB", str(tmp_path / "accounts.db"))
+    database.init_db()
+    account = {
+        "name": "warren",
+        "balance": 10000.0,
+        "strategy": "",
+        "holdings": {},
+        "transactions": [],
+        "portfolio_value_time_series": [],
+    }
+    database.write_account("warren", account)
+    return TestClient(create_api_app())
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/accounts/{name}",
+        "/api/accounts/{name}/holdings",
+        "/api/accounts/{name}/valuation",
+        "/api/accounts/{name}/transactions",
+        "/api/accounts/{name}/logs",
+    ],
+)
+def test_unknown_account_is_404_everywhere(client, path):
+    assert client.get(path.format(name="warren")).status_code == 200
+    assert client.get(path.format(name="nobody")).status_code == 404
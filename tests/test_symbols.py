@@ -0,0 +1,30 @@
+import pytest
+
+from trader_floor_ai.services import symbols
+
+
+@pytest.fixture(autouse=True)
+def fresh_universe():
+    symbols._load_universe.cache_clear()
+    yield
+    symbols._load_universe.cache_clear()
+
+
+def test_failed_load_is_retried(monkeypatch):
+    responses = [ConnectionError("polygon unavailable"), {"AAPL": 190.0}]
+
+    def fetch(today):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(symbols, "polygon_api_key", "key")
+    monkeypatch.setattr(symbols, "get_market_for_prior_date", fetch)
+
+    # Without a snapshot symbols are passed through unvalidated
+    assert symbols.validate_symbol("ZZZZ") == ("ZZZZ", None)
+    assert symbols.validate_symbol("aapl") == ("AAPL", None)
+    with pytest.raises(ValueError):
+        symbols.validate_symbol("ZZZZ")
+    assert not responses